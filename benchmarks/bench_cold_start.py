@@ -0,0 +1,75 @@
+"""
+Measure the cold start of `taskory list` on a 100-task store against the PRD budget.
+
+Each run starts a fresh interpreter through the taskory.cli:app entry point, so the
+time covers interpreter start-up, imports, loading the store and rendering.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--tasks 100] [--runs 5] [--budget-ms 200]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task
+
+ENTRY_POINT = "from taskory.cli import app; app()"
+
+
+def time_command(args: list, cwd: str, runs: int) -> float:
+    """
+    Run a taskory command in fresh interpreters and return the fastest wall time.
+
+    Args:
+        args (list): Arguments passed to the CLI.
+        cwd (str): Working directory holding .taskory.
+        runs (int): Number of runs.
+
+    Returns:
+        float: The fastest wall time in milliseconds.
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", ENTRY_POINT, *args], cwd=cwd, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tasks_dir = Path(tmpdir) / ".taskory"
+        tasks_dir.mkdir()
+        (tasks_dir / "taskory.config").write_text('{"splash_shown": true}')
+        store = TaskStore(str(tasks_dir / "tasks.json"))
+        with store.batch():
+            for i in range(args.tasks):
+                store.add_task(Task(title=f"Task {i}"))
+        interpreter = time_command(["--help"], tmpdir, args.runs)
+        cold_start = time_command(["list"], tmpdir, args.runs)
+
+    print(f"taskory --help:          {interpreter:7.1f} ms")
+    print(f"taskory list ({args.tasks} tasks): {cold_start:7.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if cold_start > args.budget_ms:
+        print("OVER BUDGET")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare strict, trusted and binary TaskStore loading on a large synthetic store.
+
+Usage:
+    python benchmarks/bench_load.py [--tasks 100000]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import build_store
+from taskory.commands.task_store import TaskStore
+
+
+def best_of(runs: int, fn) -> float:
+    """
+    Time a callable and return the fastest of several runs.
+
+    Args:
+        runs (int): Number of runs.
+        fn (Callable[[], object]): The callable to time.
+
+    Returns:
+        float: The fastest wall time in seconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "tasks.json")
+        binary_path = str(Path(tmpdir) / "tasks.bin")
+        store = build_store(args.tasks)
+        store.save_to_file(path)
+        store.save_binary(binary_path)
+        strict = best_of(args.runs, lambda: TaskStore.load_from_file(path))
+        trusted = best_of(args.runs, lambda: TaskStore.load_from_file(path, trusted=True))
+        binary = best_of(args.runs, lambda: TaskStore.load_from_binary(binary_path))
+        json_size, binary_size = Path(path).stat().st_size, Path(binary_path).stat().st_size
+
+    print(f"tasks:   {args.tasks}")
+    print(f"strict:  {strict * 1000:8.1f} ms")
+    print(f"trusted: {trusted * 1000:8.1f} ms")
+    print(f"binary:  {binary * 1000:8.1f} ms")
+    print(f"speedup: {strict / trusted:8.2f}x trusted, {strict / binary:.2f}x binary")
+    print(f"size:    {json_size / 1e6:8.1f} MB json, {binary_size / 1e6:.1f} MB binary")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure how much memory a loaded TaskStore holds per task.
+
+Tasks are decoded from their JSON form one at a time, as a load from tasks.json
+would, so strings repeated across tasks (statuses, assignees, tags) are separate
+objects unless the store shares them. Memory is counted with tracemalloc after
+garbage collection, and split into the task rows, the secondary indexes
+(TaskIndex) and the dependency graph by dropping each part in turn.
+
+Usage:
+    python benchmarks/bench_memory.py [--tasks 1000000]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from synthetic import synthetic_records
+from taskory.commands.serialization import deserialize_task
+from taskory.commands.task_store import TaskStore
+
+
+def live_bytes() -> int:
+    """
+    Bytes currently allocated by Python, after a full garbage collection.
+    """
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = live_bytes()
+    began = time.perf_counter()
+    store = TaskStore()
+    store._load_tasks(deserialize_task(json.loads(json.dumps(record))) for record in synthetic_records(args.tasks))
+    elapsed = time.perf_counter() - began
+    total = live_bytes() - start
+    store._index = None
+    without_index = live_bytes() - start
+    store._graph = None
+    rows = live_bytes() - start
+    tracemalloc.stop()
+
+    per_task = lambda size: size / args.tasks
+    print(f"tasks:     {args.tasks} (built in {elapsed:.1f} s)")
+    print(f"total:     {total / 1e6:8.1f} MB  {per_task(total):6.0f} B/task")
+    print(f"  rows:    {rows / 1e6:8.1f} MB  {per_task(rows):6.0f} B/task")
+    print(f"  index:   {(total - without_index) / 1e6:8.1f} MB  {per_task(total - without_index):6.0f} B/task")
+    print(f"  graph:   {(without_index - rows) / 1e6:8.1f} MB  {per_task(without_index - rows):6.0f} B/task")
+
+
+if __name__ == "__main__":
+    main()
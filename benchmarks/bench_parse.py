@@ -0,0 +1,50 @@
+"""
+Time `taskory parse`'s pipeline on a synthetic plan with the offline stub provider.
+
+The stub waits --latency seconds per request, like a remote model. The first run sends
+every goal, --concurrency at a time; the second finds every reply in the response cache.
+
+Usage:
+    python benchmarks/bench_parse.py [--goals 200] [--latency 0.05] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from taskory.commands.planning import parse_planning
+from taskory.llm_interface import LLMClient, ResponseCache, StubProvider
+from taskory.schemas import Planning
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    planning = Planning(project={"name": "Benchmark"}, goals=[f"Goal number {i}" for i in range(args.goals)])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        provider = StubProvider(latency=args.latency)
+        client = LLMClient(provider, "stub", cache=ResponseCache(Path(tmpdir) / "llm_cache"),
+                           concurrency=args.concurrency)
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            tasks = asyncio.run(parse_planning(planning, client))
+            timings.append(time.perf_counter() - start)
+
+    sequential = args.goals * args.latency
+    print(f"goals:      {args.goals} ({len(tasks)} tasks, {provider.calls} requests)")
+    print(f"sequential: {sequential * 1000:8.1f} ms (latency x goals)")
+    print(f"first run:  {timings[0] * 1000:8.1f} ms ({sequential / timings[0]:.1f}x)")
+    print(f"cached run: {timings[1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
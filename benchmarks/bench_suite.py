@@ -0,0 +1,213 @@
+"""
+Benchmark suite for TaskStore and the CLI on synthetic stores from 1k to 1M tasks.
+
+For every store size it measures load_from_file (strict and trusted), save_to_file,
+list_tasks with several filters, update_task with auto-save (snapshot and journal),
+and the cold start of `taskory list` and `taskory next` in a fresh interpreter
+through the taskory.cli:app entry point. Each figure is the fastest of --runs runs,
+in milliseconds.
+
+Results can be written as JSON (--output) and compared with an earlier result file
+(--compare). The comparison flags every measurement that got slower by more than
+--threshold, and every CLI cold start over the PRD's 200 ms per-command goal (for
+stores up to --budget-max-tasks). It exits with status 1 if anything is flagged.
+
+Usage:
+    python benchmarks/bench_suite.py --sizes 1k,10k --output baseline.json
+    python benchmarks/bench_suite.py --sizes 1k,10k --compare baseline.json [--threshold 0.2]
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k,1m --runs 1
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from synthetic import write_store
+from bench_cold_start import time_command
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import TaskStatus, TaskPriority
+
+FORMAT_VERSION = 1
+# Measurements subject to the PRD's per-command goal.
+CLI_PREFIX = "cli_"
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a store size such as 1000, 10k or 1m.
+
+    Args:
+        value (str): The size.
+
+    Returns:
+        int: The number of tasks.
+    """
+    value = value.strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if factor > 1 else value) * factor)
+
+
+def best_of(runs: int, fn: Callable[[], object]) -> float:
+    """
+    Time a callable and return the fastest of several runs.
+
+    Args:
+        runs (int): Number of runs.
+        fn (Callable[[], object]): The callable to time.
+
+    Returns:
+        float: The fastest wall time in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def bench_size(count: int, runs: int, workdir: Path) -> Dict[str, float]:
+    """
+    Run every measurement on one synthetic store.
+
+    Args:
+        count (int): Number of tasks in the store.
+        runs (int): Runs per measurement.
+        workdir (Path): Empty directory to build the store in.
+
+    Returns:
+        Dict[str, float]: Milliseconds by measurement name.
+    """
+    tasks_dir = workdir / ".taskory"
+    path = tasks_dir / "tasks.json"
+    write_store(path, count)
+    (tasks_dir / "taskory.config").write_text('{"splash_shown": true}')
+    results = {
+        "load_strict": best_of(runs, lambda: TaskStore.load_from_file(str(path))),
+        "load_trusted": best_of(runs, lambda: TaskStore.load_from_file(str(path), trusted=True)),
+    }
+    store = TaskStore.load_from_file(str(path), trusted=True)
+    results["save"] = best_of(runs, lambda: store.save_to_file(str(workdir / "copy.json")))
+    results["list_all"] = best_of(runs, lambda: store.list_tasks())
+    results["list_status"] = best_of(runs, lambda: store.list_tasks(status=TaskStatus.todo))
+    results["list_combined"] = best_of(
+        runs, lambda: store.list_tasks(assignee="jeff", tags=["api"], min_priority=TaskPriority.medium),
+    )
+    # Each run updates another task, so that every update changes something.
+    ids = iter([task.id for task in store.list_tasks()])
+    results["update_autosave"] = best_of(runs, lambda: store.update_task(next(ids), status=TaskStatus.done))
+    journaled = TaskStore.load_from_file(str(path), journal=True, trusted=True)
+    results["update_journal"] = best_of(runs, lambda: journaled.update_task(next(ids), status=TaskStatus.done))
+    journaled.compact()
+    results[CLI_PREFIX + "list"] = time_command(["list", "--format", "plain"], str(workdir), runs)
+    results[CLI_PREFIX + "next"] = time_command(["next"], str(workdir), runs)
+    return results
+
+
+def run_suite(sizes: List[int], runs: int) -> dict:
+    """
+    Run the suite on every size.
+
+    Args:
+        sizes (List[int]): Store sizes.
+        runs (int): Runs per measurement.
+
+    Returns:
+        dict: The results document written by --output.
+    """
+    results = []
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, ms in bench_size(count, runs, Path(tmpdir)).items():
+                results.append({"name": name, "tasks": count, "ms": round(ms, 3)})
+                print(f"{name:<16} {count:>9} tasks {ms:10.1f} ms", flush=True)
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": git_commit(),
+            "runs": runs,
+        },
+        "results": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """
+    The current git commit, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float,
+            budget_ms: float, budget_max_tasks: int) -> List[str]:
+    """
+    Find regressions against a baseline and CLI runs over the per-command budget.
+
+    Measurements missing from either document are skipped, so a baseline taken with
+    other sizes still compares on the sizes both have.
+
+    Args:
+        baseline (dict): The earlier results document.
+        current (dict): The new results document.
+        threshold (float): Allowed slowdown as a fraction (0.2 = 20 %).
+        min_delta_ms (float): Slowdowns below this many milliseconds count as noise.
+        budget_ms (float): The per-command goal for CLI cold starts.
+        budget_max_tasks (int): Largest store the goal applies to.
+
+    Returns:
+        List[str]: One message per problem; empty if none.
+    """
+    before: Dict[Tuple[str, int], float] = {(r["name"], r["tasks"]): r["ms"] for r in baseline["results"]}
+    problems = []
+    for result in current["results"]:
+        key, ms = (result["name"], result["tasks"]), result["ms"]
+        old = before.get(key)
+        if old is not None and ms > old * (1 + threshold) and ms - old > min_delta_ms:
+            problems.append(f"REGRESSION {key[0]} @ {key[1]} tasks: {old:.1f} -> {ms:.1f} ms (+{(ms / old - 1) * 100:.0f}%)")
+        if key[0].startswith(CLI_PREFIX) and key[1] <= budget_max_tasks and ms > budget_ms:
+            problems.append(f"OVER BUDGET {key[0]} @ {key[1]} tasks: {ms:.1f} ms > {budget_ms:.0f} ms")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k,100k", help="Comma-separated store sizes (1k to 1m)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--budget-ms", type=float, default=200.0, help="Per-command goal for CLI cold starts")
+    parser.add_argument("--budget-max-tasks", type=int, default=10_000,
+                        help="Largest store the per-command goal applies to")
+    args = parser.parse_args()
+
+    current = run_suite([parse_size(size) for size in args.sizes.split(",")], args.runs)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        problems = compare(baseline, current, args.threshold, args.min_delta_ms,
+                           args.budget_ms, args.budget_max_tasks)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Synthetic task stores for the benchmarks.
+
+Tasks vary in status, priority, assignee and tags with fixed proportions and a fixed
+seed, so every run and every size sees the same mix. Stores are written straight in
+the tasks.json format, because building a million Task objects one by one would take
+longer than most of the measurements.
+"""
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from taskory.commands.serialization import write_stamp
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+STATUSES = [status.value for status in TaskStatus]
+PRIORITIES = [None, *(int(level) for level in TaskPriority)]
+ASSIGNEES = [None, "jeff", "iris", "bob", "alice", "carol"]
+TAGS = ["api", "ui", "db", "infra", "docs", "bug", "perf", "security"]
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def synthetic_records(count: int, seed: int = 42) -> Iterator[dict]:
+    """
+    Yield tasks in their tasks.json form.
+
+    Args:
+        count (int): Number of tasks.
+        seed (int): Random seed; the same seed gives the same tasks.
+
+    Returns:
+        Iterator[dict]: The task records.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        created = START + timedelta(seconds=i * 37)
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": f"Synthetic task {i}",
+            "status": rng.choice(STATUSES),
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(minutes=rng.randrange(10_000))).isoformat(),
+            "priority": rng.choice(PRIORITIES),
+            "assignee": rng.choice(ASSIGNEES),
+            "tags": rng.sample(TAGS, k=rng.randint(0, 3)),
+            "depends_on": None,
+        }
+
+
+def write_store(path: Path, count: int, seed: int = 42) -> None:
+    """
+    Write a synthetic tasks.json with its stamp, as if TaskStore had saved it.
+
+    Args:
+        path (Path): Path of the JSON file.
+        count (int): Number of tasks.
+        seed (int): Random seed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(list(synthetic_records(count, seed)), indent=2), encoding="utf-8")
+    write_stamp(path)
+
+
+def build_store(count: int, seed: int = 42) -> TaskStore:
+    """
+    Build an unbound in-memory store of synthetic tasks.
+
+    Args:
+        count (int): Number of tasks.
+        seed (int): Random seed.
+
+    Returns:
+        TaskStore: The populated store.
+    """
+    store = TaskStore()
+    for record in synthetic_records(count, seed):
+        store.add_task(Task.model_validate(record))
+    return store
@@ -1,116 +1,371 @@
-from typer import Typer, echo, Option
+import time
+_IMPORT_START = time.perf_counter()
+from typer import Typer, Context, Argument, Option
 from pathlib import Path
-from typing import Optional
-from taskory.commands.task_store import TaskStore
-from taskory.schemas import Task, TaskStatus
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
-import json
-from rich.panel import Panel
-from rich.align import Align
+from typing import TYPE_CHECKING, List, Optional
 from taskory.commands.splash import show_splash, maybe_show_splash, load_config, save_config
+from taskory.commands.tracing import traced
+
+# Reason: `taskory --help`, shell completion and every command pay for whatever this
+# module imports, so pydantic, the storage modules and rich rendering are imported
+# inside the commands that need them.
+if TYPE_CHECKING:
+    from uuid import UUID
+    from taskory.commands.task_store import TaskStore
+    from taskory.commands.daemon_client import RemoteStore
+
+if __name__ == "__main__":
+    # Reason: under `python -m taskory.cli` this module runs as __main__; registering it
+    # as taskory.cli too lets the command modules that import taskory.cli find this app.
+    import sys
+    sys.modules.setdefault("taskory.cli", sys.modules[__name__])
 
 app = Typer(help="Taskory CLI - Manage your tasks from the command line.")
 
 TASKS_DIR = Path(".taskory")
 TASKS_FILE = TASKS_DIR / "tasks.json"
 CONFIG_FILE = TASKS_DIR / "taskory.config"
+# Task IDs offered at most by shell completion.
+COMPLETION_LIMIT = 50
+
+class LazyConsole:
+    """
+    Stand-in for a rich Console that creates the real one on first use.
+    """
+    def __init__(self) -> None:
+        self._console = None
+
+    def __getattr__(self, name: str):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
 
-console = Console()
+console = LazyConsole()
+
+def error_console():
+    """
+    A rich Console on stderr, for notices that must not mix with piped output.
+    """
+    from rich.console import Console
+    return Console(stderr=True)
 
 # Ensure the .taskory directory exists before any file operations
 def ensure_tasks_dir():
     TASKS_DIR.mkdir(parents=True, exist_ok=True)
 
-def get_store() -> TaskStore:
+@traced("get_store")
+def get_store() -> "TaskStore":
     """
-    Load the TaskStore from the .taskory/tasks.json file.
+    Load the store configured for .taskory (see workspace.open_store).
+
+    By default tasks live in .taskory/tasks.json and each mutation is persisted as it
+    happens; .taskory/taskory.config can enable the journal or a binary snapshot, or
+    select "sqlite", "sharded" or "mapped" storage. When .taskory/search.db exists, writes also
+    update that search index.
+
+    When a `taskory serve` daemon is running for .taskory, a RemoteStore that forwards
+    each operation to it is returned and nothing is loaded from disk.
 
     Returns:
         TaskStore: The loaded task store.
     """
+    remote = connect_daemon()
+    if remote is not None:
+        return remote
+    from taskory.commands.workspace import open_store
     ensure_tasks_dir()
-    if TASKS_FILE.exists():
-        return TaskStore.load_from_file(str(TASKS_FILE))
-    return TaskStore()
+    return open_store(TASKS_DIR, load_config(CONFIG_FILE))
+
+def connect_daemon() -> Optional["RemoteStore"]:
+    """
+    Connect to the `taskory serve` daemon for .taskory, if one is running.
+
+    Returns:
+        Optional[RemoteStore]: A store backed by the daemon, or None.
+    """
+    from taskory.commands.daemon import socket_path_for
+    socket_path = socket_path_for(TASKS_DIR)
+    if not socket_path.exists():
+        return None
+    from taskory.commands.daemon_client import DaemonClient, RemoteStore
+    client = DaemonClient.connect(socket_path)
+    return RemoteStore(client) if client is not None else None
 
-def save_store(store: TaskStore):
+def store_lock():
+    """
+    Advisory lock on .taskory/tasks.lock, held by commands around their
+    read-modify-write so that concurrent taskory processes take turns.
+
+    Returns:
+        FileLock: The lock, for use in a with statement.
+    """
+    from taskory.commands.locking import FileLock, lock_path_for
+    return FileLock(lock_path_for(TASKS_FILE))
+
+@traced("save_store")
+def save_store(store: "TaskStore"):
     """
     Save the TaskStore to the .taskory/tasks.json file.
 
+    Stores returned by get_store are already persisted by their storage backend
+    (or by the daemon) after every change, so only stores without a backend are written.
+
     Args:
         store (TaskStore): The task store to save.
     """
+    from taskory.commands.task_store import TaskStore
+    if not isinstance(store, TaskStore) or store.backend is not None:
+        return
     ensure_tasks_dir()
     store.save_to_file(str(TASKS_FILE))
 
+def require_id(id: Optional[str], store: "TaskStore") -> "UUID":
+    """
+    Resolve the task ID argument of a single-task command: a full ID or, as in git, any
+    unique prefix of at least four characters (see id_index.resolve_id).
+
+    Raises:
+        ValueError: If no ID was given, or it is not hex, too short or ambiguous.
+        KeyError: If no task matches.
+    """
+    if id is None:
+        raise ValueError("Give a task ID, or select tasks with --where or --older-than.")
+    from taskory.commands.id_index import resolve_id
+    from taskory.commands.workspace import id_finder
+    return resolve_id(id, id_finder(TASKS_DIR, store))
+
+def complete_task_id(incomplete: str) -> List[str]:
+    """
+    Shell completion for task IDs, read from .taskory/ids.idx without loading the store.
+    """
+    from taskory.commands.workspace import complete_ids
+    return complete_ids(TASKS_DIR, load_config(CONFIG_FILE), incomplete, limit=COMPLETION_LIMIT)
+
 @app.command()
-def new(title: str):
+def new(
+    title: str,
+    depends_on: Optional[List[str]] = Option(None, help="ID of a task that must be done first (repeatable)",
+                                             autocompletion=complete_task_id),
+):
     """
     Create a new task with the given title.
 
     Args:
         title (str): The title of the new task.
+        depends_on (Optional[List[str]]): IDs of tasks the new task depends on.
     """
-    store = get_store()
-    task = Task(title=title)
-    store.add_task(task)
-    save_store(store)
+    from taskory.schemas import Task
+    with store_lock():
+        store = get_store()
+        try:
+            deps = [store.get_task_by_id(require_id(dep, store)).id for dep in depends_on or ()]
+            task = Task(title=title, depends_on=deps or None)
+            store.add_task(task)
+        except KeyError:
+            console.print("Dependency not found; create that task first.", style="bold red")
+            raise SystemExit(1)
+        except ValueError as e:
+            console.print(str(e), style="bold red")
+            raise SystemExit(1)
+        save_store(store)
     console.print(f"Task created: {task.id} - {task.title}", style="bold green")
 
+@app.command("next")
+def next_task():
+    """
+    Show the highest-priority todo task whose dependencies are all done.
+    """
+    task = get_store().next_task()
+    if task is None:
+        console.print("No unblocked tasks.", style="yellow")
+        return
+    priority = task.priority.name if task.priority is not None else "-"
+    console.print(f"Next task: {task.id} | {priority} | {task.title}", style="bold green")
+
 @app.command()
-def list(status: Optional[str] = Option(None, help="Filter by status: todo, in_progress, done")):
+def list(
+    status: Optional[str] = Option(None, help="Filter by status: todo, in_progress, done"),
+    assignee: Optional[str] = Option(None, help="Filter by assignee"),
+    tag: Optional[List[str]] = Option(None, help="Filter by tag (repeat to require several tags)"),
+    priority: Optional[str] = Option(None, help="Filter by priority: low, medium, high (or 1-3)"),
+    min_priority: Optional[str] = Option(None, help="Only tasks at or above this priority"),
+    max_priority: Optional[str] = Option(None, help="Only tasks at or below this priority"),
+    sort: Optional[str] = Option(None, help="Sort by priority, created_at or updated_at"),
+    reverse: bool = Option(False, help="Reverse the sort order"),
+    limit: Optional[int] = Option(None, help="Show at most this many tasks"),
+    cursor: Optional[str] = Option(None, help="Continue a listing where the previous page ended"),
+    fmt: Optional[str] = Option(None, "--format", help="table, plain, jsonl, csv or tsv (default: table on a terminal, plain otherwise)"),
+):
     """
-    List all tasks, optionally filtered by status.
+    List all tasks, optionally filtered by status, assignee, tags and priority.
+    All given filters must match.
+
+    With --sort, --limit or --cursor the tasks are sorted (by created_at unless --sort
+    says otherwise) and shown one page at a time; the command prints the cursor for the
+    next page.
+
+    Tasks are streamed as plain "id | status | title" lines, JSON lines, CSV or TSV
+    with --format, and as plain lines by default when stdout is not a terminal.
 
     Args:
         status (Optional[str]): Filter tasks by status.
+        assignee (Optional[str]): Filter tasks by assignee.
+        tag (Optional[List[str]]): Tags that tasks must all carry.
+        priority (Optional[str]): Filter tasks by exact priority.
+        min_priority (Optional[str]): Lowest priority to include.
+        max_priority (Optional[str]): Highest priority to include.
+        sort (Optional[str]): Field to sort by.
+        reverse (bool): Reverse the sort order.
+        limit (Optional[int]): Page size.
+        cursor (Optional[str]): Cursor printed by the previous page.
+        fmt (Optional[str]): Output format.
     """
-    store = get_store()
-    if status:
-        try:
-            status_enum = TaskStatus(status)
-        except ValueError:
-            console.print(f"Invalid status: {status}", style="bold red")
-            raise SystemExit(1)
-        tasks = store.list_tasks(status=status_enum)
-    else:
-        tasks = store.list_tasks()
-    if not tasks:
-        console.print("No tasks found.", style="yellow")
-        return
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("ID", style="dim", overflow="fold")
-    table.add_column("Status")
-    table.add_column("Title")
-    for task in tasks:
-        status_color = {
-            "todo": "yellow",
-            "in_progress": "cyan",
-            "done": "green"
-        }.get(task.status.value, "white")
-        table.add_row(str(task.id), Text(task.status.value, style=status_color), task.title)
-    console.print(table)
+    from taskory.commands.listing import choose_format, output_tasks, parse_filters
+    from taskory.commands.workspace import query_stored
+    next_cursor = None
+    try:
+        fmt = choose_format(fmt)
+        filters = parse_filters(status, assignee, tag, priority, min_priority, max_priority)
+        if sort or limit is not None or cursor:
+            page = get_store().page_tasks(limit, sort_by=sort or "created_at", reverse=reverse, cursor=cursor, **filters)
+            tasks, next_cursor = page.tasks, page.cursor
+        else:
+            tasks = query_stored(TASKS_DIR, load_config(CONFIG_FILE), filters)
+            if tasks is None:
+                tasks = get_store().iter_tasks(**filters)
+    except ValueError as e:
+        console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    output_tasks(console, tasks, fmt, "No tasks found.")
+    if next_cursor:
+        # Reason: on stderr, so that piped pages hold nothing but rows.
+        hint = console if fmt == "table" else error_console()
+        hint.print(f"More tasks: add --cursor {next_cursor}", style="dim", soft_wrap=True)
+
+@app.command()
+def plan(
+    limit: Optional[int] = Option(None, help="Show at most this many tasks"),
+    fmt: Optional[str] = Option(None, "--format", help="table, plain, jsonl, csv or tsv (default: table on a terminal, plain otherwise)"),
+):
+    """
+    Show the tasks in progress, highest priority first.
+
+    Args:
+        limit (Optional[int]): How many tasks to show.
+        fmt (Optional[str]): Output format (see list).
+    """
+    show_top("in_progress", limit, fmt, "No tasks in progress.")
+
+@app.command()
+def focus(
+    limit: int = Option(3, help="How many tasks to show"),
+    fmt: Optional[str] = Option(None, "--format", help="table, plain, jsonl, csv or tsv (default: table on a terminal, plain otherwise)"),
+):
+    """
+    Show the top todo tasks, highest priority first and oldest first among equals.
+
+    Args:
+        limit (int): How many tasks to show (default 3).
+        fmt (Optional[str]): Output format (see list).
+    """
+    show_top("todo", limit, fmt, "No todo tasks.")
+
+def show_top(status: str, limit: Optional[int], fmt: Optional[str], empty_message: str):
+    """
+    Print the first tasks of one status in priority order.
+
+    Only those tasks are selected from the store; it is not sorted as a whole.
+
+    Args:
+        status (str): The status to show.
+        limit (Optional[int]): How many tasks to show; None shows all of them.
+        fmt (Optional[str]): Output format (see list).
+        empty_message (str): Printed when no task has the status.
+    """
+    from taskory.commands.listing import choose_format, output_tasks
+    from taskory.schemas import TaskStatus
+    try:
+        fmt = choose_format(fmt)
+        tasks = get_store().page_tasks(limit, sort_by="priority", status=TaskStatus(status)).tasks
+    except ValueError as e:
+        console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    output_tasks(console, tasks, fmt, empty_message, show_priority=True)
+
+@app.command()
+def search(
+    query: str,
+    status: Optional[str] = Option(None, help="Only tasks with this status: todo, in_progress, done"),
+    limit: int = Option(20, help="Show at most this many tasks"),
+    rebuild: bool = Option(False, help="Rebuild the search index first"),
+):
+    """
+    Find the tasks whose title or tags contain every word (or word prefix) of the query,
+    best match first, using the index in .taskory/search.db (rebuilt when out of date).
+
+    Args:
+        query (str): The words to look for.
+        status (Optional[str]): Only show tasks with this status.
+        limit (int): How many tasks to show (default 20).
+        rebuild (bool): Rebuild the index even if it looks up to date.
+    """
+    from taskory.commands import search_index
+    from taskory.commands.listing import parse_filters
+    from taskory.commands.workspace import SEARCH_INDEX_FILE, store_version
+    try:
+        if limit < 1:
+            raise ValueError("The limit must be at least 1.")
+        status_enum = parse_filters(status)["status"]
+    except ValueError as e:
+        console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    ensure_tasks_dir()
+    with store_lock():
+        version = store_version(TASKS_DIR, load_config(CONFIG_FILE))
+        hits = search_index.search(TASKS_DIR / SEARCH_INDEX_FILE, version, lambda: get_store().iter_tasks(),
+                                   query, status=status_enum, limit=limit, rebuild=rebuild)
+    if not hits:
+        console.print("No matching tasks.", style="yellow")
+    for hit in hits:
+        console.print(f"{hit.id} | {hit.status} | {hit.title}", soft_wrap=True, highlight=False, markup=False)
 
 @app.command()
-def update(id: str, status: str = Option("in_progress", help="New status: todo, in_progress, done")):
+def update(
+    id: Optional[str] = Argument(None, help="ID (or unique ID prefix) of the task to update",
+                                 autocompletion=complete_task_id),
+    status: Optional[str] = Option(None, help="New status: todo, in_progress, done (default: in_progress)"),
+    where: Optional[List[str]] = Option(None, help="Update every task matching key=value (repeatable)"),
+    assign: Optional[List[str]] = Option(None, "--set", help="field=value to set on every match (repeatable)"),
+    older_than: Optional[str] = Option(None, help="Only tasks not updated for this long, e.g. 90d"),
+    dry_run: bool = Option(False, help="Only count the tasks that would change"),
+):
     """
-    Update the status of a task by its ID.
+    Update the status of a task by its ID, or update every task matching --where.
 
     Args:
-        id (str): The ID of the task to update.
-        status (str): The new status for the task (default: in_progress).
+        id (Optional[str]): The ID of the task to update.
+        status (Optional[str]): The new status (default for one task: in_progress).
+        where (Optional[List[str]]): key=value filters (status, assignee, tag, priority,
+            min_priority, max_priority) that tasks must all match.
+        assign (Optional[List[str]]): field=value pairs (status, priority, assignee, tags, title).
+        older_than (Optional[str]): Only tasks not updated for this long.
+        dry_run (bool): Count the matches without changing them.
     """
-    store = get_store()
+    from taskory.schemas import TaskStatus
+    if where or assign or older_than or dry_run:
+        run_bulk(id, where, older_than, dry_run, [*(assign or ()), *([f"status={status}"] if status else ())])
+        return
     try:
-        status_enum = TaskStatus(status)
+        status_enum = TaskStatus(status or "in_progress")
     except ValueError:
         console.print(f"Invalid status: {status}", style="bold red")
         raise SystemExit(1)
     try:
-        task = store.update_task(id, status=status_enum)
-        save_store(store)
+        with store_lock():
+            store = get_store()
+            task = store.update_task(require_id(id, store), status=status_enum)
+            save_store(store)
         console.print(f"Task updated: {task.id} | {task.status.value} | {task.title}", style="bold green")
     except KeyError:
         console.print(f"Task with id {id} not found.", style="bold red")
@@ -120,18 +375,32 @@ def update(id: str, status: str = Option("in_progress", help="New status: todo,
         raise SystemExit(1)
 
 @app.command()
-def delete(id: str):
+def delete(
+    id: Optional[str] = Argument(None, help="ID (or unique ID prefix) of the task to delete",
+                                 autocompletion=complete_task_id),
+    where: Optional[List[str]] = Option(None, help="Delete every task matching key=value (repeatable)"),
+    older_than: Optional[str] = Option(None, help="Only tasks not updated for this long, e.g. 90d"),
+    dry_run: bool = Option(False, help="Only count the tasks that would be deleted"),
+):
     """
-    Delete a task by its ID.
+    Delete a task by its ID, or every task matching --where and --older-than.
 
     Args:
-        id (str): The ID of the task to delete.
+        id (Optional[str]): The ID of the task to delete.
+        where (Optional[List[str]]): key=value filters, as for update.
+        older_than (Optional[str]): Only tasks not updated for this long.
+        dry_run (bool): Count the matches without deleting them.
     """
-    store = get_store()
+    if where or older_than or dry_run:
+        run_bulk(id, where, older_than, dry_run)
+        return
     try:
-        store.delete_task(id)
-        save_store(store)
-        console.print(f"Task deleted: {id}", style="bold green")
+        with store_lock():
+            store = get_store()
+            task_id = require_id(id, store)
+            store.delete_task(task_id)
+            save_store(store)
+        console.print(f"Task deleted: {task_id}", style="bold green")
     except KeyError:
         console.print(f"Task with id {id} not found.", style="bold red")
         raise SystemExit(1)
@@ -139,6 +408,48 @@ def delete(id: str):
         console.print(str(e), style="bold red")
         raise SystemExit(1)
 
+def run_bulk(id: Optional[str], where: Optional[List[str]], older_than: Optional[str], dry_run: bool,
+             assignments: Optional[List[str]] = None):
+    """
+    Run update --where (when assignments is given) or delete --where in one store write.
+
+    Args:
+        id (Optional[str]): The ID argument, which must not be combined with --where.
+        where (Optional[List[str]]): key=value filters.
+        older_than (Optional[str]): Age such as 90d.
+        dry_run (bool): Count the matches without changing them.
+        assignments (Optional[List[str]]): field=value pairs to set.
+    """
+    from taskory.commands.bulk import parse_age, parse_assignments, parse_where
+    action = "update" if assignments is not None else "delete"
+    try:
+        if id is not None:
+            raise ValueError("Give either a task ID or --where/--older-than, not both.")
+        if not where and not older_than:
+            raise ValueError(f"Select the tasks to {action} with --where or --older-than.")
+        filters = parse_where(where or [])
+        age = parse_age(older_than) if older_than else None
+        fields = parse_assignments(assignments) if assignments is not None else None
+        with store_lock():
+            store = get_store()
+            if fields is not None:
+                tasks = store.update_where(fields, older_than=age, dry_run=dry_run, **filters)
+            else:
+                tasks = store.delete_where(older_than=age, dry_run=dry_run, **filters)
+            save_store(store)
+    except ValueError as e:
+        console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    done = {"update": "Updated", "delete": "Deleted"}[action]
+    if dry_run:
+        console.print(f"Would {action} {len(tasks)} tasks (dry run).", style="yellow")
+    else:
+        console.print(f"{done} {len(tasks)} tasks.", style="bold green")
+
+# Store-wide commands (import, migrate, serve) live in cli_admin, `show` in cli_show
+# and the cross-project `workspace` in cli_workspace; they register their commands on app.
+from taskory import cli_admin, cli_show, cli_workspace  # noqa: E402,F401
+
 # --- About command ---
 @app.command()
 def about():
@@ -150,8 +461,35 @@ def about():
     console.print("[bold]Repo:[/bold] https://github.com/your-org/taskory\n")
     console.print("[dim]Built with Pydantic and LangChain.[/dim]")
 
-# --- Call splash logic at CLI startup ---
-maybe_show_splash(console, CONFIG_FILE)
+# --- Splash logic, run before each command (not at import) ---
+@app.callback()
+def startup(
+    ctx: Context,
+    profile: bool = Option(False, "--profile", help="Print per-phase timings to stderr after the command"),
+    cprofile: Optional[Path] = Option(None, "--cprofile", help="Write cProfile stats of the command to this file"),
+):
+    """
+    Show the first-run splash screen before a command runs, and start tracing when asked.
+
+    Piped runs skip the splash (and keep it for the first run on a terminal), so that
+    their output holds only what the command prints.
+
+    Args:
+        ctx (Context): The click context of the invocation.
+        profile (bool): Trace the command (also enabled by TASKORY_TRACE).
+        cprofile (Optional[Path]): File for cProfile stats.
+    """
+    if ctx.resilient_parsing:
+        # Shell completion must stay silent and fast.
+        return
+    from taskory.commands import tracing
+    mode = tracing.env_mode() or ("text" if profile else None)
+    if mode is not None or cprofile is not None:
+        ctx.call_on_close(tracing.trace_command(ctx.invoked_subcommand or "taskory", mode, cprofile, _IMPORT_START))
+    import sys
+    if not sys.stdout.isatty():
+        return
+    maybe_show_splash(console, CONFIG_FILE)
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
@@ -0,0 +1,155 @@
+from pathlib import Path
+from typing import Optional
+from typer import Argument, Option
+from taskory import cli
+from taskory.commands.splash import load_config, save_config
+
+# Commands that work on the store as a whole. They are registered on cli.app when
+# taskory.cli imports this module, and reach the CLI's paths and helpers through the
+# cli module so that they follow it (tests patch cli.TASKS_DIR, for example).
+
+@cli.app.command("import")
+def import_tasks(path: Path):
+    """
+    Import tasks from a JSON file in one transaction.
+
+    The file holds a JSON array of task objects (the tasks.json format, where only
+    "title" is required) or one task object per line. All tasks are added with a
+    single save; if any task is invalid, nothing is imported.
+
+    Args:
+        path (Path): The file to import tasks from.
+    """
+    from taskory.commands.serialization import read_task_records
+    try:
+        items = read_task_records(path)
+    except (OSError, ValueError) as e:
+        cli.console.print(f"Could not read {path}: {e}", style="bold red")
+        raise SystemExit(1)
+    from taskory.schemas import Task
+    with cli.store_lock():
+        store = cli.get_store()
+        try:
+            with store.batch():
+                for item in items:
+                    store.add_task(Task.model_validate(item))
+        except ValueError as e:
+            cli.console.print(f"Import failed, no tasks were added: {e}", style="bold red")
+            raise SystemExit(1)
+        cli.save_store(store)
+    cli.console.print(f"Imported {len(items)} tasks from {path}", style="bold green")
+
+@cli.app.command()
+def migrate(to: str = Option(..., help="Target storage: json, sqlite, sharded or mapped")):
+    """
+    Copy all tasks to another storage backend and switch the config to it.
+
+    Args:
+        to (str): The storage to migrate to.
+    """
+    from taskory.commands.mapped_store import MappedTaskStore
+    from taskory.commands.storage import BACKENDS, open_backend
+    targets = (*BACKENDS, "mapped")
+    if to not in targets:
+        cli.console.print(f"Invalid storage: {to} (choose from {', '.join(targets)})", style="bold red")
+        raise SystemExit(1)
+    if cli.connect_daemon() is not None:
+        cli.console.print("Stop the running `taskory serve` daemon before migrating.", style="bold red")
+        raise SystemExit(1)
+    config = load_config(cli.CONFIG_FILE)
+    current = config.get("storage", "json")
+    if to == current:
+        cli.console.print(f"Already using {to} storage.", style="yellow")
+        return
+    with cli.store_lock():
+        tasks = cli.get_store().list_tasks()
+        if to == "mapped":
+            MappedTaskStore.from_tasks(cli.TASKS_DIR, tasks)
+        else:
+            open_backend(to, cli.TASKS_DIR).replace_all(tasks)
+        config["storage"] = to
+        save_config(config, cli.CONFIG_FILE)
+    cli.console.print(f"Migrated {len(tasks)} tasks from {current} to {to} storage.", style="bold green")
+
+@cli.app.command()
+def serve(flush_interval: float = Option(0.5, help="Seconds between batched writes to disk")):
+    """
+    Run a daemon that keeps the tasks in memory and serves other taskory commands.
+
+    While it runs, commands in this directory send their operations to it over
+    .taskory/taskory.sock instead of loading and saving the store. Changes are written
+    to disk in batches every flush interval and on exit (Ctrl+C or SIGTERM).
+
+    Args:
+        flush_interval (float): Seconds between batched writes.
+    """
+    import asyncio
+    from taskory.commands.daemon import TaskDaemon, socket_path_for
+    from taskory.commands.task_store import TaskStore
+    if cli.connect_daemon() is not None:
+        cli.console.print("A taskory daemon is already running here.", style="bold red")
+        raise SystemExit(1)
+    store = cli.get_store()
+    if not isinstance(store, TaskStore):
+        cli.console.print("The daemon does not support mapped storage.", style="bold red")
+        raise SystemExit(1)
+    socket_path = socket_path_for(cli.TASKS_DIR)
+    daemon = TaskDaemon(store, socket_path, flush_interval=flush_interval)
+
+    def ready():
+        cli.console.print(f"Serving {len(store.list_tasks())} tasks on {socket_path}", style="bold green")
+
+    asyncio.run(daemon.run(ready=ready))
+    cli.console.print("Daemon stopped, all changes saved.", style="bold green")
+
+@cli.app.command()
+def parse(
+    path: Optional[Path] = Argument(None, help="The plan (default: planning.json next to .taskory)"),
+    dry_run: bool = Option(False, help="Print the generated tasks instead of adding them"),
+):
+    """
+    Generate tasks for the goals in planning.json with the configured model.
+
+    Every goal is sent to the model at the same time, up to the configured concurrency,
+    and the replies are cached in .taskory/llm_cache/, so parsing an unchanged plan
+    again makes no requests. Tasks made for the same goal before are kept as they are;
+    only new ones are added. The model is set by "llm" in .taskory/taskory.config, e.g.
+    {"llm": {"provider": "stub"}} for the offline stub.
+
+    Args:
+        path (Optional[Path]): The planning file.
+        dry_run (bool): Only print the tasks.
+    """
+    import asyncio
+    from taskory.commands.planning import PLANNING_FILE, parse_planning, read_planning
+    from taskory.llm_interface import LLMError, open_client
+    path = path or cli.TASKS_DIR.parent / PLANNING_FILE
+    try:
+        planning = read_planning(path)
+    except (OSError, ValueError) as e:
+        cli.console.print(f"Could not read {path}: {e}", style="bold red")
+        raise SystemExit(1)
+    try:
+        client = open_client(cli.TASKS_DIR, load_config(cli.CONFIG_FILE))
+        tasks = asyncio.run(parse_planning(planning, client))
+    except (LLMError, ValueError) as e:
+        cli.console.print(f"Parsing failed, no tasks were added: {e}", style="bold red")
+        raise SystemExit(1)
+    summary = f"{len(planning.goals)} goals, {len(tasks)} tasks, {client.cache_hits} cached replies"
+    if dry_run:
+        for task in tasks:
+            cli.console.print(f"{task.id}  {task.title}", soft_wrap=True, highlight=False, markup=False)
+        cli.console.print(summary, style="bold green")
+        return
+    with cli.store_lock():
+        store = cli.get_store()
+        added = 0
+        with store.batch():
+            for task in tasks:
+                try:
+                    store.get_task_by_id(task.id)
+                except KeyError:
+                    store.add_task(task)
+                    added += 1
+        cli.save_store(store)
+    cli.console.print(f"Added {added} new tasks ({summary})", style="bold green")
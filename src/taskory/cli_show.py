@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from typer import Argument, Option
+from taskory import cli
+
+if TYPE_CHECKING:
+    from taskory.commands.change_feed import ChangeEvent, ChangeFeed
+
+# Commands that show tasks outside of listings: one task (show) and the stream of
+# changes (watch). Like cli_admin, they are registered on cli.app when taskory.cli
+# imports this module.
+
+SHOW_FORMATS = ("text", "json")
+
+
+@cli.app.command()
+def show(
+    id: str = Argument(..., help="ID (or unique ID prefix) of the task", autocompletion=cli.complete_task_id),
+    fmt: Optional[str] = Option(None, "--format", help="text or json (default: text)"),
+):
+    """
+    Show every field of one task.
+
+    The ID may be any unique prefix of at least four characters, as printed by list.
+
+    Args:
+        id (str): The task ID or ID prefix.
+        fmt (Optional[str]): Output format.
+    """
+    from taskory.commands.serialization import serialize_task
+    fmt = fmt or "text"
+    try:
+        if fmt not in SHOW_FORMATS:
+            raise ValueError(f"Invalid format: {fmt} (choose from {', '.join(SHOW_FORMATS)})")
+        store = cli.get_store()
+        task = store.get_task_by_id(cli.require_id(id, store))
+    except KeyError:
+        cli.console.print(f"Task with id {id} not found.", style="bold red")
+        raise SystemExit(1)
+    except ValueError as e:
+        cli.console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    record = serialize_task(task)
+    if fmt == "json":
+        print(json.dumps(record, indent=2))
+        return
+    for field, value in record.items():
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        cli.console.print(f"{field}: {'-' if value in (None, '') else value}", soft_wrap=True,
+                          highlight=False, markup=False)
+
+
+@cli.app.command()
+def watch(
+    since: Optional[int] = Option(None, help="Resume after this sequence number instead of starting with a snapshot"),
+    once: bool = Option(False, help="Print the pending events and exit instead of following the feed"),
+    interval: float = Option(0.5, help="Seconds between checks for new events"),
+):
+    """
+    Stream task changes as JSON lines: {"seq", "op", "id", "task"}.
+
+    op is "add", "update" or "delete" (whose task is null). Without --since, the stream
+    starts with a "reset" event followed by an "add" for every current task, all
+    numbered with the feed's latest sequence number. A consumer that stops can resume
+    with --since and the last seq it applied. It then gets only the later events, or a
+    new reset if the feed no longer holds them.
+
+    Args:
+        since (Optional[int]): The last sequence number already applied.
+        once (bool): Exit once the pending events are printed.
+        interval (float): Polling interval in seconds.
+    """
+    from taskory.commands.change_feed import FEED_FILE, ChangeFeed, FeedGapError
+    if cli.load_config(cli.CONFIG_FILE).get("storage", "json") == "mapped":
+        cli.console.print("The change feed does not support mapped storage.", style="bold red")
+        raise SystemExit(1)
+    cli.ensure_tasks_dir()
+    feed = ChangeFeed(cli.TASKS_DIR / FEED_FILE)
+    feed.enable()
+    try:
+        position = since
+        while True:
+            try:
+                events = list(feed.read(position)) if position is not None else None
+            except FeedGapError:
+                events = None
+            if events is None:
+                events, position = feed_snapshot(feed)
+            elif events:
+                position = events[-1].seq
+            for event in events:
+                sys.stdout.write(event.to_json() + "\n")
+            sys.stdout.flush()
+            if once:
+                return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return
+    except BrokenPipeError:
+        # Reason: a consumer that stops reading ends the stream quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(0)
+
+
+def feed_snapshot(feed: "ChangeFeed") -> Tuple[List["ChangeEvent"], int]:
+    """
+    Reads every task together with the feed position they reflect.
+
+    Args:
+        feed (ChangeFeed): The directory's change feed.
+
+    Returns:
+        Tuple[List[ChangeEvent], int]: A reset event and one add event per task, and
+            the sequence number to resume from.
+    """
+    from taskory.commands.change_feed import ChangeEvent
+    from taskory.commands.serialization import serialize_task
+    with cli.store_lock():
+        tasks = cli.get_store().list_tasks()
+        head = feed.head()
+    events = [ChangeEvent(head, "reset", None, None)]
+    events.extend(ChangeEvent(head, "add", str(task.id), serialize_task(task)) for task in tasks)
+    return events, head
@@ -0,0 +1,84 @@
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+from typer import Argument, Option
+from taskory import cli
+
+# Cross-project queries over every .taskory store under a root (see
+# commands.workspace_index). Like cli_admin, registered on cli.app when taskory.cli
+# imports this module.
+
+WORKSPACE_FORMATS = ("plain", "jsonl")
+
+
+@cli.app.command()
+def workspace(
+    root: Path = Argument(Path("."), help="Directory whose projects (folders holding .taskory) are searched"),
+    next_task: bool = Option(False, "--next", help="Show the task to work on next across all projects"),
+    status: Optional[str] = Option(None, help="Filter by status: todo, in_progress, done"),
+    assignee: Optional[str] = Option(None, help="Filter by assignee"),
+    tag: Optional[List[str]] = Option(None, help="Filter by tag (repeat to require several tags)"),
+    priority: Optional[str] = Option(None, help="Filter by priority: low, medium, high (or 1-3)"),
+    min_priority: Optional[str] = Option(None, help="Only tasks at or above this priority"),
+    max_priority: Optional[str] = Option(None, help="Only tasks at or below this priority"),
+    fmt: Optional[str] = Option(None, "--format", help="plain or jsonl (default: plain)"),
+    workers: Optional[int] = Option(None, help="Largest number of processes loading stores"),
+):
+    """
+    List the tasks of every project under a root, or the next one to work on.
+
+    Each folder holding a .taskory directory is a project. Their tasks are merged into
+    one index cached in <root>/.taskory-workspace/; each run reloads only the stores
+    that changed since the last one, several at a time in worker processes. Plain lines
+    are "project | id | status | title"; JSON lines add "project" to the tasks.json form.
+
+    Args:
+        root (Path): The workspace root.
+        next_task (bool): Show the next task instead of listing.
+        status (Optional[str]): Filter tasks by status.
+        assignee (Optional[str]): Filter tasks by assignee.
+        tag (Optional[List[str]]): Tags that tasks must all carry.
+        priority (Optional[str]): Filter tasks by exact priority.
+        min_priority (Optional[str]): Lowest priority to include.
+        max_priority (Optional[str]): Highest priority to include.
+        fmt (Optional[str]): Output format.
+        workers (Optional[int]): Largest number of worker processes.
+    """
+    from taskory.commands.listing import parse_filters
+    from taskory.commands.serialization import serialize_task
+    from taskory.commands.workspace_index import WorkspaceIndex
+    fmt = fmt or "plain"
+    try:
+        if fmt not in WORKSPACE_FORMATS:
+            raise ValueError(f"Invalid format: {fmt} (choose from {', '.join(WORKSPACE_FORMATS)})")
+        filters = parse_filters(status, assignee, tag, priority, min_priority, max_priority)
+        if not root.is_dir():
+            raise ValueError(f"Not a directory: {root}")
+        index = WorkspaceIndex(root, workers=workers)
+        index.refresh()
+    except (OSError, ValueError) as e:
+        cli.console.print(str(e), style="bold red")
+        raise SystemExit(1)
+    errors = cli.error_console()
+    for project, error in index.errors.items():
+        errors.print(f"Skipped {project}: {error}", style="yellow", soft_wrap=True)
+    if next_task:
+        task = index.store.next_task()
+        if task is None:
+            cli.console.print("No unblocked tasks.", style="yellow")
+            return
+        task_priority = task.priority.name if task.priority is not None else "-"
+        cli.console.print(f"Next task: {index.projects[task.id]} | {task.id} | {task_priority} | {task.title}",
+                          style="bold green", soft_wrap=True, highlight=False, markup=False)
+        return
+    write = sys.stdout.write
+    count = 0
+    for count, task in enumerate(index.store.iter_tasks(**filters), 1):
+        project = index.projects[task.id]
+        if fmt == "jsonl":
+            write(json.dumps({**serialize_task(task), "project": project}, ensure_ascii=False) + "\n")
+        else:
+            write(f"{project} | {task.id} | {task.status.value} | {task.title}\n")
+    if not count:
+        errors.print("No tasks found.", style="yellow")
@@ -0,0 +1,187 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Union
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.task_store import TaskStore
+from taskory.commands.storage import StaleStoreError
+
+# Reason: long enough to fold a burst of mutations (an import loop, a request fan-out)
+# into one write, short enough that data reaches disk almost at once.
+DEFAULT_DEBOUNCE = 0.05
+
+
+class AsyncTaskStore:
+    """
+    Asyncio front end for TaskStore that never blocks the event loop on disk writes.
+
+    Mutations change the in-memory tasks and return at once. A background writer
+    waits `debounce` seconds after the first unwritten change, then writes every change
+    made so far in one backend write on a worker thread. flush() and aclose() wait until
+    everything is on disk.
+
+    The worker thread writes a copy of the task map taken on the loop thread, so changes
+    made during a write are left for the next one. It goes through the store's own write
+    path, so the change feed and the write listeners (search and id indexes) see the
+    writes as they would without the daemon.
+    """
+    def __init__(self, store: TaskStore, debounce: float = DEFAULT_DEBOUNCE) -> None:
+        """
+        Wraps a store. Its auto-save is switched off; this class writes for it.
+        Args:
+            store (TaskStore): The store to wrap.
+            debounce (float): Seconds to wait for more changes before writing.
+        """
+        store.auto_save = False
+        self.store = store
+        self.debounce = debounce
+        self._writer: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+    @classmethod
+    async def open(cls, file_path: str, debounce: float = DEFAULT_DEBOUNCE, **kwargs: Any) -> "AsyncTaskStore":
+        """
+        Loads a store on a worker thread and wraps it.
+        Args:
+            file_path (str): Path to the JSON file.
+            debounce (float): Seconds to wait for more changes before writing.
+            **kwargs: Further TaskStore options (journal, trusted, binary).
+        Returns:
+            AsyncTaskStore: The wrapped store.
+        """
+        store = await asyncio.to_thread(TaskStore, file_path, **kwargs)
+        return cls(store, debounce=debounce)
+
+    async def __aenter__(self) -> "AsyncTaskStore":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _lock(self) -> asyncio.Lock:
+        # Reason: created lazily so it binds to the loop that actually uses the store.
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    def schedule_write(self) -> None:
+        """
+        Starts the background writer if it is idle. Call it after changing the wrapped
+        store directly; the mutation methods here call it themselves.
+        """
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._write_later())
+
+    async def _write_later(self) -> None:
+        while self.store.dirty:
+            await asyncio.sleep(self.debounce)
+            try:
+                await self._write_pending()
+            except Exception as e:
+                # Reported by the next flush() or aclose().
+                self._error = e
+                return
+
+    async def _write_pending(self) -> None:
+        async with self._lock():
+            store = self.store
+            changes = store._take_unsaved()
+            if not changes or store.backend is None:
+                return
+            try:
+                await asyncio.to_thread(store._write, changes, store._tasks.copy())
+            except StaleStoreError:
+                # Another process wrote first: reload, merge and write on the loop thread,
+                # since the merge rebuilds the task map. This is the rare path.
+                try:
+                    store._write(changes)
+                except BaseException:
+                    store._requeue(changes)
+                    raise
+            except BaseException:
+                store._requeue(changes)
+                raise
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("The AsyncTaskStore is closed.")
+
+    async def flush(self) -> None:
+        """
+        Writes every change made so far and waits until it is on disk.
+
+        Raises:
+            Exception: The error of a failed background write, if any; its changes are
+                still pending and are retried here first.
+        """
+        error, self._error = self._error, None
+        await self._write_pending()
+        if error is not None:
+            raise error
+
+    async def aclose(self) -> None:
+        """
+        Stops the background writer after a final flush. Further mutations raise.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["AsyncTaskStore"]:
+        """
+        Groups mutations so that they are kept or rolled back together (see TaskStore.batch).
+
+        Returns:
+            Iterator[AsyncTaskStore]: The store itself, for use in a with statement.
+        """
+        self._check_open()
+        with self.store.batch():
+            yield self
+        self.schedule_write()
+
+    async def add_task(self, task: Task) -> None:
+        self._check_open()
+        self.store.add_task(task)
+        self.schedule_write()
+
+    async def update_task(self, task_id: Union[str, UUID], **kwargs: Any) -> Task:
+        self._check_open()
+        task = self.store.update_task(task_id, **kwargs)
+        self.schedule_write()
+        return task
+
+    async def delete_task(self, task_id: Union[str, UUID]) -> None:
+        self._check_open()
+        self.store.delete_task(task_id)
+        self.schedule_write()
+
+    async def get_task_by_id(self, task_id: Union[str, UUID]) -> Task:
+        return self.store.get_task_by_id(task_id)
+
+    async def list_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> List[Task]:
+        return self.store.list_tasks(
+            status=status,
+            assignee=assignee,
+            tags=tags,
+            priority=priority,
+            min_priority=min_priority,
+            max_priority=max_priority,
+        )
@@ -0,0 +1,231 @@
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.locking import atomic_write
+
+# File layout (little endian):
+#   header   magic "TKSB", format version, string count, task count
+#   strings  string count x (u32 byte length, UTF-8 bytes): interned tags and assignees
+#   tasks    task count x (fixed record, title bytes, tag count x u32 string number,
+#            dependency count x 16-byte id)
+MAGIC = b"TKSB"
+VERSION = 2
+HEADER = struct.Struct("<4sHxxII")
+LENGTH = struct.Struct("<I")
+# id, status code, priority (0 = none), assignee string (-1 = none), created_at and
+# updated_at as (epoch microseconds, UTC offset in minutes), tag count (-1 = no tag
+# list), title byte length, dependency count (-1 = no list).
+RECORD = struct.Struct("<16sBBiqhqhiIi")
+# Version 1 records have no dependency count (and no dependencies).
+RECORD_V1 = struct.Struct("<16sBBiqhqhiI")
+
+# Reason: codes are part of the file format, so they are listed explicitly instead of
+# being derived from enum order.
+STATUS_CODES: Dict[TaskStatus, int] = {TaskStatus.todo: 0, TaskStatus.in_progress: 1, TaskStatus.done: 2}
+STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+PRIORITY_BY_CODE = {int(priority): priority for priority in TaskPriority}
+
+# Offset value marking a naive datetime (no tzinfo), which is stored as its wall clock.
+NAIVE = -32768
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def binary_path_for(json_path: Union[str, Path]) -> Path:
+    """
+    Returns the path of the binary snapshot kept next to a JSON snapshot.
+    Args:
+        json_path (str | Path): Path to the JSON snapshot.
+    Returns:
+        Path: The binary snapshot path (e.g. .taskory/tasks.bin).
+    """
+    return Path(json_path).with_suffix(".bin")
+
+
+def _encode_time(value: datetime) -> Tuple[int, int]:
+    if value.tzinfo is None:
+        delta, offset = value - NAIVE_EPOCH, NAIVE
+    else:
+        delta = value - EPOCH
+        offset = int(value.utcoffset().total_seconds() // 60)
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return micros, offset
+
+
+def _decode_time(micros: int, offset: int, zones: Dict[int, timezone]) -> datetime:
+    if offset == NAIVE:
+        return NAIVE_EPOCH + timedelta(microseconds=micros)
+    zone = zones.get(offset)
+    if zone is None:
+        zone = zones[offset] = timezone.utc if offset == 0 else timezone(timedelta(minutes=offset))
+    return (EPOCH + timedelta(microseconds=micros)).astimezone(zone)
+
+
+def encode_tasks(tasks: Iterable[Task]) -> bytes:
+    """
+    Encodes tasks in the binary snapshot format.
+    Args:
+        tasks (Iterable[Task]): The tasks, in store order.
+    Returns:
+        bytes: The snapshot.
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        number = strings.get(value)
+        if number is None:
+            number = strings[value] = len(strings)
+        return number
+
+    body = []
+    count = 0
+    for task in tasks:
+        title = task.title.encode("utf-8")
+        tags = task.tags
+        depends_on = task.depends_on
+        created, created_offset = _encode_time(task.created_at)
+        updated, updated_offset = _encode_time(task.updated_at)
+        body.append(RECORD.pack(
+            task.id.bytes,
+            STATUS_CODES[TaskStatus(task.status)],
+            int(task.priority) if task.priority is not None else 0,
+            intern(task.assignee) if task.assignee is not None else -1,
+            created, created_offset,
+            updated, updated_offset,
+            len(tags) if tags is not None else -1,
+            len(title),
+            len(depends_on) if depends_on is not None else -1,
+        ))
+        body.append(title)
+        if tags:
+            body.append(struct.pack(f"<{len(tags)}I", *(intern(tag) for tag in tags)))
+        if depends_on:
+            body.append(b"".join(dep.bytes for dep in depends_on))
+        count += 1
+    table = []
+    for value in strings:
+        encoded = value.encode("utf-8")
+        table.append(LENGTH.pack(len(encoded)))
+        table.append(encoded)
+    return b"".join([HEADER.pack(MAGIC, VERSION, len(strings), count), *table, *body])
+
+
+def decode_tasks(raw: bytes) -> List[Task]:
+    """
+    Decodes a binary snapshot.
+
+    The file is only ever written by encode_tasks from validated tasks, so the models
+    are built without re-running validation.
+    Args:
+        raw (bytes): The snapshot.
+    Returns:
+        List[Task]: The tasks, in store order.
+    Raises:
+        ValueError: If the data is not a snapshot of a supported version, or is truncated.
+    """
+    try:
+        magic, version, string_count, task_count = HEADER.unpack_from(raw, 0)
+    except struct.error as e:
+        raise ValueError(f"Invalid binary snapshot: {e}") from e
+    if magic != MAGIC:
+        raise ValueError("Not a taskory binary snapshot.")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported binary snapshot version: {version}")
+    view = memoryview(raw)
+    pos = HEADER.size
+    construct = Task.model_construct
+    # Reason: every field is always given, and passing the set up front saves
+    # model_construct from working it out per task.
+    fields_set = set(Task.model_fields)
+    zones: Dict[int, timezone] = {}
+    record = RECORD if version == VERSION else RECORD_V1
+    try:
+        strings = []
+        for _ in range(string_count):
+            (length,) = LENGTH.unpack_from(raw, pos)
+            pos += LENGTH.size
+            strings.append(str(view[pos:pos + length], "utf-8"))
+            pos += length
+        tasks = []
+        for _ in range(task_count):
+            (task_id, status, priority, assignee, created, created_offset,
+             updated, updated_offset, tag_count, title_length, *rest) = record.unpack_from(raw, pos)
+            dep_count = rest[0] if rest else -1
+            pos += record.size
+            title = str(view[pos:pos + title_length], "utf-8")
+            pos += title_length
+            tags: Optional[List[str]] = None
+            if tag_count >= 0:
+                tags = [strings[number] for number in struct.unpack_from(f"<{tag_count}I", raw, pos)]
+                pos += 4 * tag_count
+            depends_on: Optional[List[UUID]] = None
+            if dep_count >= 0:
+                if pos + 16 * dep_count > len(raw):
+                    raise IndexError("dependency list past the end of the data")
+                depends_on = [UUID(bytes=raw[start:start + 16]) for start in range(pos, pos + 16 * dep_count, 16)]
+                pos += 16 * dep_count
+            tasks.append(construct(
+                fields_set,
+                id=UUID(bytes=task_id),
+                title=title,
+                status=STATUS_BY_CODE[status],
+                created_at=_decode_time(created, created_offset, zones),
+                updated_at=_decode_time(updated, updated_offset, zones),
+                priority=PRIORITY_BY_CODE[priority] if priority else None,
+                assignee=strings[assignee] if assignee >= 0 else None,
+                tags=tags,
+                depends_on=depends_on,
+            ))
+    except (struct.error, IndexError, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt binary snapshot at byte {pos}: {e!r}") from e
+    if pos != len(raw):
+        raise ValueError(f"Corrupt binary snapshot: {len(raw) - pos} trailing bytes")
+    return tasks
+
+
+def write_binary_snapshot(path: Union[str, Path], tasks: Iterable[Task]) -> None:
+    """
+    Writes tasks to a binary snapshot file.
+    Args:
+        path (str | Path): Target file.
+        tasks (Iterable[Task]): The tasks to write.
+    """
+    atomic_write(path, encode_tasks(tasks))
+
+
+def read_binary_snapshot(path: Union[str, Path]) -> List[Task]:
+    """
+    Reads every task from a binary snapshot file.
+    Args:
+        path (str | Path): The snapshot file.
+    Returns:
+        List[Task]: The tasks, in store order.
+    """
+    with open(path, "rb") as f:
+        return decode_tasks(f.read())
+
+
+def binary_is_current(json_path: Union[str, Path], binary_path: Union[str, Path]) -> bool:
+    """
+    Checks whether a binary snapshot should be loaded instead of its JSON snapshot.
+
+    The binary file wins when it is at least as new as the JSON file, so editing
+    tasks.json by hand makes it authoritative again.
+    Args:
+        json_path (str | Path): Path to the JSON snapshot.
+        binary_path (str | Path): Path to the binary snapshot.
+    Returns:
+        bool: True if the binary snapshot exists and is not older than the JSON one.
+    """
+    try:
+        binary_mtime = os.stat(binary_path).st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return binary_mtime >= os.stat(json_path).st_mtime_ns
+    except OSError:
+        return True
@@ -0,0 +1,198 @@
+import re
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus
+from taskory.commands.listing import parse_priority
+
+# --where keys and the list_tasks filter each one sets; "tag" may be repeated.
+WHERE_KEYS = ("status", "assignee", "tag", "priority", "min_priority", "max_priority")
+# Fields --set can change; an empty value clears the optional ones.
+SET_FIELDS = ("status", "priority", "assignee", "tags", "title")
+_AGE = re.compile(r"^(\d+)([mhdw])$")
+_AGE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_age(value: str) -> timedelta:
+    """
+    Parses an age such as 90d, 12h, 2w or 30m.
+
+    Args:
+        value (str): The age from the command line.
+
+    Returns:
+        timedelta: The age.
+
+    Raises:
+        ValueError: If the value is not a number followed by m, h, d or w.
+    """
+    match = _AGE.match(value.strip().lower())
+    if match is None:
+        raise ValueError(f"Invalid age: {value} (use a number and m, h, d or w, e.g. 90d)")
+    return timedelta(**{_AGE_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def _split(clause: str, option: str) -> List[str]:
+    """
+    Splits a key=value clause; dashes in the key become underscores.
+
+    Args:
+        clause (str): The clause, e.g. "min-priority=2".
+        option (str): The option it came from, for the error message.
+
+    Returns:
+        List[str]: The key and the value, stripped.
+
+    Raises:
+        ValueError: If the clause has no "=".
+    """
+    key, sep, value = clause.partition("=")
+    if not sep:
+        raise ValueError(f"Invalid {option} {clause!r}: expected key=value")
+    return [key.strip().replace("-", "_"), value.strip()]
+
+
+def parse_where(clauses: Iterable[str]) -> Dict[str, Any]:
+    """
+    Turns --where key=value clauses into list_tasks filters. All clauses must match.
+
+    Args:
+        clauses (Iterable[str]): Clauses such as "status=todo" or "tag=sprint-12".
+
+    Returns:
+        Dict[str, Any]: The filters.
+
+    Raises:
+        ValueError: If a clause is malformed, repeats a key other than tag, or holds
+            an invalid status or priority.
+    """
+    filters: Dict[str, Any] = {}
+    for clause in clauses:
+        key, value = _split(clause, "--where")
+        if key not in WHERE_KEYS:
+            raise ValueError(f"Invalid --where key: {key} (choose from {', '.join(WHERE_KEYS)})")
+        if key == "tag":
+            filters.setdefault("tags", []).append(value)
+            continue
+        if key in filters:
+            raise ValueError(f"--where {key} given twice")
+        if key == "status":
+            try:
+                filters[key] = TaskStatus(value)
+            except ValueError:
+                raise ValueError(f"Invalid status: {value}")
+        elif key == "assignee":
+            filters[key] = value
+        else:
+            filters[key] = parse_priority(value)
+    return filters
+
+
+def parse_assignments(assignments: Iterable[str]) -> Dict[str, Any]:
+    """
+    Turns --set field=value assignments into update_task fields.
+
+    tags takes a comma-separated list. An empty value clears priority, assignee or tags.
+
+    Args:
+        assignments (Iterable[str]): Assignments such as "status=done" or "tags=a,b".
+
+    Returns:
+        Dict[str, Any]: The fields to set.
+
+    Raises:
+        ValueError: If an assignment is malformed or names an unknown field or value.
+    """
+    fields: Dict[str, Any] = {}
+    for assignment in assignments:
+        key, value = _split(assignment, "--set")
+        if key not in SET_FIELDS:
+            raise ValueError(f"Invalid --set field: {key} (choose from {', '.join(SET_FIELDS)})")
+        if key == "status":
+            try:
+                fields[key] = TaskStatus(value)
+            except ValueError:
+                raise ValueError(f"Invalid status: {value}")
+        elif key == "title":
+            if not value:
+                raise ValueError("The title cannot be empty.")
+            fields[key] = value
+        elif not value:
+            fields[key] = None
+        elif key == "priority":
+            fields[key] = parse_priority(value)
+        elif key == "tags":
+            fields[key] = [tag.strip() for tag in value.split(",") if tag.strip()]
+        else:
+            fields[key] = value
+    return fields
+
+
+class BulkOperations:
+    """
+    Set-based updates and deletes for task stores.
+
+    The matching tasks are selected once through iter_tasks (so the secondary indexes
+    answer the filters), then changed inside one batch: the whole operation is a single
+    write, and a failure part-way leaves the store as it was.
+
+    Expects the store to provide iter_tasks, update_task, delete_task and batch.
+    """
+    def _matching_ids(self, older_than: Optional[timedelta], filters: Dict[str, Any]) -> List[UUID]:
+        # Reason: the ids are collected before anything changes, because the store must
+        # not change while iter_tasks is in use.
+        if older_than is None:
+            return [task.id for task in self.iter_tasks(**filters)]
+        cutoff = (datetime.now(UTC) - older_than).timestamp()
+        # timestamp() also compares naive datetimes (taken as local time) with aware ones.
+        return [task.id for task in self.iter_tasks(**filters) if task.updated_at.timestamp() < cutoff]
+
+    def update_where(
+        self,
+        fields: Dict[str, Any],
+        older_than: Optional[timedelta] = None,
+        dry_run: bool = False,
+        **filters: Any,
+    ) -> List[Task]:
+        """
+        Sets the same fields on every task matching the filters, in one write.
+
+        Args:
+            fields (Dict[str, Any]): Fields to set, as for update_task.
+            older_than (Optional[timedelta]): Only tasks not updated for this long.
+            dry_run (bool): Only return the matching tasks; change nothing.
+            **filters: The filters of list_tasks.
+
+        Returns:
+            List[Task]: The matching tasks, as updated (unchanged on a dry run).
+
+        Raises:
+            ValueError: If no field is given or a field is invalid.
+        """
+        if not fields:
+            raise ValueError("Nothing to set.")
+        ids = self._matching_ids(older_than, filters)
+        if dry_run:
+            return [self.get_task_by_id(task_id) for task_id in ids]
+        with self.batch():
+            return [self.update_task(task_id, **fields) for task_id in ids]
+
+    def delete_where(self, older_than: Optional[timedelta] = None, dry_run: bool = False, **filters: Any) -> List[Task]:
+        """
+        Deletes every task matching the filters, in one write.
+
+        Args:
+            older_than (Optional[timedelta]): Only tasks not updated for this long.
+            dry_run (bool): Only return the matching tasks; delete nothing.
+            **filters: The filters of list_tasks.
+
+        Returns:
+            List[Task]: The tasks that matched.
+        """
+        ids = self._matching_ids(older_than, filters)
+        tasks = [self.get_task_by_id(task_id) for task_id in ids]
+        if not dry_run:
+            with self.batch():
+                for task_id in ids:
+                    self.delete_task(task_id)
+        return tasks
@@ -0,0 +1,255 @@
+import json
+import os
+import re
+from contextlib import nullcontext
+from pathlib import Path
+from typing import ContextManager, Iterator, List, NamedTuple, Optional, Tuple, Union
+from uuid import UUID
+from taskory.commands.locking import FileLock, atomic_write, lock_path_for
+from taskory.commands.serialization import deserialize_task, serialize_task
+from taskory.commands.storage import Change
+
+FEED_FILE = "changes.jsonl"
+# The feed keeps the newest events: once it grows past this size, the older half of it
+# is dropped, and consumers that fall further behind must reload.
+MAX_FEED_BYTES = 8 * 1024 * 1024
+# Bytes read at a time when looking for the last event.
+TAIL_CHUNK = 64 * 1024
+# Every line starts with its sequence number, so events are skipped without decoding them.
+_SEQ = re.compile(rb'\{"seq":(\d+),')
+
+
+class FeedGapError(RuntimeError):
+    """
+    Raised when a consumer resumes from a sequence number whose following events are no
+    longer in the feed (trimmed, or the feed was recreated). It must reload everything.
+    """
+
+
+class ChangeEvent(NamedTuple):
+    """
+    One change in the feed, as stored and as printed by `taskory watch`.
+
+    `taskory watch` also prints "reset" events, with no id or task, before a snapshot.
+    """
+    seq: int
+    op: str  # "add", "update" or "delete"
+    id: Optional[str]
+    task: Optional[dict]  # the task in its tasks.json form; None for a delete
+
+    def to_json(self) -> str:
+        """
+        Returns:
+            str: The event as one compact JSON line (without the newline).
+        """
+        return json.dumps(self._asdict(), separators=(",", ":"))
+
+
+def _seq_of(line: bytes) -> Optional[int]:
+    match = _SEQ.match(line)
+    return int(match.group(1)) if match else None
+
+
+class ChangeFeed:
+    """
+    Append-only log of the changes written to a store, each numbered with a sequence
+    number one above the previous (.taskory/changes.jsonl, one JSON event per line).
+
+    The feed is switched on by creating the file (`taskory watch` does); until then
+    append does nothing. Stores append while they hold the lock on .taskory/tasks.lock,
+    so sequence numbers follow the order of the writes across processes.
+    """
+    def __init__(self, path: Union[str, Path], max_bytes: int = MAX_FEED_BYTES) -> None:
+        """
+        Args:
+            path (str | Path): The feed file.
+            max_bytes (int): Size past which the older half of the feed is dropped.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.lock = FileLock(lock_path_for(self.path.with_name("tasks.json")))
+        # (inode, end offset, last sequence number) of the previous read, so that a
+        # consumer polling with that sequence number only reads what was appended.
+        self._resume: Optional[Tuple[int, int, int]] = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def enable(self) -> None:
+        """
+        Creates the feed file, if it does not exist, so that stores start appending.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            if not self.path.exists():
+                atomic_write(self.path, b"")
+
+    def locked(self) -> ContextManager:
+        """
+        Returns:
+            ContextManager: The store lock while the feed is on, otherwise a no-op.
+        """
+        return self.lock if self.path.exists() else nullcontext()
+
+    def head(self) -> int:
+        """
+        Returns:
+            int: The sequence number of the latest event, or 0 if there is none.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                position = f.seek(0, os.SEEK_END)
+                tail = b""
+                while position > 0:
+                    step = min(TAIL_CHUNK, position)
+                    position -= step
+                    f.seek(position)
+                    tail = f.read(step) + tail
+                    lines = tail.rstrip(b"\n").rsplit(b"\n", 1)
+                    if len(lines) == 2 or position == 0:
+                        return _seq_of(lines[-1]) or 0
+        except FileNotFoundError:
+            pass
+        return 0
+
+    def append(self, changes: List[Change]) -> int:
+        """
+        Records written changes, numbering them after the latest event.
+        Args:
+            changes (List[Change]): The changes, in the order they were written.
+        Returns:
+            int: The sequence number of the last event, or 0 if the feed is off.
+        """
+        if not changes or not self.path.exists():
+            return 0
+        with self.lock:
+            seq = self.head()
+            lines = []
+            for op, task_id, task in changes:
+                seq += 1
+                record = serialize_task(task) if task is not None else None
+                lines.append(ChangeEvent(seq, op, str(task_id), record).to_json())
+            with open(self.path, "ab") as f:
+                # Reason: start on a fresh line after a torn write, so that the torn
+                # line stays the only bad one.
+                if f.tell() and not self._ends_with_newline():
+                    f.write(b"\n")
+                f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                size = f.tell()
+            if size > self.max_bytes:
+                self._trim()
+        return seq
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _trim(self) -> None:
+        # Keeps the events in the newer half of the file.
+        raw = self.path.read_bytes()
+        cut = raw.find(b"\n", len(raw) // 2) + 1
+        atomic_write(self.path, raw[cut:])
+
+    def read(self, since: int = 0) -> Iterator[ChangeEvent]:
+        """
+        Yields the events after a sequence number, oldest first. Only those events are
+        decoded; earlier lines are skipped by their sequence number.
+        Args:
+            since (int): The last sequence number the consumer has applied (0 for all).
+        Returns:
+            Iterator[ChangeEvent]: The events.
+        Raises:
+            FeedGapError: If events after since are missing from the feed.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                start = 0
+                if self._resume is not None and self._resume[0] == stat.st_ino and self._resume[2] == since \
+                        and self._resume[1] <= stat.st_size:
+                    start = self._resume[1]
+                f.seek(start)
+                raw = f.read()
+        except FileNotFoundError:
+            raw, start, stat = b"", 0, None
+        # Only complete lines count; a line still being written is read next time.
+        end = raw.rfind(b"\n") + 1
+        events, first, newest = [], None, 0
+        for line in raw[:end].splitlines():
+            seq = _seq_of(line)
+            if seq is None:
+                continue
+            first = seq if first is None else first
+            newest = seq
+            if seq > since:
+                try:
+                    events.append(ChangeEvent(**json.loads(line)))
+                except (TypeError, ValueError):
+                    continue  # a torn write
+        # Reason: a resumed read continues where the previous one ended, so only a
+        # full read can find that events were trimmed or that the feed was recreated.
+        if start == 0 and ((first is not None and first > since + 1) or since > newest):
+            raise FeedGapError(f"The change feed no longer holds the events after {since}.")
+        if stat is not None:
+            self._resume = (stat.st_ino, start + end, events[-1].seq if events else since)
+        return iter(events)
+
+
+class FeedFollower:
+    """
+    Change-feed methods for TaskStore.
+
+    Expects the store to provide backend, change_feed, feed_position, _batch_undo,
+    _unsaved, _tasks, _put, _drop and _reload.
+    """
+    def changes(self, since: int = 0) -> Iterator[ChangeEvent]:
+        """
+        Yields the add, update and delete events written to the store's change feed
+        after a sequence number, by this or any other process.
+        Args:
+            since (int): The last sequence number already seen (0 for all).
+        Returns:
+            Iterator[ChangeEvent]: The events, in sequence order.
+        Raises:
+            ValueError: If the store has no change feed.
+            FeedGapError: If events after since are no longer in the feed.
+        """
+        if self.change_feed is None:
+            raise ValueError("This store has no change feed.")
+        return self.change_feed.read(since)
+
+    def catch_up(self) -> int:
+        """
+        Brings the tasks up to date with what other processes wrote since this store
+        loaded (or last caught up), by applying only the feed's new events. Unchanged
+        tasks are neither reloaded nor validated again. After a gap in the feed, the
+        store is reloaded in full.
+        Returns:
+            int: The number of events applied, or -1 after a full reload.
+        Raises:
+            ValueError: If the store has no change feed, a batch is open or changes
+                are waiting for flush().
+        """
+        if self.change_feed is None:
+            raise ValueError("This store has no change feed.")
+        if self._batch_undo is not None or self._unsaved:
+            raise ValueError("Cannot catch up with unwritten changes.")
+        with self.backend.locked(), self.change_feed.locked():
+            try:
+                events = list(self.changes(self.feed_position))
+            except FeedGapError:
+                self._reload()
+                self.feed_position = self.change_feed.head()
+                return -1
+            for event in events:
+                if event.task is None:
+                    self._drop(UUID(event.id))
+                else:
+                    self._put(deserialize_task(event.task))
+            if events:
+                self.feed_position = events[-1].seq
+                # Reason: the tasks now match the storage, so the next write must not
+                # be taken for a stale one and merged by a full reload.
+                self.backend.mark_current(self._tasks)
+        return len(events)
@@ -0,0 +1,250 @@
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Set
+from uuid import UUID
+from taskory.schemas import Task
+from taskory.commands.storage import Change, StaleStoreError
+from taskory.commands.tracing import span
+
+
+def _coalesce(pending: Dict[UUID, Change], change: Change) -> None:
+    """
+    Folds a change into the pending changes, keeping the latest state per task.
+
+    A task added and then updated before being written stays an "add", so that a
+    rebase onto another writer's tasks does not mistake it for an update of a task
+    deleted elsewhere.
+    Args:
+        pending (Dict[UUID, Change]): Unwritten changes keyed by task id.
+        change (Change): The new change.
+    """
+    op, task_id, task = change
+    previous = pending.get(task_id)
+    if previous is not None and previous[0] == "add" and op == "update":
+        change = ("add", task_id, task)
+    pending[task_id] = change
+
+
+class ChangeTracking:
+    """
+    Batching, change tracking and persistence for TaskStore.
+
+    Mutations report each change through _record_change. Changes are collected while a
+    batch is open, kept back while auto_save is off, and otherwise written through the
+    storage backend, merging with other writers when the backend is stale.
+
+    After each successful write, the written changes are passed to every callable in
+    write_listeners (used to keep the search index in step). When the write had to be
+    merged with another writer's, they get None instead: the stored tasks then changed
+    by more than these changes. The change feed, if the store has one, records the
+    written changes in both cases.
+
+    Expects the store to provide backend, auto_save, write_listeners, change_feed,
+    _tasks, _index, _graph, _batch_undo, _batch_pending, _unsaved, _load_tasks, _put
+    and _drop.
+    """
+    @property
+    def dirty(self) -> bool:
+        """
+        True while committed changes are waiting for flush().
+        """
+        return bool(self._unsaved)
+
+    @property
+    def dirty_ids(self) -> Set[UUID]:
+        """
+        Ids of the tasks changed or deleted since the last write, while auto_save is off.
+        """
+        return set(self._unsaved)
+
+    def flush(self) -> None:
+        """
+        Writes the changes kept back while auto_save is off, with a single backend write.
+        """
+        if self.backend is None:
+            return
+        changes = self._take_unsaved()
+        if not changes:
+            return
+        try:
+            self._write(changes)
+        except BaseException:
+            self._requeue(changes)
+            raise
+
+    def _take_unsaved(self) -> List[Change]:
+        """
+        Removes and returns the changes waiting for flush().
+        Returns:
+            List[Change]: The unwritten changes.
+        """
+        changes, self._unsaved = list(self._unsaved.values()), {}
+        return changes
+
+    def _requeue(self, changes: List[Change]) -> None:
+        """
+        Puts changes that failed to write back in front of any made meanwhile.
+        Args:
+            changes (List[Change]): The changes taken by _take_unsaved.
+        """
+        pending, self._unsaved = self._unsaved, {}
+        for change in (*changes, *pending.values()):
+            _coalesce(self._unsaved, change)
+
+    def _auto_save(self, changes: List[Change]) -> None:
+        if self.backend is None:
+            return
+        if not self.auto_save:
+            for change in changes:
+                _coalesce(self._unsaved, change)
+            return
+        self._write(changes)
+
+    def _write(self, changes: List[Change], snapshot: Optional[Dict[UUID, Task]] = None) -> None:
+        """
+        Writes changes through the backend, merging with other writers if it is stale,
+        then records them in the change feed and passes them to the write listeners.
+        Args:
+            changes (List[Change]): The changes to write.
+            snapshot (Optional[Dict[UUID, Task]]): A copy of the tasks to write instead
+                of the live map, for writes made off the thread that owns the store
+                (see AsyncTaskStore). Such a write does not merge: StaleStoreError is
+                raised for the owner to call _write again without a snapshot.
+        Raises:
+            StaleStoreError: If a snapshot is given and another process wrote first.
+        """
+        feed = self.change_feed
+        # Reason: the change feed numbers writes in the order they happen, so it is
+        # appended under the same lock as the write (taken here for SQLite as well).
+        with self.backend.locked(), feed.locked() if feed is not None else nullcontext():
+            written: Optional[List[Change]] = changes
+            try:
+                self.backend.write(self._tasks if snapshot is None else snapshot, changes)
+            except StaleStoreError:
+                if snapshot is not None:
+                    raise
+                # Another process wrote since this store loaded: merge our changes into
+                # its tasks and write again, still under the same lock.
+                changes = self._rebase(changes)
+                self.backend.write(self._tasks, changes)
+                written = None
+            if feed is not None:
+                seq = feed.append(changes)
+                # Reason: the store has seen everything up to its own events only if
+                # they directly follow its position, or it has just reloaded.
+                if seq and (written is None or seq - len(changes) == self.feed_position):
+                    self.feed_position = seq
+        for listener in self.write_listeners:
+            listener(written)
+
+    def _reload(self) -> None:
+        """
+        Replaces the tasks in memory with those in the backend.
+        """
+        self._tasks.clear()
+        self._index.clear()
+        self._graph.clear()
+        self._load_backend()
+
+    def _load_backend(self) -> None:
+        """
+        Fills the empty store from the backend, taking its tasks as a ready-made table
+        when it offers one (see StorageBackend.load_table).
+        """
+        table = self.backend.load_table()
+        if table is None:
+            self._load_tasks(self.backend.load())
+            return
+        with span("index") as phase:
+            self._tasks = table
+            # Reason: the indexes only read a few fields, which the table yields without
+            # building each task.
+            for row in table.index_rows():
+                self._index.add(row)
+                self._graph.add(row)
+            phase.add(records=len(table))
+
+    def _rebase(self, changes: List[Change]) -> List[Change]:
+        """
+        Reloads the tasks from the backend and reapplies changes on top of them.
+
+        Changes are whole-task states, so the last writer of a task wins. An update to
+        a task that another process has deleted is dropped.
+        Args:
+            changes (List[Change]): The changes that failed to write.
+        Returns:
+            List[Change]: The changes that still apply.
+        """
+        self._reload()
+        applied = []
+        for op, task_id, task in changes:
+            if task is None:
+                self._drop(task_id)
+            elif op == "update" and task_id not in self._tasks:
+                continue
+            else:
+                self._put(task)
+            applied.append((op, task_id, task))
+        return applied
+
+    @contextmanager
+    def batch(self) -> Iterator['TaskStore']:
+        """
+        Groups mutations into one transaction that is persisted with a single write.
+
+        Auto-saving is suspended inside the block. On normal exit the changes are written
+        once (one file rewrite, one journal append or one database transaction); if an
+        exception escapes, the in-memory tasks are restored to their state before the
+        block and nothing is written. Nested batches join the outermost one.
+
+        Returns:
+            Iterator[TaskStore]: The store itself, for use in a with statement.
+        """
+        if self._batch_undo is not None:
+            yield self
+            return
+        self._batch_undo = {}
+        self._batch_pending = {}
+        try:
+            yield self
+        except BaseException:
+            for task_id, previous in self._batch_undo.items():
+                if previous is None:
+                    self._drop(task_id)
+                else:
+                    self._put(previous)
+            raise
+        else:
+            # Reason: the flush runs outside the batch so that it persists normally.
+            pending = list(self._batch_pending.values())
+            self._batch_undo, self._batch_pending = None, {}
+            if pending:
+                self._auto_save(pending)
+        finally:
+            self._batch_undo, self._batch_pending = None, {}
+
+    def _remember(self, task_id: UUID) -> None:
+        """
+        Saves the pre-batch state of a task the first time a batch touches it.
+        Args:
+            task_id (UUID): The ID of the task about to change.
+        """
+        if self._batch_undo is None or task_id in self._batch_undo:
+            return
+        # The table builds a new Task on every read, so this is already a snapshot.
+        self._batch_undo[task_id] = self._tasks.get(task_id)
+
+    def _record_change(self, op: str, task_id: UUID, task: Optional[Task] = None) -> None:
+        """
+        Persists a single mutation through the backend.
+        Inside a batch the mutation is only collected until the batch commits.
+        Args:
+            op (str): The mutation: "add", "update" or "delete".
+            task_id (UUID): The ID of the affected task.
+            task (Optional[Task]): The task after the mutation (None for deletes).
+        """
+        if self._batch_undo is not None:
+            # Changes are written with the task's state at commit time, so only the
+            # latest change per task matters.
+            _coalesce(self._batch_pending, (op, task_id, task))
+            return
+        self._auto_save([(op, task_id, task)])
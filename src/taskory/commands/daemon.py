@@ -0,0 +1,268 @@
+import asyncio
+import json
+import os
+import signal
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.task_store import TaskStore
+from taskory.commands.serialization import serialize_task
+from taskory.commands.async_store import AsyncTaskStore
+
+# Reason: a debounce window short enough that a crash loses at most a moment of work,
+# and long enough that scripts firing many commands share one write.
+DEFAULT_FLUSH_INTERVAL = 0.5
+SOCKET_NAME = "taskory.sock"
+
+
+def socket_path_for(directory: Union[str, Path]) -> Path:
+    """
+    Returns the daemon socket path for a .taskory directory.
+    Args:
+        directory (str | Path): The .taskory directory.
+    Returns:
+        Path: The socket path (e.g. .taskory/taskory.sock).
+    """
+    return Path(directory) / SOCKET_NAME
+
+
+class TaskService:
+    """
+    Answers JSON requests against an in-memory TaskStore.
+
+    A request is {"op": <name>, ...parameters}; the reply is {"ok": true, "result": ...}
+    or {"ok": false, "error": <message>, "kind": "KeyError" | "ValueError"}. Tasks are
+    exchanged in their tasks.json form.
+    """
+    def __init__(self, store: TaskStore) -> None:
+        """
+        Initializes the service.
+        Args:
+            store (TaskStore): The store to serve; its changes are kept for flush().
+        """
+        self.store = store
+        self._ops: Dict[str, Callable[[dict], Any]] = {
+            "ping": lambda request: "pong",
+            "add": self._add,
+            "add_many": self._add_many,
+            "get": lambda request: serialize_task(self.store.get_task_by_id(request["id"])),
+            "list": self._list,
+            "page": self._page,
+            "next": self._next,
+            "update": self._update,
+            "delete": self._delete,
+            "update_where": self._update_where,
+            "delete_where": self._delete_where,
+            "match_ids": self._match_ids,
+            "flush": lambda request: self.store.flush(),
+        }
+
+    def handle(self, request: dict) -> dict:
+        """
+        Runs one request.
+        Args:
+            request (dict): The decoded request.
+        Returns:
+            dict: The reply.
+        """
+        op = self._ops.get(request.get("op"))
+        if op is None:
+            return {"ok": False, "error": f"Unknown op: {request.get('op')}", "kind": "ValueError"}
+        try:
+            return {"ok": True, "result": op(request)}
+        except KeyError as e:
+            return {"ok": False, "error": str(e.args[0]) if e.args else str(e), "kind": "KeyError"}
+        except (ValueError, TypeError) as e:
+            return {"ok": False, "error": str(e), "kind": "ValueError"}
+
+    def _add(self, request: dict) -> dict:
+        task = Task.model_validate(request["task"])
+        self.store.add_task(task)
+        return serialize_task(task)
+
+    def _add_many(self, request: dict) -> int:
+        tasks = [Task.model_validate(item) for item in request["tasks"]]
+        with self.store.batch():
+            for task in tasks:
+                self.store.add_task(task)
+        return len(tasks)
+
+    @staticmethod
+    def _filters(request: dict) -> dict:
+        filters = request.get("filters") or {}
+        priority, low, high = (filters.get(key) for key in ("priority", "min_priority", "max_priority"))
+        return {
+            "status": TaskStatus(filters["status"]) if filters.get("status") else None,
+            "assignee": filters.get("assignee"),
+            "tags": filters.get("tags"),
+            "priority": TaskPriority(priority) if priority is not None else None,
+            "min_priority": low,
+            "max_priority": high,
+        }
+
+    def _list(self, request: dict) -> list:
+        return [serialize_task(task) for task in self.store.list_tasks(**self._filters(request))]
+
+    def _page(self, request: dict) -> dict:
+        page = self.store.page_tasks(
+            request.get("limit"),
+            sort_by=request.get("sort_by", "priority"),
+            reverse=bool(request.get("reverse")),
+            cursor=request.get("cursor"),
+            **self._filters(request),
+        )
+        return {"tasks": [serialize_task(task) for task in page.tasks], "cursor": page.cursor}
+
+    def _next(self, request: dict) -> Optional[dict]:
+        task = self.store.next_task()
+        return serialize_task(task) if task is not None else None
+
+    def _update(self, request: dict) -> dict:
+        task = self.store.get_task_by_id(request["id"])
+        fields = request.get("fields") or {}
+        for key in fields:
+            if not hasattr(task, key):
+                raise ValueError(f"Invalid field: {key}")
+        # Reason: fields arrive as JSON values; validating them on a copy of the task
+        # turns them into enums, datetimes and UUIDs before update_task sets them.
+        checked = Task.model_validate({**serialize_task(task), **fields})
+        updated = self.store.update_task(task.id, **{key: getattr(checked, key) for key in fields})
+        return serialize_task(updated)
+
+    def _delete(self, request: dict) -> None:
+        self.store.delete_task(request["id"])
+
+    def _match_ids(self, request: dict) -> list:
+        # Reason: the ids are already in memory, so a scan answers as fast as the
+        # persisted id index would, and it also sees the changes not yet flushed.
+        prefix, limit = request["prefix"], request.get("limit")
+        found = sorted(str(task_id) for task_id in self.store.task_ids() if task_id.hex.startswith(prefix))
+        return found[:limit] if limit is not None else found
+
+    @staticmethod
+    def _older_than(request: dict) -> Optional[timedelta]:
+        seconds = request.get("older_than")
+        return timedelta(seconds=seconds) if seconds is not None else None
+
+    def _update_where(self, request: dict) -> list:
+        fields = request.get("fields") or {}
+        for key in fields:
+            if key not in Task.model_fields:
+                raise ValueError(f"Invalid field: {key}")
+        # Reason: as in _update, the JSON values are validated on a sample task so that
+        # the fields set on every match are enums, datetimes and UUIDs.
+        checked = Task.model_validate({**serialize_task(Task(title="-")), **fields})
+        tasks = self.store.update_where(
+            {key: getattr(checked, key) for key in fields}, older_than=self._older_than(request),
+            dry_run=bool(request.get("dry_run")), **self._filters(request),
+        )
+        return [serialize_task(task) for task in tasks]
+
+    def _delete_where(self, request: dict) -> list:
+        tasks = self.store.delete_where(
+            older_than=self._older_than(request), dry_run=bool(request.get("dry_run")), **self._filters(request),
+        )
+        return [serialize_task(task) for task in tasks]
+
+
+class TaskDaemon:
+    """
+    Serves a TaskStore over a Unix domain socket, one JSON request per line.
+
+    Changes are applied in memory and answered at once; an AsyncTaskStore writer puts
+    them on disk together, flush_interval seconds after the first unwritten change, and
+    once more on shutdown.
+    """
+    def __init__(self, store: TaskStore, socket_path: Union[str, Path], flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """
+        Initializes the daemon.
+        Args:
+            store (TaskStore): The store to serve.
+            socket_path (str | Path): Where to create the socket.
+            flush_interval (float): Seconds between batched writes.
+        """
+        self.writer = AsyncTaskStore(store, debounce=flush_interval)
+        self.service = TaskService(store)
+        self.socket_path = Path(socket_path)
+        self.flush_interval = flush_interval
+        self._stopping: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    reply = {"ok": False, "error": f"Invalid request: {e}", "kind": "ValueError"}
+                else:
+                    reply = await self._reply(request)
+                writer.write(json.dumps(reply, separators=(",", ":")).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, request: dict) -> dict:
+        if request.get("op") == "flush":
+            # Reason: routed through the writer so that it never overlaps a background write.
+            try:
+                await self.writer.flush()
+            except OSError as e:
+                return {"ok": False, "error": str(e), "kind": "ValueError"}
+            return {"ok": True, "result": None}
+        reply = self.service.handle(request)
+        if self.service.store.dirty:
+            self.writer.schedule_write()
+        return reply
+
+    def stop(self) -> None:
+        """
+        Asks a running daemon to flush and exit. Safe to call from another thread.
+        """
+        loop = self._loop
+        if loop is not None and self._stopping is not None:
+            try:
+                loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass  # the loop has already finished
+
+    async def run(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Serves requests until stop() is called or the process gets SIGINT/SIGTERM.
+        Args:
+            ready (Optional[Callable[[], None]]): Called once the socket accepts connections.
+        """
+        self._stopping = asyncio.Event()
+        if self.socket_path.exists():
+            # Reason: a socket file left by a daemon that died would make bind fail.
+            self.socket_path.unlink()
+        server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        loop = self._loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._stopping.set)
+            except (RuntimeError, ValueError):
+                pass  # not the main thread
+        try:
+            if ready is not None:
+                ready()
+            await self._stopping.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            try:
+                await self.writer.aclose()
+            finally:
+                # Reason: removed last, so a client that sees the socket gone also
+                # sees every change on disk.
+                try:
+                    os.unlink(self.socket_path)
+                except OSError:
+                    pass
+                self._loop = None
@@ -0,0 +1,316 @@
+import json
+import socket
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.serialization import serialize_task, deserialize_task
+from taskory.commands.sorted_views import TaskPage
+
+
+def _json_value(value: Any) -> Any:
+    """
+    Converts a task field value to its tasks.json form.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
+class DaemonClient:
+    """
+    Connection to a running `taskory serve` daemon (see commands.daemon).
+    """
+    def __init__(self, sock: socket.socket) -> None:
+        """
+        Wraps a connected socket.
+        Args:
+            sock (socket.socket): A socket connected to the daemon.
+        """
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    @classmethod
+    def connect(cls, socket_path: Union[str, Path], timeout: float = 5.0) -> Optional["DaemonClient"]:
+        """
+        Connects to the daemon listening on socket_path.
+        Args:
+            socket_path (str | Path): The daemon socket.
+            timeout (float): Seconds to wait for each reply.
+        Returns:
+            Optional[DaemonClient]: The client, or None if no daemon is listening.
+        """
+        if not hasattr(socket, "AF_UNIX") or not Path(socket_path).exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            # A socket file left behind by a daemon that is gone.
+            sock.close()
+            return None
+        return cls(sock)
+
+    def request(self, op: str, **params: Any) -> Any:
+        """
+        Sends one request and waits for its reply.
+        Args:
+            op (str): The operation (see TaskService).
+            **params: The request parameters.
+        Returns:
+            Any: The result of the operation.
+        Raises:
+            KeyError: If the daemon reports a missing task.
+            ValueError: If the daemon rejects the request.
+            ConnectionError: If the daemon closed the connection.
+        """
+        payload = json.dumps({"op": op, **params}, separators=(",", ":")).encode("utf-8") + b"\n"
+        self._sock.sendall(payload)
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("The taskory daemon closed the connection.")
+        reply = json.loads(line)
+        if reply.get("ok"):
+            return reply.get("result")
+        if reply.get("kind") == "KeyError":
+            raise KeyError(reply["error"])
+        raise ValueError(reply["error"])
+
+    def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self._reader.close()
+        self._sock.close()
+
+
+def _seconds(age: Optional[timedelta]) -> Optional[float]:
+    """
+    Converts an age to the seconds the daemon expects.
+    Args:
+        age (Optional[timedelta]): The age, or None.
+    Returns:
+        Optional[float]: The age in seconds, or None.
+    """
+    return age.total_seconds() if age is not None else None
+
+
+def _filters(
+    status: Optional[TaskStatus] = None,
+    assignee: Optional[str] = None,
+    tags: Optional[Iterable[str]] = None,
+    priority: Optional[TaskPriority] = None,
+    min_priority: Optional[int] = None,
+    max_priority: Optional[int] = None,
+) -> dict:
+    """
+    Converts list filters to the JSON form the daemon expects.
+    """
+    return {
+        "status": TaskStatus(status).value if status is not None else None,
+        "assignee": assignee,
+        "tags": list(tags) if tags else None,
+        "priority": int(priority) if priority is not None else None,
+        "min_priority": int(min_priority) if min_priority is not None else None,
+        "max_priority": int(max_priority) if max_priority is not None else None,
+    }
+
+
+class RemoteStore:
+    """
+    TaskStore look-alike that forwards every operation to a running daemon.
+
+    The daemon holds the tasks in memory and persists them, so commands using a
+    RemoteStore neither load nor save the store themselves.
+    """
+    def __init__(self, client: DaemonClient) -> None:
+        """
+        Initializes the store.
+        Args:
+            client (DaemonClient): The daemon connection.
+        """
+        self.client = client
+        self._batch: Optional[List[dict]] = None
+
+    @contextmanager
+    def batch(self) -> Iterator["RemoteStore"]:
+        """
+        Collects the tasks added in the block and sends them in one request, so that
+        they are added together or not at all.
+
+        Returns:
+            Iterator[RemoteStore]: The store itself, for use in a with statement.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = []
+        try:
+            yield self
+            pending = self._batch
+        finally:
+            self._batch = None
+        if pending:
+            self.client.request("add_many", tasks=pending)
+
+    def add_task(self, task: Task) -> None:
+        """
+        Adds a task, or queues it for the open batch.
+        Args:
+            task (Task): The task to add.
+        """
+        if self._batch is not None:
+            self._batch.append(serialize_task(task))
+            return
+        self.client.request("add", task=serialize_task(task))
+
+    def list_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> List[Task]:
+        """
+        Lists the daemon's tasks that match every given filter (see TaskStore.list_tasks).
+        Returns:
+            List[Task]: The matching tasks, in store order.
+        """
+        filters = _filters(status, assignee, tags, priority, min_priority, max_priority)
+        rows = self.client.request("list", filters=filters)
+        return [deserialize_task(row) for row in rows]
+
+    def iter_tasks(self, **filters: Any) -> Iterator[Task]:
+        """
+        Returns:
+            Iterator[Task]: The tasks list_tasks returns for the same filters.
+        """
+        return iter(self.list_tasks(**filters))
+
+    def page_tasks(
+        self,
+        limit: Optional[int] = None,
+        sort_by: str = "priority",
+        reverse: bool = False,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> TaskPage:
+        """
+        Fetches one page of the matching tasks, in sort order (see TaskStore.page_tasks).
+        Args:
+            limit (Optional[int]): Largest number of tasks on the page; None returns all.
+            sort_by (str): The field to sort by.
+            reverse (bool): Sort in descending order.
+            cursor (Optional[str]): The cursor of the previous page.
+            **filters: list_tasks filters.
+        Returns:
+            TaskPage: The tasks and the cursor of the next page.
+        """
+        result = self.client.request(
+            "page", limit=limit, sort_by=sort_by, reverse=reverse, cursor=cursor, filters=_filters(**filters),
+        )
+        return TaskPage([deserialize_task(row) for row in result["tasks"]], result["cursor"])
+
+    def next_task(self) -> Optional[Task]:
+        """
+        Returns:
+            Optional[Task]: The task the daemon picks to work on next, or None.
+        """
+        row = self.client.request("next")
+        return deserialize_task(row) if row is not None else None
+
+    def get_task_by_id(self, task_id: Union[str, UUID]) -> Task:
+        """
+        Args:
+            task_id (str | UUID): The task's id.
+        Returns:
+            Task: The task.
+        Raises:
+            KeyError: If there is no such task.
+        """
+        return deserialize_task(self.client.request("get", id=str(task_id)))
+
+    def update_task(self, task_id: Union[str, UUID], **kwargs: Any) -> Task:
+        """
+        Changes fields of a task.
+        Args:
+            task_id (str | UUID): The task's id.
+            **kwargs: The fields to set.
+        Returns:
+            Task: The updated task.
+        Raises:
+            KeyError: If there is no such task.
+        """
+        fields = {key: _json_value(value) for key, value in kwargs.items()}
+        return deserialize_task(self.client.request("update", id=str(task_id), fields=fields))
+
+    def delete_task(self, task_id: Union[str, UUID]) -> None:
+        """
+        Args:
+            task_id (str | UUID): The id of the task to delete.
+        Raises:
+            KeyError: If there is no such task.
+        """
+        self.client.request("delete", id=str(task_id))
+
+    def match_ids(self, prefix: str, limit: Optional[int] = None) -> List[UUID]:
+        """
+        Lists the ids of the daemon's tasks that start with a hex prefix (see
+        id_index.resolve_id).
+        Args:
+            prefix (str): Hex digits.
+            limit (Optional[int]): Largest number of ids to return.
+        Returns:
+            List[UUID]: The matching ids, in ascending order.
+        """
+        return [UUID(task_id) for task_id in self.client.request("match_ids", prefix=prefix, limit=limit)]
+
+    def update_where(
+        self, fields: Dict[str, Any], older_than: Optional[timedelta] = None, dry_run: bool = False, **filters: Any,
+    ) -> List[Task]:
+        """
+        Sets fields on every matching task in one request (see BulkOperations.update_where).
+        Args:
+            fields (Dict[str, Any]): The fields to set.
+            older_than (Optional[timedelta]): Only tasks not updated for this long.
+            dry_run (bool): Only return the tasks that would change.
+            **filters: list_tasks filters.
+        Returns:
+            List[Task]: The changed (or matching) tasks.
+        """
+        rows = self.client.request(
+            "update_where", fields={key: _json_value(value) for key, value in fields.items()},
+            older_than=_seconds(older_than), dry_run=dry_run, filters=_filters(**filters),
+        )
+        return [deserialize_task(row) for row in rows]
+
+    def delete_where(self, older_than: Optional[timedelta] = None, dry_run: bool = False, **filters: Any) -> List[Task]:
+        """
+        Deletes every matching task in one request (see BulkOperations.delete_where).
+        Args:
+            older_than (Optional[timedelta]): Only tasks not updated for this long.
+            dry_run (bool): Only return the tasks that would be deleted.
+            **filters: list_tasks filters.
+        Returns:
+            List[Task]: The deleted (or matching) tasks.
+        """
+        rows = self.client.request("delete_where", older_than=_seconds(older_than), dry_run=dry_run, filters=_filters(**filters))
+        return [deserialize_task(row) for row in rows]
+
+    def flush(self) -> None:
+        """
+        Makes the daemon write its pending changes now.
+        """
+        self.client.request("flush")
@@ -0,0 +1,284 @@
+import mmap
+import struct
+from pathlib import Path
+from string import hexdigits
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Union
+from uuid import UUID
+from taskory.commands.locking import atomic_write
+
+# Reason: shell completion reads this index, so the module avoids importing pydantic and
+# the storage layer; Change is only needed for type checking.
+if TYPE_CHECKING:
+    from taskory.commands.storage import Change
+
+# Layout: a header, the store version the index matches (UTF-8), then the 16-byte ids of
+# every task in ascending order, so a prefix is found by binary search.
+MAGIC = b"TKID"
+FORMAT = 1
+HEADER = struct.Struct("<4sHH")  # magic, format, length of the version string
+KEY_SIZE = 16
+# Shortest prefix accepted as a task ID, as in git.
+MIN_PREFIX_LENGTH = 4
+# Candidates listed when a prefix is ambiguous.
+SHOWN_CANDIDATES = 5
+
+_HEX = frozenset(hexdigits.lower())
+
+
+class AmbiguousIdError(ValueError):
+    """
+    Raised when a task ID prefix matches more than one task.
+    """
+    def __init__(self, prefix: str, candidates: List[UUID]) -> None:
+        """
+        Args:
+            prefix (str): The prefix as given.
+            candidates (List[UUID]): Some of the matching ids.
+        """
+        shown = ", ".join(str(candidate) for candidate in candidates[:SHOWN_CANDIDATES])
+        more = ", ..." if len(candidates) > SHOWN_CANDIDATES else ""
+        super().__init__(f"Task ID prefix {prefix} is ambiguous; it matches {shown}{more}")
+        self.prefix = prefix
+        self.candidates = candidates
+
+
+def parse_prefix(text: str) -> str:
+    """
+    Normalizes a task ID or ID prefix to lowercase hex digits without dashes.
+
+    Args:
+        text (str): The ID or prefix, e.g. "3F2a" or a full UUID.
+
+    Returns:
+        str: The hex digits.
+
+    Raises:
+        ValueError: If the text is empty, too long or not hexadecimal.
+    """
+    prefix = text.strip().lower().replace("-", "")
+    if not prefix or len(prefix) > 2 * KEY_SIZE or not _HEX.issuperset(prefix):
+        raise ValueError(f"Invalid UUID string: {text}")
+    return prefix
+
+
+class IdIndex:
+    """
+    Sorted index of every task id in a store, persisted next to it (.taskory/ids.idx).
+
+    The file is memory-mapped and binary searched, so resolving a prefix reads a few
+    pages whatever the store size, and nothing has to be deserialized. Like the search
+    index, it records the version (StorageBackend.version) of the store it matches.
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Opens an index. A missing or unreadable file reads as an empty index whose
+        version is None.
+        Args:
+            path (str | Path): Path to the index file.
+        """
+        self.path = Path(path)
+        self.version: Optional[str] = None
+        self._map: Optional[mmap.mmap] = None
+        self._start = 0
+        self._count = 0
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, length = HEADER.unpack_from(self._map, 0)
+            self._start = HEADER.size + length
+            if magic != MAGIC or version != FORMAT or (len(self._map) - self._start) % KEY_SIZE:
+                raise ValueError("Not a task id index")
+            self.version = self._map[HEADER.size:self._start].decode("utf-8")
+            self._count = (len(self._map) - self._start) // KEY_SIZE
+        except (OSError, ValueError, struct.error):
+            self.close()
+            self.version = None
+
+    def __enter__(self) -> "IdIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """
+        Releases the memory map.
+        """
+        if self._map is not None:
+            self._map.close()
+        self._map = None
+        self._count = 0
+
+    def _key(self, number: int) -> bytes:
+        position = self._start + number * KEY_SIZE
+        return self._map[position:position + KEY_SIZE]
+
+    def _lower_bound(self, key: bytes) -> int:
+        # The number of the first id that is not less than key.
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def matches(self, prefix: str, limit: Optional[int] = None) -> List[UUID]:
+        """
+        Lists the ids that start with a prefix, in ascending order.
+        Args:
+            prefix (str): Hex digits (see parse_prefix).
+            limit (Optional[int]): Largest number of ids to return.
+        Returns:
+            List[UUID]: The matching ids.
+        """
+        found: List[UUID] = []
+        number = self._lower_bound(bytes.fromhex(prefix.ljust(2 * KEY_SIZE, "0")))
+        while number < self._count and (limit is None or len(found) < limit):
+            key = self._key(number)
+            if not key.hex().startswith(prefix):
+                break
+            found.append(UUID(bytes=key))
+            number += 1
+        return found
+
+    def apply(self, changes: List["Change"], version: Optional[str]) -> None:
+        """
+        Adds and removes the ids of written changes, and records the new store version.
+
+        The new file is spliced from slices of the old one, so the cost is one copy of
+        the index plus a binary search per change.
+        Args:
+            changes (List[Change]): The written changes (a None task is a delete).
+            version (Optional[str]): The store's version after the write.
+        """
+        edits = []
+        for _, task_id, task in changes:
+            key = task_id.bytes
+            number = self._lower_bound(key)
+            present = number < self._count and self._key(number) == key
+            if task is None and present:
+                edits.append((number, 1, b""))
+            elif task is not None and not present:
+                edits.append((number, 0, key))
+        body = self._map[self._start:] if self._map is not None else b""
+        pieces, last = [], 0
+        # Inserts at a position sort before the removal of the id already there.
+        for number, removed, key in sorted(edits):
+            pieces.append(body[last * KEY_SIZE:number * KEY_SIZE])
+            pieces.append(key)
+            last = number + removed
+        pieces.append(body[last * KEY_SIZE:])
+        self.close()
+        self.write(self.path, b"".join(pieces), version)
+
+    @staticmethod
+    def write(path: Union[str, Path], keys: Union[bytes, Iterable[bytes]], version: Optional[str]) -> None:
+        """
+        Replaces an index file.
+        Args:
+            path (str | Path): Path to the index file.
+            keys (bytes | Iterable[bytes]): The 16-byte ids in ascending order, or
+                already joined.
+            version (Optional[str]): The store version they match.
+        """
+        encoded = (version or "").encode("utf-8")
+        body = keys if isinstance(keys, bytes) else b"".join(keys)
+        atomic_write(path, HEADER.pack(MAGIC, FORMAT, len(encoded)) + encoded + body)
+
+
+class IdIndexUpdater:
+    """
+    Write listener (TaskStore.write_listeners) that keeps an id index current, on the
+    same terms as search_index.SearchUpdater: an index that was already out of date is
+    left for the next lookup to rebuild, and after a merged write (changes is None) the
+    updater stops applying changes.
+    """
+    def __init__(self, path: Union[str, Path], version: Callable[[], Optional[str]]) -> None:
+        """
+        Args:
+            path (str | Path): Path to the index file.
+            version (Callable[[], Optional[str]]): Returns the store's current version.
+        """
+        self.path = Path(path)
+        self._version = version
+        self.expected = version()
+
+    def __call__(self, changes: Optional[List["Change"]]) -> None:
+        current = self._version()
+        if changes is None:
+            self.expected = None
+            return
+        try:
+            with IdIndex(self.path) as index:
+                if self.expected is not None and index.version == self.expected:
+                    index.apply(changes, current)
+        except OSError:
+            # Reason: as for the search index, the tasks are already saved and a stale
+            # index is rebuilt by the next lookup.
+            pass
+        if self.expected is not None:
+            self.expected = current
+
+
+def match_ids(
+    path: Union[str, Path],
+    prefix: str,
+    load_ids: Callable[[], Iterable[UUID]],
+    version: Optional[str] = None,
+    trusted: bool = False,
+    limit: Optional[int] = None,
+) -> List[UUID]:
+    """
+    Lists the ids starting with a prefix from the index at path, rebuilding it first
+    when it does not match the store.
+    Args:
+        path (str | Path): Path to the index file.
+        prefix (str): Hex digits (see parse_prefix).
+        load_ids (Callable[[], Iterable[UUID]]): Returns every task id, for a rebuild.
+        version (Optional[str]): The store's current version.
+        trusted (bool): Use an existing index without comparing versions (for shell
+            completion, which must not load the store).
+        limit (Optional[int]): Largest number of ids to return.
+    Returns:
+        List[UUID]: The matching ids, in ascending order.
+    """
+    with IdIndex(path) as index:
+        if index.version is not None and (trusted or index.version == version):
+            return index.matches(prefix, limit)
+    IdIndex.write(path, sorted(task_id.bytes for task_id in load_ids()), version)
+    with IdIndex(path) as index:
+        return index.matches(prefix, limit)
+
+
+def resolve_id(text: str, find: Callable[[str, Optional[int]], List[UUID]]) -> UUID:
+    """
+    Resolves a full task ID or a unique prefix of one, as git resolves commit ids.
+
+    Full IDs are returned without a lookup.
+    Args:
+        text (str): The ID or prefix given by the user.
+        find (Callable[[str, Optional[int]], List[UUID]]): Returns the ids starting
+            with a hex prefix, at most limit of them (e.g. match_ids).
+    Returns:
+        UUID: The one matching id.
+    Raises:
+        ValueError: If the text is not hex or shorter than MIN_PREFIX_LENGTH.
+        AmbiguousIdError: If several tasks match.
+        KeyError: If no task matches.
+    """
+    prefix = parse_prefix(text)
+    if len(prefix) == 2 * KEY_SIZE:
+        return UUID(prefix)
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        raise ValueError(f"Task ID prefix {text} is too short; give at least {MIN_PREFIX_LENGTH} characters.")
+    found = find(prefix, SHOWN_CANDIDATES + 1)
+    if not found:
+        raise KeyError(text)
+    if len(found) > 1:
+        raise AmbiguousIdError(text, found)
+    return found[0]
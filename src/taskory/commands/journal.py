@@ -0,0 +1,129 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+# Reason: once the journal grows past this size, replaying it on every load costs
+# more than rewriting the snapshot once, so the store folds it back in.
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+def journal_path_for(snapshot_path: Union[str, Path]) -> Path:
+    """
+    Returns the journal path that belongs to a JSON snapshot.
+
+    Args:
+        snapshot_path (str | Path): Path to the JSON snapshot (e.g. .taskory/tasks.json).
+
+    Returns:
+        Path: Path to the journal file next to the snapshot (e.g. .taskory/tasks.journal).
+    """
+    return Path(snapshot_path).with_suffix(".journal")
+
+
+class TaskJournal:
+    """
+    Append-only log of TaskStore mutations, stored as compact JSON lines.
+
+    Each record holds the full serialized task for adds and updates, and only the id
+    for deletes, so replaying a record twice is harmless.
+    """
+    def __init__(self, path: Union[str, Path], compact_threshold: int = DEFAULT_COMPACT_THRESHOLD) -> None:
+        """
+        Initializes the journal.
+        Args:
+            path (str | Path): Path to the journal file.
+            compact_threshold (int): Size in bytes after which the journal should be compacted.
+        """
+        self.path = Path(path)
+        self.compact_threshold = compact_threshold
+
+    def append(self, record: dict) -> None:
+        """
+        Appends a single mutation record.
+        Args:
+            record (dict): The mutation record to append.
+        """
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[dict]) -> None:
+        """
+        Appends several mutation records with a single write.
+        Args:
+            records (Iterable[dict]): The mutation records to append.
+        """
+        payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        if not payload:
+            return
+        with open(self.path, "a+b") as f:
+            if f.seek(0, os.SEEK_END):
+                # Reason: a crash mid-append leaves a torn last line, which replay only
+                # tolerates at the very end; it is cut off before the next record.
+                f.truncate(self._complete_size(f))
+            f.write(payload.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _complete_size(f) -> int:
+        # Size of the file up to and including its last newline.
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position:
+            start = max(0, position - 4096)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+        return 0
+
+    def replay(self) -> Iterator[dict]:
+        """
+        Yields the journal records in the order they were written.
+
+        Returns:
+            Iterator[dict]: The mutation records.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Reason: a crash mid-append leaves a torn last line; the mutation
+                    # never completed, so it is dropped rather than failing the load.
+                    break
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def size(self) -> int:
+        """
+        Returns the size of the journal file in bytes.
+
+        Returns:
+            int: Size in bytes, 0 if the journal does not exist.
+        """
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def needs_compaction(self) -> bool:
+        """
+        Checks whether the journal has grown past its compaction threshold.
+
+        Returns:
+            bool: True if the journal should be folded into the snapshot.
+        """
+        return self.size() > self.compact_threshold
+
+    def clear(self) -> None:
+        """
+        Removes all records from the journal.
+        """
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
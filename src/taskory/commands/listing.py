@@ -0,0 +1,221 @@
+import csv
+import json
+import os
+import sys
+from typing import Any, Iterable, List, Optional, TextIO
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.serialization import serialize_task
+from taskory.commands.tracing import span
+
+FORMATS = ("table", "plain", "jsonl", "csv", "tsv")
+CSV_FIELDS = ("id", "title", "status", "priority", "assignee", "tags", "depends_on", "created_at", "updated_at")
+
+STATUS_COLORS = {
+    "todo": "yellow",
+    "in_progress": "cyan",
+    "done": "green",
+}
+
+
+def parse_priority(value: str) -> TaskPriority:
+    """
+    Parse a priority given by name (low, medium, high) or number (1-3).
+
+    Args:
+        value (str): The priority from the command line.
+
+    Returns:
+        TaskPriority: The parsed priority.
+
+    Raises:
+        ValueError: If the value is not a known priority.
+    """
+    if value.isdigit():
+        return TaskPriority(int(value))
+    try:
+        return TaskPriority[value.lower()]
+    except KeyError:
+        raise ValueError(f"Invalid priority: {value}")
+
+
+def parse_filters(
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    priority: Optional[str] = None,
+    min_priority: Optional[str] = None,
+    max_priority: Optional[str] = None,
+) -> dict:
+    """
+    Turn the filter options of a listing command into list_tasks keyword arguments.
+
+    Args:
+        status (Optional[str]): Status name.
+        assignee (Optional[str]): Assignee.
+        tags (Optional[List[str]]): Tags that tasks must all carry.
+        priority (Optional[str]): Exact priority, by name or number.
+        min_priority (Optional[str]): Lowest priority to include.
+        max_priority (Optional[str]): Highest priority to include.
+
+    Returns:
+        dict: The filters.
+
+    Raises:
+        ValueError: If the status or a priority is not valid.
+    """
+    try:
+        status_enum = TaskStatus(status) if status else None
+    except ValueError:
+        raise ValueError(f"Invalid status: {status}")
+    return {
+        "status": status_enum,
+        "assignee": assignee,
+        "tags": tags,
+        "priority": parse_priority(priority) if priority else None,
+        "min_priority": parse_priority(min_priority) if min_priority else None,
+        "max_priority": parse_priority(max_priority) if max_priority else None,
+    }
+
+
+def print_tasks(console: Any, tasks: Iterable[Task], show_priority: bool = False) -> None:
+    """
+    Print tasks as a table with ID, status and title columns.
+
+    Args:
+        console (Any): The rich console to print to.
+        tasks (Iterable[Task]): The tasks, in display order.
+        show_priority (bool): Add a priority column.
+    """
+    from rich.table import Table
+    from rich.text import Text
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="dim", overflow="fold")
+    table.add_column("Status")
+    if show_priority:
+        table.add_column("Priority")
+    table.add_column("Title")
+    for task in tasks:
+        status = Text(task.status.value, style=STATUS_COLORS.get(task.status.value, "white"))
+        if show_priority:
+            priority = task.priority.name if task.priority is not None else "-"
+            table.add_row(str(task.id), status, priority, task.title)
+        else:
+            table.add_row(str(task.id), status, task.title)
+    console.print(table)
+
+
+def choose_format(value: Optional[str], out: Optional[TextIO] = None) -> str:
+    """
+    Resolve the --format option: a rich table on a terminal, plain lines otherwise.
+
+    Args:
+        value (Optional[str]): The requested format, or None for automatic.
+        out (Optional[TextIO]): The stream the tasks go to (default: sys.stdout).
+
+    Returns:
+        str: One of FORMATS.
+
+    Raises:
+        ValueError: If the format is not known.
+    """
+    if value is None:
+        out = out or sys.stdout
+        return "table" if out.isatty() else "plain"
+    if value not in FORMATS:
+        raise ValueError(f"Invalid format: {value} (choose from {', '.join(FORMATS)})")
+    return value
+
+
+def csv_row(task: Task) -> List[str]:
+    """
+    Flatten a task into CSV_FIELDS values; lists are joined with commas.
+
+    Args:
+        task (Task): The task.
+
+    Returns:
+        List[str]: The row.
+    """
+    return [
+        str(task.id),
+        task.title,
+        task.status.value,
+        task.priority.name if task.priority is not None else "",
+        task.assignee or "",
+        ",".join(task.tags or ()),
+        ",".join(str(dep) for dep in task.depends_on or ()),
+        task.created_at.isoformat(),
+        task.updated_at.isoformat(),
+    ]
+
+
+def write_tasks(tasks: Iterable[Task], fmt: str, out: Optional[TextIO] = None) -> int:
+    """
+    Stream tasks to a text stream as plain lines, JSON lines, CSV or TSV.
+
+    Rows are written one at a time as the iterable yields them, so memory use does
+    not grow with the number of tasks. Plain lines are "id | status | title"; JSON
+    lines use the tasks.json form; CSV and TSV start with a header of CSV_FIELDS.
+
+    Args:
+        tasks (Iterable[Task]): The tasks, possibly a generator.
+        fmt (str): "plain", "jsonl", "csv" or "tsv".
+        out (Optional[TextIO]): The stream to write to (default: sys.stdout).
+
+    Returns:
+        int: The number of tasks written.
+    """
+    out = out or sys.stdout
+    write = out.write
+    count = 0
+    if fmt == "plain":
+        for count, task in enumerate(tasks, 1):
+            write(f"{task.id} | {task.status.value} | {task.title}\n")
+    elif fmt == "jsonl":
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        for count, task in enumerate(tasks, 1):
+            write(dumps(serialize_task(task)) + "\n")
+    else:
+        writer = csv.writer(out, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+        writer.writerow(CSV_FIELDS)
+        for count, task in enumerate(tasks, 1):
+            writer.writerow(csv_row(task))
+    return count
+
+
+def output_tasks(console: Any, tasks: Iterable[Task], fmt: str, empty_message: str,
+                 show_priority: bool = False) -> None:
+    """
+    Show tasks in the chosen format, or a notice when there are none.
+
+    Tables are rendered by rich; every other format is streamed by write_tasks and
+    notices go to stderr, so piped output holds nothing but rows. A reader that
+    closes the pipe early (`taskory list | head`) ends the output quietly.
+
+    Args:
+        console (Any): The rich console for tables and notices.
+        tasks (Iterable[Task]): The tasks, in display order.
+        fmt (str): One of FORMATS (see choose_format).
+        empty_message (str): Shown when there are no tasks.
+        show_priority (bool): Add a priority column to tables.
+    """
+    if fmt == "table":
+        tasks = list(tasks)
+        if not tasks:
+            console.print(empty_message, style="yellow")
+            return
+        with span("render_table") as phase:
+            print_tasks(console, tasks, show_priority=show_priority)
+            phase.add(records=len(tasks))
+        return
+    try:
+        with span("render_" + fmt) as phase:
+            count = write_tasks(tasks, fmt)
+            sys.stdout.flush()
+            phase.add(records=count)
+    except BrokenPipeError:
+        # Reason: stop Python from reporting the broken pipe again at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(0)
+    if not count and fmt == "plain":
+        sys.stderr.write(empty_message + "\n")
@@ -0,0 +1,179 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_path_for(snapshot_path: Union[str, Path]) -> Path:
+    """
+    Returns the lock file that guards a snapshot and its side files.
+    Args:
+        snapshot_path (str | Path): Path to the snapshot (e.g. .taskory/tasks.json).
+    Returns:
+        Path: The lock file path (e.g. .taskory/tasks.lock).
+    """
+    return Path(snapshot_path).with_suffix(".lock")
+
+
+def _new_file_mode() -> int:
+    # The mode open() would give a new file: 0o666 less the process umask, which can
+    # only be read by setting it.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write(path: Union[str, Path], data: Union[str, bytes]) -> None:
+    """
+    Replaces a file's contents in one step.
+
+    The data goes to a temporary file in the same directory, is flushed to disk and then
+    renamed over the target, so readers see either the old or the new file, never a
+    partly written one. The file keeps the permissions of the one it replaces, or gets
+    those of a newly created file.
+    Args:
+        path (str | Path): The file to write.
+        data (str | bytes): The new contents (str is written as UTF-8).
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _new_file_mode()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Reason: mkstemp creates the file as 0600, which would lock other users out
+        # of a shared store.
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def evict_least_recent(directory: Union[str, Path], pattern: str, max_bytes: int,
+                       keep: Optional[Path] = None) -> None:
+    """
+    Removes the least recently modified files of a cache directory until the files
+    matching a pattern fit in max_bytes. Caches touch an entry when they use it, so the
+    modification time is its last use.
+    Args:
+        directory (str | Path): The cache directory.
+        pattern (str): Glob pattern of the entries (e.g. "*.snap").
+        max_bytes (int): Total size to get under.
+        keep (Optional[Path]): An entry that is never removed (e.g. the one just written).
+    """
+    entries = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # removed by another process
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        total -= size
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a file, shared by every FileLock for the same path in
+    this process.
+
+    OS locks are held per open file (flock) or per process (Windows), so the lock is
+    counted here instead: nested acquisitions from one process, e.g. a CLI command
+    holding the lock while the store writes under it, do not block on themselves.
+    Other processes block until the lock is released.
+    """
+    _held: Dict[str, Tuple[int, int]] = {}
+    _guard = threading.RLock()
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Initializes the lock.
+        Args:
+            path (str | Path): The lock file (created on first acquire).
+        """
+        self.path = Path(path)
+        self._key = os.path.abspath(self.path)
+
+    def acquire(self) -> None:
+        """
+        Blocks until the lock is held by this process.
+        """
+        with self._guard:
+            held = self._held.get(self._key)
+            if held is not None:
+                self._held[self._key] = (held[0], held[1] + 1)
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._key, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    _lock_windows(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._held[self._key] = (fd, 1)
+
+    def release(self) -> None:
+        """
+        Releases one acquisition; the OS lock is dropped with the last one.
+        """
+        with self._guard:
+            fd, count = self._held[self._key]
+            if count > 1:
+                self._held[self._key] = (fd, count - 1)
+                return
+            del self._held[self._key]
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _lock_windows(fd: int) -> None:
+    # Reason: msvcrt.locking gives up after about ten seconds, so keep retrying to
+    # match the blocking behaviour of flock.
+    while True:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
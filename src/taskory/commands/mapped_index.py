@@ -0,0 +1,207 @@
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+from uuid import UUID
+from taskory.commands.locking import atomic_write
+
+# Index layout: a header, then fixed-width entries of (16-byte UUID, data offset, record
+# length). The first sorted_count entries are sorted by UUID and binary searched; newer
+# entries are appended unsorted to a short tail that is merged back once it grows.
+# The header also records the size of the data file and the number of entries it was
+# written for: entries are written before the header, so after a crash between the two
+# they disagree with the files and the index is rebuilt from the data file.
+INDEX_MAGIC = b"TKIX"
+INDEX_VERSION = 2
+# magic, version, sorted_count, live_count, dead_bytes, data_size, entry_count
+HEADER = struct.Struct("<4sHxxQQQQQ")
+# Version 1 had no data_size or entry_count; such indexes are upgraded when opened.
+HEADER_V1 = struct.Struct("<4sHxxQQQ")
+ENTRY = struct.Struct("<16sQI")  # task id, offset into the data file, record length
+
+Entry = Tuple[bytes, int, int]
+
+
+class IndexHeader(NamedTuple):
+    sorted_count: int
+    live_count: int
+    dead_bytes: int
+    data_size: int
+    entry_count: int
+
+
+class MappedIndex:
+    """
+    The id -> record index of a MappedTaskStore (tasks.idx), read through a memory map.
+
+    Mutations write their entry in place (or append it to the tail) and then the header,
+    each with a single write; whole-index rewrites go through atomic_write.
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path (str | Path): The index file.
+        """
+        self.path = Path(path)
+        self._map: Optional[mmap.mmap] = None
+
+    def close(self) -> None:
+        """
+        Releases the memory map.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _bytes(self) -> mmap.mmap:
+        if self._map is None:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def header(self) -> IndexHeader:
+        """
+        Returns:
+            IndexHeader: The counts recorded in the header.
+        Raises:
+            ValueError: If the file is not a task index of this version.
+        """
+        magic, version, *counts = HEADER.unpack_from(self._bytes(), 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"Unsupported task index: {self.path}")
+        return IndexHeader(*counts)
+
+    def is_consistent(self, data_size: int) -> bool:
+        """
+        Checks that the index was completely written for the data file as it is.
+
+        An index of version 1 is upgraded in place first, since it was always written
+        completely.
+        Args:
+            data_size (int): The size of the data file.
+        Returns:
+            bool: False if the index must be rebuilt from the data file.
+        """
+        try:
+            raw = self._bytes()
+            magic, version = struct.unpack_from("<4sH", raw, 0)
+            if magic == INDEX_MAGIC and version == 1:
+                _, _, sorted_count, live_count, dead_bytes = HEADER_V1.unpack_from(raw, 0)
+                entries = list(ENTRY.iter_unpack(raw[HEADER_V1.size:]))
+                self.write(entries, live_count, dead_bytes, data_size, sorted_count)
+            header = self.header()
+        except (OSError, ValueError, struct.error):
+            return False
+        return header.data_size == data_size and len(self._bytes()) == HEADER.size + header.entry_count * ENTRY.size
+
+    def entries(self) -> Iterator[Entry]:
+        """
+        Returns:
+            Iterator[Entry]: Every entry, deleted ones (length 0) included, in index order.
+        """
+        return ENTRY.iter_unpack(self._bytes()[HEADER.size:])
+
+    def live_entries(self) -> List[Tuple[int, int]]:
+        """
+        Returns:
+            List[Tuple[int, int]]: (offset, length) of every live record, in data file order.
+        """
+        return sorted((offset, length) for _, offset, length in self.entries() if length)
+
+    def find(self, key: bytes) -> Optional[Tuple[int, int, int]]:
+        """
+        Locates the entry for a task id, including deleted (zero-length) entries.
+        Args:
+            key (bytes): The 16-byte task id.
+        Returns:
+            Optional[Tuple[int, int, int]]: (entry number, data offset, record length), or None.
+        """
+        index = self._bytes()
+        sorted_count = self.header().sorted_count
+        low, high = 0, sorted_count
+        while low < high:
+            middle = (low + high) // 2
+            position = HEADER.size + middle * ENTRY.size
+            current = index[position:position + 16]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                _, offset, length = ENTRY.unpack_from(index, position)
+                return middle, offset, length
+        tail = index[HEADER.size + sorted_count * ENTRY.size:]
+        for number, (entry_id, offset, length) in enumerate(ENTRY.iter_unpack(tail), start=sorted_count):
+            if entry_id == key:
+                return number, offset, length
+        return None
+
+    def update(self, number: Optional[int], entry: Entry, header: IndexHeader) -> None:
+        """
+        Writes one entry, then the header that accounts for it.
+        Args:
+            number (Optional[int]): The entry to overwrite, or None to append one.
+            entry (Entry): The new entry.
+            header (IndexHeader): The new header; entry_count must include an appended entry.
+        """
+        self.close()
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size + (number if number is not None else header.entry_count - 1) * ENTRY.size)
+            f.write(ENTRY.pack(*entry))
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, *header))
+
+    def write(self, entries: List[Entry], live_count: int, dead_bytes: int, data_size: int,
+              sorted_count: Optional[int] = None) -> None:
+        """
+        Replaces the whole index in one step.
+        Args:
+            entries (List[Entry]): The entries; sorted here unless sorted_count is given.
+            live_count (int): The number of live tasks.
+            dead_bytes (int): Bytes of superseded records in the data file.
+            data_size (int): The size of the data file.
+            sorted_count (Optional[int]): Length of the already sorted region of entries.
+        """
+        if sorted_count is None:
+            entries = sorted(entries)
+            sorted_count = len(entries)
+        header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, sorted_count, live_count, dead_bytes,
+                             data_size, len(entries))
+        self.close()
+        atomic_write(self.path, header + b"".join(ENTRY.pack(*entry) for entry in entries))
+
+
+def scan_data(data_path: Union[str, Path]) -> Tuple[List[Entry], int, int]:
+    """
+    Recovers the index entries from a data file: the latest record of each task wins and
+    deletion records drop it. A torn record at the end, left by a crash, is cut off.
+    Args:
+        data_path (str | Path): The data file.
+    Returns:
+        Tuple[List[Entry], int, int]: The live entries, the bytes of superseded records
+            and the size of the data file.
+    """
+    found = {}
+    offset = 0
+    with open(data_path, "r+b") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(offset)
+                break
+            try:
+                record = json.loads(line)
+                key = UUID(record["id"]).bytes
+            except (KeyError, TypeError, ValueError):
+                key = None
+            if key is not None:
+                if record.get("deleted"):
+                    found.pop(key, None)
+                else:
+                    found[key] = (key, offset, len(line))
+            offset += len(line)
+    entries = list(found.values())
+    return entries, offset - sum(length for _, _, length in entries), offset
@@ -0,0 +1,481 @@
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.serialization import serialize_task, deserialize_task
+from taskory.commands.storage import Change
+from taskory.commands.locking import atomic_write
+from taskory.commands.mapped_index import IndexHeader, MappedIndex, scan_data
+from taskory.commands.bulk import BulkOperations
+from taskory.commands.task_graph import DependencyGraph, check_dependencies
+from taskory.commands.sorted_views import TaskPage, check_sort, decode_cursor, make_page, select, sort_key
+
+# Unsorted index entries (see mapped_index) past which the index is re-sorted.
+TAIL_LIMIT = 4096
+# Reason: dead records are only reclaimed once they outweigh the live data, so the
+# rewrite cost is spread over at least as many bytes of updates.
+MIN_COMPACT_BYTES = 1024 * 1024
+
+DATA_FILE = "tasks.dat"
+INDEX_FILE = "tasks.idx"
+
+
+class MappedTaskStore(BulkOperations):
+    """
+    Lazy task store backed by a memory-mapped data file and an id -> offset index.
+
+    Records are compact JSON lines in tasks.dat; tasks.idx maps each task id to the
+    position of its latest record. Point lookups, updates and deletes decode only the
+    record they touch, and listings stream records without keeping every Task in memory.
+    Updates append a new record and repoint the index, deletes append a deletion record;
+    superseded records are reclaimed by compact(). The data file alone determines the
+    tasks, so an index left incomplete by a crash is rebuilt from it when opened.
+
+    As with TaskStore, each written change is passed to the callables in write_listeners
+    (see workspace.watch_indexes), or None after a batch is rolled back.
+    """
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """
+        Opens (or creates) a mapped store in a directory.
+        Args:
+            directory (str | Path): Directory holding tasks.dat and tasks.idx.
+        """
+        self.directory = Path(directory)
+        self.data_path = self.directory / DATA_FILE
+        self.index_path = self.directory / INDEX_FILE
+        self._data_map: Optional[mmap.mmap] = None
+        self.index = MappedIndex(self.index_path)
+        self.write_listeners: List[Callable[[Optional[List[Change]]], None]] = []
+        if not self.index_path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write_files([])
+        elif not self.index.is_consistent(self._data_size()):
+            self._rebuild_index()
+
+    @classmethod
+    def exists(cls, directory: Union[str, Path]) -> bool:
+        """
+        Checks whether a directory already holds a mapped store.
+        Args:
+            directory (str | Path): The directory to check.
+        Returns:
+            bool: True if the index file exists.
+        """
+        return (Path(directory) / INDEX_FILE).exists()
+
+    def version(self) -> str:
+        """
+        Identifies the state of the files on disk (see StorageBackend.version).
+        Returns:
+            str: The sizes and modification times of the data and index files.
+        """
+        stats = [os.stat(path) for path in (self.data_path, self.index_path) if path.exists()]
+        return "mapped:" + ",".join(f"{stat.st_size}/{stat.st_mtime_ns}" for stat in stats)
+
+    @classmethod
+    def from_tasks(cls, directory: Union[str, Path], tasks: Iterable[Task]) -> 'MappedTaskStore':
+        """
+        Builds a mapped store from existing tasks in one pass, replacing any previous one.
+        Args:
+            directory (str | Path): Directory to write tasks.dat and tasks.idx to.
+            tasks (Iterable[Task]): The tasks to store, e.g. TaskStore.list_tasks().
+        Returns:
+            MappedTaskStore: The new store.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        store = cls.__new__(cls)
+        store.directory = directory
+        store.data_path = directory / DATA_FILE
+        store.index_path = directory / INDEX_FILE
+        store._data_map = None
+        store.index = MappedIndex(store.index_path)
+        store.write_listeners = []
+        store._write_files(serialize_task(task) for task in tasks)
+        return store
+
+    # --- low-level file access -------------------------------------------------
+
+    def _write_files(self, records: Iterable[dict]) -> None:
+        """
+        Rewrites the data and index files from scratch with the given records.
+        Args:
+            records (Iterable[dict]): Serialized tasks.
+        """
+        self._close_maps()
+        entries = []
+        offset = 0
+        tmp_data = self.data_path.with_suffix(".dat.tmp")
+        with open(tmp_data, "wb") as f:
+            for record in records:
+                line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+                f.write(line)
+                entries.append((UUID(record["id"]).bytes, offset, len(line)))
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_data, self.data_path)
+        self.index.write(entries, len(entries), 0, offset)
+
+    def _rebuild_index(self) -> None:
+        # Reason: a crash between a data append and its index header leaves them out of
+        # step; the data file is complete up to its last full record, so it is rescanned.
+        self._close_maps()
+        entries, dead_bytes, data_size = scan_data(self.data_path)
+        self.index.write(entries, len(entries), dead_bytes, data_size)
+
+    def _close_maps(self) -> None:
+        if self._data_map is not None:
+            self._data_map.close()
+        self._data_map = None
+        self.index.close()
+
+    def _data_size(self) -> int:
+        try:
+            return self.data_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        if path.stat().st_size == 0:
+            return None
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _data(self) -> Optional[mmap.mmap]:
+        if self._data_map is None:
+            self._data_map = self._map(self.data_path)
+        return self._data_map
+
+    def _read_record(self, offset: int, length: int) -> dict:
+        return json.loads(self._data()[offset:offset + length])
+
+    def _append_record(self, record: dict) -> Tuple[int, int]:
+        """
+        Appends a serialized task (or deletion record) to the data file.
+        Args:
+            record (dict): The serialized task.
+        Returns:
+            Tuple[int, int]: The record's offset and length.
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        self._close_maps()
+        with open(self.data_path, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+            f.flush()
+            # Reason: the record must be on disk before the index points at it.
+            os.fsync(f.fileno())
+        return offset, len(line)
+
+    def _repoint(self, number: Optional[int], entry: tuple, live_delta: int, dead_delta: int) -> None:
+        """
+        Records a mutation already appended to the data file in the index.
+        Args:
+            number (Optional[int]): The entry to overwrite, or None to append one.
+            entry (tuple): The new (task id bytes, offset, length) entry.
+            live_delta (int): Change in the number of live tasks.
+            dead_delta (int): Bytes of records the mutation superseded.
+        """
+        header = self.index.header()
+        self.index.update(number, entry, IndexHeader(
+            header.sorted_count,
+            header.live_count + live_delta,
+            header.dead_bytes + dead_delta,
+            self._data_size(),
+            header.entry_count + (number is None),
+        ))
+
+    def _dependencies_of(self, task_id: UUID) -> List[UUID]:
+        # Stored dependencies of a task, read from its record alone.
+        found = self.index.find(task_id.bytes)
+        if found is None or not found[2]:
+            return []
+        return [UUID(dep) for dep in self._read_record(found[1], found[2]).get("depends_on") or ()]
+
+    def _notify(self, changes: Optional[List[Change]]) -> None:
+        for listener in self.write_listeners:
+            listener(changes)
+
+    @staticmethod
+    def _key(task_id: Union[str, UUID]) -> UUID:
+        if isinstance(task_id, str):
+            try:
+                return UUID(task_id)
+            except Exception as e:
+                raise ValueError(f"Invalid UUID string: {task_id}") from e
+        return task_id
+
+    # --- TaskStore-compatible API ----------------------------------------------
+
+    def __len__(self) -> int:
+        return self.index.header().live_count
+
+    def task_ids(self) -> List[UUID]:
+        """
+        Lists the ids of all tasks from the index alone, without reading any record.
+        """
+        return [UUID(bytes=key) for key, _, length in self.index.entries() if length]
+
+    def add_task(self, task: Task) -> None:
+        """
+        Adds a new task to the store.
+
+        Args:
+            task (Task): The task to add.
+
+        Raises:
+            ValueError: If a task with the same ID already exists.
+            DependencyCycleError: If its dependencies would form a cycle.
+        """
+        found = self.index.find(task.id.bytes)
+        if found is not None and found[2]:
+            raise ValueError(f"Task with id {task.id} already exists.")
+        # Reason: the lazy store keeps no dependency graph, so the cycle check reads the
+        # records of the dependencies it walks, as many as TaskStore would visit.
+        check_dependencies(task.id, task.depends_on, self._dependencies_of)
+        offset, length = self._append_record(serialize_task(task))
+        # Reason: a re-added id reuses its tombstone so the sorted region stays sorted.
+        self._repoint(found[0] if found is not None else None, (task.id.bytes, offset, length), 1, 0)
+        header = self.index.header()
+        if header.entry_count - header.sorted_count > TAIL_LIMIT:
+            self._merge_index()
+        self._notify([("add", task.id, task)])
+
+    def get_task_by_id(self, task_id: Union[str, UUID]) -> Task:
+        """
+        Retrieves a task by its ID, decoding only its record.
+
+        Args:
+            task_id (str | UUID): The ID of the task (as string or UUID).
+
+        Returns:
+            Task: The found task.
+
+        Raises:
+            KeyError: If the task is not found.
+            ValueError: If the ID string is not a valid UUID.
+        """
+        task_id = self._key(task_id)
+        found = self.index.find(task_id.bytes)
+        if found is None or not found[2]:
+            raise KeyError(f"Task with id {task_id} not found.")
+        return deserialize_task(self._read_record(found[1], found[2]))
+
+    def update_task(self, task_id: Union[str, UUID], **kwargs: Any) -> Task:
+        """
+        Updates fields of a task by ID by appending its new version.
+
+        Args:
+            task_id (str | UUID): The ID of the task to update (as string or UUID).
+            **kwargs: Fields to update.
+
+        Returns:
+            Task: The updated task.
+
+        Raises:
+            KeyError: If the task is not found.
+            ValueError: If an invalid field is provided or ID is invalid.
+            DependencyCycleError: If new dependencies would form a cycle.
+        """
+        task = self.get_task_by_id(task_id)
+        for key in kwargs:
+            if not hasattr(task, key):
+                raise ValueError(f"Invalid field: {key}")
+        if "depends_on" in kwargs:
+            kwargs = {**kwargs, "depends_on": check_dependencies(task.id, kwargs["depends_on"], self._dependencies_of)}
+        for key, value in kwargs.items():
+            setattr(task, key, value)
+        # Always update the updated_at timestamp
+        task.updated_at = datetime.now(UTC)
+        number, _, old_length = self.index.find(task.id.bytes)
+        offset, length = self._append_record(serialize_task(task))
+        self._repoint(number, (task.id.bytes, offset, length), 0, old_length)
+        self._maybe_compact()
+        self._notify([("update", task.id, task)])
+        return task
+
+    def delete_task(self, task_id: Union[str, UUID]) -> None:
+        """
+        Deletes a task by its ID.
+
+        Args:
+            task_id (str | UUID): The ID of the task to delete (as string or UUID).
+
+        Raises:
+            KeyError: If the task is not found.
+            ValueError: If the ID string is not a valid UUID.
+        """
+        task_id = self._key(task_id)
+        found = self.index.find(task_id.bytes)
+        if found is None or not found[2]:
+            raise KeyError(f"Task with id {task_id} not found.")
+        number, _, old_length = found
+        _, length = self._append_record({"id": str(task_id), "deleted": True})
+        self._repoint(number, (task_id.bytes, 0, 0), -1, old_length + length)
+        self._maybe_compact()
+        self._notify([("delete", task_id, None)])
+
+    def iter_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams tasks in write order, decoding one record at a time.
+
+        Filters are checked on the raw record, so only matching tasks become Task objects.
+        Args:
+            status (Optional[TaskStatus]): Status to filter by.
+            assignee (Optional[str]): Assignee to filter by.
+            tags (Optional[Iterable[str]]): Tags that must all be present on the task.
+            priority (Optional[TaskPriority]): Exact priority to filter by.
+            min_priority (Optional[int]): Lowest priority to include (inclusive).
+            max_priority (Optional[int]): Highest priority to include (inclusive).
+        Returns:
+            Iterator[Task]: Matching tasks.
+        """
+        required_tags = set(tags or ())
+        for offset, length in self.index.live_entries():
+            record = self._read_record(offset, length)
+            if status is not None and record["status"] != status:
+                continue
+            if assignee is not None and record.get("assignee") != assignee:
+                continue
+            if required_tags and not required_tags.issubset(record.get("tags") or ()):
+                continue
+            level = record.get("priority")
+            if priority is not None and level != priority:
+                continue
+            if (min_priority is not None or max_priority is not None) and level is None:
+                continue
+            if min_priority is not None and level < min_priority:
+                continue
+            if max_priority is not None and level > max_priority:
+                continue
+            yield deserialize_task(record)
+
+    def list_tasks(self, status: Optional[TaskStatus] = None, **filters: Any) -> List[Task]:
+        """
+        Lists tasks, optionally filtered (see iter_tasks for the filters).
+
+        Args:
+            status (Optional[TaskStatus]): Status to filter by.
+            **filters: Further filters accepted by iter_tasks.
+
+        Returns:
+            List[Task]: List of tasks.
+        """
+        return list(self.iter_tasks(status=status, **filters))
+
+    def page_tasks(
+        self,
+        limit: Optional[int] = None,
+        sort_by: str = "priority",
+        reverse: bool = False,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> TaskPage:
+        """
+        Lists tasks sorted by a field, one page at a time (see TaskStore.page_tasks).
+
+        The lazy store keeps no sorted index: each page streams the matching records
+        through a bounded heap, so it holds at most limit + 1 tasks in memory.
+
+        Args:
+            limit (Optional[int]): Page size; None returns every match.
+            sort_by (str): "priority", "created_at" or "updated_at".
+            reverse (bool): Reverse the order.
+            cursor (Optional[str]): The cursor of the previous page.
+            **filters: Filters accepted by iter_tasks.
+
+        Returns:
+            TaskPage: The tasks and the cursor of the next page.
+        """
+        check_sort(sort_by, limit)
+        after = decode_cursor(cursor, sort_by, reverse) if cursor else None
+        entries = ((sort_key(task, sort_by), task.id, task) for task in self.iter_tasks(**filters))
+        selected = select(entries, limit + 1 if limit is not None else None, after, reverse)
+        return make_page(selected, limit, sort_by, reverse, {entry[1]: entry[2] for entry in selected})
+
+    def next_task(self) -> Optional[Task]:
+        """
+        Picks the highest-priority todo task whose dependencies are all done.
+
+        The lazy store keeps no dependency graph, so this builds one from a full scan.
+
+        Returns:
+            Optional[Task]: The task, or None if every todo task is blocked.
+        """
+        graph = DependencyGraph()
+        tasks = {}
+        for task in self.iter_tasks():
+            graph.add(task)
+            tasks[task.id] = task
+        task_id = graph.next_ready()
+        return tasks[task_id] if task_id is not None else None
+
+    @contextmanager
+    def batch(self) -> Iterator['MappedTaskStore']:
+        """
+        Groups mutations so that an exception escaping the block undoes all of them.
+
+        Mutations are written as they happen; rollback restores the index and cuts the
+        data file back to its size before the block.
+
+        Returns:
+            Iterator[MappedTaskStore]: The store itself, for use in a with statement.
+        """
+        saved_index = self.index_path.read_bytes()
+        saved_size = self.data_path.stat().st_size
+        try:
+            yield self
+        except BaseException:
+            self._close_maps()
+            # Reason: data first, so that a crash in between leaves a longer index
+            # header than data file, which is rebuilt from the data as it was.
+            with open(self.data_path, "r+b") as f:
+                f.truncate(saved_size)
+            atomic_write(self.index_path, saved_index)
+            # Reason: listeners applied the undone changes; None makes them stop, so
+            # their indexes are rebuilt from the store when next used.
+            self._notify(None)
+            raise
+
+    # --- maintenance -----------------------------------------------------------
+
+    def _merge_index(self) -> None:
+        """
+        Folds the unsorted tail into the sorted region and drops tombstones.
+        """
+        header = self.index.header()
+        entries = [entry for entry in self.index.entries() if entry[2]]
+        self.index.write(entries, header.live_count, header.dead_bytes, header.data_size)
+
+    def _maybe_compact(self) -> None:
+        dead_bytes = self.index.header().dead_bytes
+        size = self._data_size()
+        if dead_bytes > MIN_COMPACT_BYTES and dead_bytes * 2 > size:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrites the data file without superseded records and re-sorts the index.
+        """
+        records = [self._read_record(offset, length) for offset, length in self.index.live_entries()]
+        self._write_files(records)
+
+    def close(self) -> None:
+        """
+        Releases the memory maps.
+        """
+        self._close_maps()
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+from typing import List, Union
+from uuid import UUID, uuid5
+from taskory.schemas import Goal, Planning, Task
+from taskory.commands.serialization import validate_tasks
+from taskory.llm_interface import INPUT_MARKER, LLMClient, LLMError
+
+PLANNING_FILE = "planning.json"
+# Parsed tasks get ids derived from their goal and position, so parsing the same plan
+# again finds the tasks it already made instead of adding copies.
+TASK_ID_NAMESPACE = UUID("6f1c3e1e-5b8a-4c1e-9d3f-7a2b4c6d8e90")
+
+PROMPT = """You plan software work for the project "{project}".
+{context}Break the goal below into a short list of concrete, separately doable tasks.
+Reply with JSON only, in this form:
+{{"tasks": [{{"title": "...", "priority": 1, "tags": ["..."], "depends_on": [0]}}]}}
+priority is 1 (low), 2 (medium) or 3 (high). depends_on lists the positions (from 0)
+of earlier tasks in your list that must be done first.
+{marker}
+{input}"""
+
+
+def read_planning(path: Union[str, Path]) -> Planning:
+    """
+    Reads and validates a planning.json file.
+    Args:
+        path (str | Path): The file.
+    Returns:
+        Planning: The plan.
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not valid JSON or not a valid plan.
+    """
+    with open(path, "rb") as f:
+        return Planning.model_validate_json(f.read())
+
+
+def goal_prompt(planning: Planning, goal: Goal) -> str:
+    """
+    Builds the prompt that asks for the tasks of one goal.
+
+    The prompt only depends on the plan's project, scope, constraints and this goal,
+    so it stays the same (and is answered from the cache) while they do not change.
+    Args:
+        planning (Planning): The plan.
+        goal (Goal): One of its goals.
+    Returns:
+        str: The prompt.
+    """
+    context = ""
+    if planning.scope:
+        context += f"Scope: {planning.scope}\n"
+    for constraint in planning.constraints or ():
+        context += f"Constraint: {constraint}\n"
+    return PROMPT.format(
+        project=planning.project.get("name", "unnamed"),
+        context=context,
+        marker=INPUT_MARKER,
+        input=json.dumps({"goal": goal.model_dump(mode="json", exclude_none=True)}, sort_keys=True),
+    )
+
+
+def task_records(prompt: str, goal: Goal, response: str) -> List[dict]:
+    """
+    Turns a model's reply to a goal prompt into task records, not yet validated.
+
+    Each task's id is derived from the prompt and its position, and its depends_on
+    positions become those ids. The goal's priority and tags apply where the reply
+    gives none.
+    Args:
+        prompt (str): The prompt that was answered.
+        goal (Goal): Its goal.
+        response (str): The reply.
+    Returns:
+        List[dict]: The task fields.
+    Raises:
+        LLMError: If the reply is not JSON of the requested form.
+    """
+    text = response.strip()
+    if text.startswith("```"):
+        # Reason: models often wrap JSON in a Markdown code block despite the prompt.
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        items = json.loads(text)["tasks"]
+        if not isinstance(items, list) or not items:
+            raise ValueError("no tasks")
+        ids = [uuid5(TASK_ID_NAMESPACE, f"{prompt}\n{number}") for number in range(len(items))]
+        records = []
+        for number, item in enumerate(items):
+            depends_on = item.get("depends_on") or []
+            if any(not isinstance(dep, int) or not 0 <= dep < number for dep in depends_on):
+                raise ValueError(f"task {number} depends on a task that does not come before it")
+            records.append({
+                "id": ids[number],
+                "title": item["title"],
+                "priority": item.get("priority") or goal.priority,
+                "tags": item.get("tags") or goal.tags,
+                "depends_on": [ids[dep] for dep in depends_on] or None,
+            })
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise LLMError(f"Unusable reply for goal {goal.title!r}: {e}") from e
+    return records
+
+
+async def parse_planning(planning: Planning, client: LLMClient) -> List[Task]:
+    """
+    Generates the tasks of every goal, asking the model about all goals at once.
+
+    The requests run concurrently through the client, which answers unchanged goals
+    from its cache; all tasks are then validated in one bulk pass.
+    Args:
+        planning (Planning): The plan.
+        client (LLMClient): The model client.
+    Returns:
+        List[Task]: The tasks, goal by goal.
+    Raises:
+        LLMError: If a request fails or a reply is unusable.
+        ValueError: If a generated task is invalid.
+    """
+    prompts = [goal_prompt(planning, goal) for goal in planning.goals]
+    responses = await client.complete_many(prompts)
+    records = []
+    for prompt, goal, response in zip(prompts, planning.goals, responses):
+        records.extend(task_records(prompt, goal, response))
+    return validate_tasks(records)
@@ -0,0 +1,391 @@
+import heapq
+import math
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from taskory.schemas import Task, TaskStatus
+from taskory.commands.storage import Change
+
+# Bumped when the layout or the tokenizer changes; older indexes are rebuilt.
+FORMAT = "1"
+# A match in a tag counts as much as this many matches in the title.
+TAG_WEIGHT = 2.0
+# A token that only starts with a query term counts this much of an exact match.
+PREFIX_WEIGHT = 0.5
+# BM25 parameters: term frequency saturation and document length normalisation.
+K1 = 1.2
+B = 0.75
+# Later query terms are looked up per candidate task while there are at most this many.
+PROBE_LIMIT = 2000
+# Largest number of parameters sent in one IN (...) list.
+CHUNK = 500
+_TOKEN = re.compile(r"\w+")
+# Upper bound for prefix ranges: sorts after every string that starts with the prefix.
+_AFTER = "\U0010ffff"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS docs (
+    task_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    length INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    weight REAL NOT NULL,
+    length INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (token, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_task ON postings(task_id);
+CREATE TABLE IF NOT EXISTS terms (token TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+"""
+
+
+class SearchHit(NamedTuple):
+    """
+    One search result, read from the index alone.
+    """
+    id: str
+    title: str
+    status: str
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase word tokens.
+    Args:
+        text (str): The text.
+    Returns:
+        List[str]: The tokens, in order, with repeats.
+    """
+    return _TOKEN.findall(text.casefold())
+
+
+def _weights(task: Task) -> Tuple[Dict[str, float], int]:
+    # Weighted term frequencies of a task's title and tags, and its length in tokens.
+    weights: Dict[str, float] = {}
+    tokens = tokenize(task.title)
+    for token in tokens:
+        weights[token] = weights.get(token, 0.0) + 1.0
+    for tag in task.tags or ():
+        for token in tokenize(tag):
+            weights[token] = weights.get(token, 0.0) + TAG_WEIGHT
+            tokens.append(token)
+    return weights, len(tokens)
+
+
+class SearchIndex:
+    """
+    Persistent inverted index over task titles and tags, kept in a SQLite file.
+
+    Each token maps to the tasks containing it (postings), with a weighted term
+    frequency and the task's length and status, so a query is answered from the
+    postings of its own terms without loading the store. Results are ranked with BM25;
+    every query term also matches longer tokens that start with it, at PREFIX_WEIGHT.
+
+    The index records the store version (StorageBackend.version) it reflects. Callers
+    compare it with the store's current version and rebuild when they differ.
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Opens (or creates) the index. A file that is not a readable index is replaced
+        by an empty one, which then reads as out of date.
+        Args:
+            path (str | Path): Path to the index file (e.g. .taskory/search.db).
+        """
+        self.path = Path(path)
+        try:
+            self._open()
+        except sqlite3.DatabaseError:
+            self.connection.close()
+            os.remove(self.path)
+            self._open()
+
+    def _open(self) -> None:
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+        self._docs = int(self._meta("docs") or 0)
+        self._total_length = int(self._meta("total_length") or 0)
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_meta(self, **values: object) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in values.items()],
+        )
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        The store version the index was last brought up to date with, or None if it
+        was never built (or was built by an older format).
+        """
+        if self._meta("format") != FORMAT:
+            return None
+        return self._meta("store_version")
+
+    def rebuild(self, tasks: Iterable[Task], version: Optional[str]) -> None:
+        """
+        Replaces the whole index with the given tasks, in one transaction.
+        Args:
+            tasks (Iterable[Task]): Every task in the store.
+            version (Optional[str]): The store version the tasks were read at.
+        """
+        with self.connection:
+            for table in ("docs", "postings", "terms"):
+                self.connection.execute(f"DELETE FROM {table}")
+            self._docs = self._total_length = 0
+            for task in tasks:
+                self._insert(task)
+            self._commit_meta(version)
+
+    def apply(self, changes: Iterable[Change], version: Optional[str]) -> None:
+        """
+        Applies written store changes to the index, in one transaction.
+        Args:
+            changes (Iterable[Change]): The changes, latest state per task.
+            version (Optional[str]): The store version after the changes.
+        """
+        with self.connection:
+            for _, task_id, task in changes:
+                self._remove(str(task_id))
+                if task is not None:
+                    self._insert(task)
+            self.connection.execute("DELETE FROM terms WHERE df <= 0")
+            self._commit_meta(version)
+
+    def _commit_meta(self, version: Optional[str]) -> None:
+        self._set_meta(format=FORMAT, docs=self._docs, total_length=self._total_length)
+        if version is None:
+            self.connection.execute("DELETE FROM meta WHERE key = 'store_version'")
+        else:
+            self._set_meta(store_version=version)
+
+    def _insert(self, task: Task) -> None:
+        key = str(task.id)
+        status = TaskStatus(task.status).value
+        weights, length = _weights(task)
+        self.connection.execute(
+            "INSERT INTO docs (task_id, title, status, length) VALUES (?, ?, ?, ?)",
+            (key, task.title, status, length),
+        )
+        self.connection.executemany(
+            "INSERT INTO postings (token, task_id, weight, length, status) VALUES (?, ?, ?, ?, ?)",
+            [(token, key, weight, length, status) for token, weight in weights.items()],
+        )
+        self.connection.executemany(
+            "INSERT INTO terms (token, df) VALUES (?, 1) ON CONFLICT(token) DO UPDATE SET df = df + 1",
+            [(token,) for token in weights],
+        )
+        self._docs += 1
+        self._total_length += length
+
+    def _remove(self, key: str) -> None:
+        row = self.connection.execute("SELECT length FROM docs WHERE task_id = ?", (key,)).fetchone()
+        if row is None:
+            return
+        tokens = self.connection.execute("SELECT token FROM postings WHERE task_id = ?", (key,)).fetchall()
+        self.connection.executemany("UPDATE terms SET df = df - 1 WHERE token = ?", tokens)
+        self.connection.execute("DELETE FROM postings WHERE task_id = ?", (key,))
+        self.connection.execute("DELETE FROM docs WHERE task_id = ?", (key,))
+        self._docs -= 1
+        self._total_length -= row[0]
+
+    def search(self, query: str, status: Optional[TaskStatus] = None, limit: Optional[int] = 20) -> List[SearchHit]:
+        """
+        Finds the tasks whose title or tags contain every term of the query, best first.
+
+        Terms are looked up rarest first. While the rarest term matches few tasks, the
+        other terms are looked up for those tasks only, so the cost follows the rarest
+        term rather than the store size. Otherwise SQLite scores and ranks the matches
+        itself, so that no more than the results are read back.
+        Args:
+            query (str): The search terms.
+            status (Optional[TaskStatus]): Only return tasks with this status.
+            limit (Optional[int]): How many results to return; None returns all.
+        Returns:
+            List[SearchHit]: The matching tasks, highest score first (then by id).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or self._docs == 0:
+            return []
+        stats = sorted(self._term_stats(term) for term in terms)
+        if stats[0][0] == 0:
+            return []
+        status_value = TaskStatus(status).value if status is not None else None
+        if len(stats) == 1 or stats[0][0] > PROBE_LIMIT:
+            best = self._rank(stats, status_value, limit)
+        else:
+            best = self._probe(stats, status_value, limit)
+        docs = self._docs_by_id([task_id for task_id, _ in best])
+        return [SearchHit(task_id, *docs[task_id], score) for task_id, score in best]
+
+    def _term_stats(self, term: str) -> Tuple[int, int, str]:
+        # (document frequency, number of distinct tokens, term) for the tokens starting
+        # with the term. Tasks holding several such tokens are counted once per token,
+        # which only makes prefixes rank lower.
+        df, tokens = self.connection.execute(
+            "SELECT COALESCE(SUM(df), 0), COUNT(*) FROM terms WHERE token >= ? AND token < ?", (term, term + _AFTER),
+        ).fetchone()
+        return df, tokens, term
+
+    def _idf(self, df: int) -> float:
+        return math.log(1 + (self._docs - df + 0.5) / (df + 0.5))
+
+    def _rank(self, stats: List[Tuple[int, int, str]], status: Optional[str], limit: Optional[int]) -> List[Tuple[str, float]]:
+        # BM25 in SQL: one scored SELECT per term, summed per task when needed.
+        average_length = self._total_length / self._docs
+        score = (f"? * w * {K1 + 1} / (w + {K1} * ({1 - B} + {B} * length / {average_length!r}))")
+        selects, params = [], []
+        for number, (df, _, term) in enumerate(stats):
+            selects.append(
+                f"SELECT task_id, {number} AS term, {score} AS score FROM (SELECT task_id, length, "
+                f"weight * CASE WHEN token = ? THEN 1.0 ELSE {PREFIX_WEIGHT} END AS w FROM postings "
+                f"WHERE token >= ? AND token < ?{' AND status = ?' if status is not None else ''})"
+            )
+            params += [self._idf(df), term, term, term + _AFTER] + ([status] if status is not None else [])
+        if len(stats) == 1 and stats[0][1] == 1:
+            # Reason: a single token has at most one posting per task, so the rows need
+            # no grouping, which saves most of the work for a term in every task.
+            sql = f"SELECT task_id, score FROM ({selects[0]})"
+        else:
+            sql = (f"SELECT task_id, SUM(score) AS score FROM ({' UNION ALL '.join(selects)}) "
+                   f"GROUP BY task_id HAVING COUNT(DISTINCT term) = {len(stats)}")
+        sql += " ORDER BY score DESC, task_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(sql, params).fetchall()
+
+    def _probe(self, stats: List[Tuple[int, int, str]], status: Optional[str], limit: Optional[int]) -> List[Tuple[str, float]]:
+        # BM25 in Python, narrowing the candidates with each term.
+        average_length = self._total_length / self._docs
+        scores: Optional[Dict[str, float]] = None
+        for df, _, term in stats:
+            idf = self._idf(df)
+            matched: Dict[str, float] = {}
+            for task_id, token, weight, length, task_status in self._postings(term, scores):
+                if status is not None and task_status != status:
+                    continue
+                weight *= 1.0 if token == term else PREFIX_WEIGHT
+                norm = K1 * (1 - B + B * length / average_length)
+                matched[task_id] = matched.get(task_id, 0.0) + idf * weight * (K1 + 1) / (weight + norm)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {task_id: score + matched[task_id] for task_id, score in scores.items() if task_id in matched}
+            if not scores:
+                return []
+        order = lambda item: (-item[1], item[0])
+        return heapq.nsmallest(limit, scores.items(), key=order) if limit is not None else sorted(scores.items(), key=order)
+
+    def _postings(self, term: str, candidates: Optional[Dict[str, float]]) -> List[tuple]:
+        where = "token >= ? AND token < ?"
+        columns = "SELECT task_id, token, weight, length, status FROM postings"
+        if candidates is None or len(candidates) > PROBE_LIMIT:
+            return self.connection.execute(f"{columns} WHERE {where}", (term, term + _AFTER)).fetchall()
+        rows: List[tuple] = []
+        ids = list(candidates)
+        for start in range(0, len(ids), CHUNK):
+            chunk = ids[start:start + CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows.extend(self.connection.execute(
+                f"{columns} WHERE task_id IN ({marks}) AND {where}", (*chunk, term, term + _AFTER),
+            ))
+        return rows
+
+    def _docs_by_id(self, ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        docs: Dict[str, Tuple[str, str]] = {}
+        for start in range(0, len(ids), CHUNK):
+            chunk = ids[start:start + CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for task_id, title, status in self.connection.execute(
+                f"SELECT task_id, title, status FROM docs WHERE task_id IN ({marks})", chunk,
+            ):
+                docs[task_id] = (title, status)
+        return docs
+
+
+class SearchUpdater:
+    """
+    Write listener (TaskStore.write_listeners) that applies each written change to a
+    search index, as long as the index was current before the write.
+
+    An index that was already out of date is left alone, and one that fails to update
+    keeps its old version, so in both cases the next search rebuilds it. After a write
+    that was merged with another writer's (changes is None) the updater stops applying
+    changes, since it no longer knows the version the index should have.
+    """
+    def __init__(self, path: Union[str, Path], version: Callable[[], Optional[str]]) -> None:
+        """
+        Args:
+            path (str | Path): Path to the index file.
+            version (Callable[[], Optional[str]]): Returns the store's current version
+                (StorageBackend.version).
+        """
+        self.path = Path(path)
+        self._version = version
+        self.expected = version()
+
+    def __call__(self, changes: Optional[List[Change]]) -> None:
+        current = self._version()
+        if changes is None:
+            self.expected = None
+            return
+        try:
+            with SearchIndex(self.path) as index:
+                if self.expected is not None and index.version == self.expected:
+                    index.apply(changes, current)
+        except sqlite3.Error:
+            # Reason: the tasks are already saved; a stale index is rebuilt on the next
+            # search, so failing the command here would only lose the user's output.
+            pass
+        if self.expected is not None:
+            self.expected = current
+
+
+def search(
+    path: Union[str, Path],
+    version: Optional[str],
+    load_tasks: Callable[[], Iterable[Task]],
+    query: str,
+    status: Optional[TaskStatus] = None,
+    limit: Optional[int] = 20,
+    rebuild: bool = False,
+) -> List[SearchHit]:
+    """
+    Answers a query from the index at path, rebuilding it first if it is out of date.
+    Args:
+        path (str | Path): Path to the index file.
+        version (Optional[str]): The store's current version; None always rebuilds.
+        load_tasks (Callable[[], Iterable[Task]]): Returns every task, for a rebuild.
+        query (str): The search terms.
+        status (Optional[TaskStatus]): Only return tasks with this status.
+        limit (Optional[int]): How many results to return.
+        rebuild (bool): Rebuild even if the index looks current.
+    Returns:
+        List[SearchHit]: The matching tasks, highest score first.
+    """
+    with SearchIndex(path) as index:
+        if rebuild or version is None or index.version != version:
+            index.rebuild(load_tasks(), version)
+        return index.search(query, status=status, limit=limit)
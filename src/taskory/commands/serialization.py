@@ -0,0 +1,194 @@
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Union
+from uuid import UUID
+from pydantic import TypeAdapter
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.locking import atomic_write
+
+
+def serialize_task(task: Task) -> dict:
+    """
+    Serializes a Task object to a dict suitable for JSON.
+    Args:
+        task (Task): The task to serialize.
+    Returns:
+        dict: The serialized task.
+    """
+    return {
+        'id': str(task.id),
+        'title': task.title,
+        'status': task.status.value if isinstance(task.status, Enum) else str(task.status),
+        'created_at': task.created_at.isoformat(),
+        'updated_at': task.updated_at.isoformat(),
+        'priority': int(task.priority) if task.priority is not None else None,
+        'assignee': task.assignee,
+        'tags': task.tags,
+        'depends_on': [str(dep) for dep in task.depends_on] if task.depends_on is not None else None,
+    }
+
+
+def deserialize_task(data: dict) -> Task:
+    """
+    Deserializes a dict into a Task object.
+    Args:
+        data (dict): The task data.
+    Returns:
+        Task: The deserialized Task object.
+    """
+    return Task(
+        id=UUID(data['id']),
+        title=data['title'],
+        status=TaskStatus(data['status']),
+        created_at=datetime.fromisoformat(data['created_at']),
+        updated_at=datetime.fromisoformat(data['updated_at']),
+        priority=TaskPriority(data['priority']) if data.get('priority') is not None else None,
+        assignee=data.get('assignee'),
+        tags=data.get('tags'),
+        depends_on=[UUID(dep) for dep in data['depends_on']] if data.get('depends_on') is not None else None,
+    )
+
+
+def deserialize_tasks_strict(raw: bytes) -> List[Task]:
+    """
+    Deserializes a JSON task list record by record, for hand-edited files.
+
+    Every record goes through deserialize_task, and errors name the offending record.
+    Args:
+        raw (bytes): The JSON document.
+    Returns:
+        List[Task]: The deserialized tasks.
+    Raises:
+        ValueError: If a record is missing fields or holds invalid values.
+    """
+    tasks = []
+    for position, item in enumerate(json.loads(raw)):
+        try:
+            tasks.append(deserialize_task(item))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid task at index {position}: {e!r}") from e
+    return tasks
+
+
+@lru_cache(maxsize=1)
+def _task_list_adapter():
+    # Reason: building the adapter compiles a pydantic-core schema, so it is done once
+    # and only when a trusted load actually happens.
+    return TypeAdapter(List[Task])
+
+
+def deserialize_tasks_trusted(raw: bytes) -> List[Task]:
+    """
+    Deserializes a JSON task list in one bulk pydantic-core pass.
+
+    JSON parsing and model validation both run in pydantic-core instead of building
+    UUIDs, datetimes and enums per record in Python, which is roughly twice as fast
+    on large stores. Use it for files written by TaskStore.
+    Args:
+        raw (bytes): The JSON document.
+    Returns:
+        List[Task]: The deserialized tasks.
+    """
+    return _task_list_adapter().validate_json(raw)
+
+
+def validate_tasks(records: List[dict]) -> List[Task]:
+    """
+    Validates task records (e.g. generated ones) in one bulk pydantic-core pass.
+    Args:
+        records (List[dict]): The task fields; missing ones get their defaults.
+    Returns:
+        List[Task]: The validated tasks.
+    Raises:
+        ValueError: If any record is invalid (pydantic's ValidationError).
+    """
+    return _task_list_adapter().validate_python(records)
+
+
+def stamp_path_for(path: Union[str, Path]) -> Path:
+    """
+    Returns the path of the stamp recording that TaskStore wrote a file.
+    Args:
+        path (str | Path): Path to the JSON snapshot.
+    Returns:
+        Path: The stamp path (e.g. .taskory/tasks.json.stamp).
+    """
+    path = Path(path)
+    return path.with_name(path.name + ".stamp")
+
+
+def _fingerprint(path: Union[str, Path]) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_stamp(path: Union[str, Path]) -> dict:
+    try:
+        with open(stamp_path_for(path), "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+        return stamp if isinstance(stamp, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def write_stamp(path: Union[str, Path], generation: int = 0) -> None:
+    """
+    Records the size and modification time of a file TaskStore has just written.
+    Args:
+        path (str | Path): Path to the JSON snapshot.
+        generation (int): The snapshot's generation, counted up by every snapshot write.
+    """
+    stamp = dict(_fingerprint(path), generation=generation)
+    atomic_write(stamp_path_for(path), json.dumps(stamp))
+
+
+def read_generation(path: Union[str, Path]) -> int:
+    """
+    Returns the generation recorded in a snapshot's stamp.
+    Args:
+        path (str | Path): Path to the JSON snapshot.
+    Returns:
+        int: The generation, or 0 if the snapshot has no stamp.
+    """
+    return int(_read_stamp(path).get("generation", 0))
+
+
+def written_by_store(path: Union[str, Path]) -> bool:
+    """
+    Checks whether a file is unchanged since TaskStore last wrote it.
+
+    A file edited by hand (or by another tool) no longer matches its stamp and
+    should be loaded in strict mode.
+    Args:
+        path (str | Path): Path to the JSON snapshot.
+    Returns:
+        bool: True if the file matches the stamp written with it.
+    """
+    stamp = _read_stamp(path)
+    try:
+        fingerprint = _fingerprint(path)
+    except OSError:
+        return False
+    return all(stamp.get(key) == value for key, value in fingerprint.items())
+
+
+def read_task_records(path: Union[str, Path]) -> List[dict]:
+    """
+    Reads the task objects of an import file.
+    Args:
+        path (str | Path): A JSON array of task objects, or one task object per line.
+    Returns:
+        List[dict]: The task objects, not yet validated.
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
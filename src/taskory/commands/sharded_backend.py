@@ -0,0 +1,192 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, List, Optional, Tuple, Union
+from uuid import UUID
+from taskory.schemas import Task
+from taskory.commands.locking import FileLock, atomic_write, lock_path_for
+from taskory.commands.serialization import serialize_task, deserialize_tasks_strict, deserialize_tasks_trusted
+from taskory.commands.storage import Change, StaleStoreError, StorageBackend
+from taskory.commands.tracing import span
+
+SHARDS_DIR = "shards"
+MANIFEST_FILE = "manifest.json"
+FORMAT = 1
+# Hex digits of the task id that pick its shard: 2 gives 256 shards.
+DEFAULT_PREFIX_LENGTH = 2
+# Largest number of shards read at once.
+MAX_WORKERS = 8
+
+
+class ShardedBackend(StorageBackend):
+    """
+    Stores tasks in many small JSON files (shards) under .taskory/shards, chosen by the
+    first hex digits of each task's id, so that a write rewrites only the shards holding
+    the changed or deleted tasks.
+
+    manifest.json records a generation number, bumped by every write, and the size and
+    modification time of each shard as last written. Shards that still match are loaded
+    with the bulk fast path; others (edited by hand) are checked record by record. Loads
+    and writes hold the lock on .taskory/tasks.lock, and write raises StaleStoreError
+    when another process wrote since this backend last loaded or wrote.
+
+    Shards are read by a thread pool. Reading overlaps, but decoding holds the GIL, so
+    parallel loading mainly helps when the files are not in the page cache.
+    """
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix_length: int = DEFAULT_PREFIX_LENGTH,
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes the backend.
+        Args:
+            directory (str | Path): The .taskory directory; shards live in its shards/ folder.
+            prefix_length (int): Id hex digits per shard name, for a new store. An
+                existing store keeps the length in its manifest.
+            workers (Optional[int]): Threads used to read shards (default: up to
+                MAX_WORKERS, one per CPU).
+        """
+        self.directory = Path(directory) / SHARDS_DIR
+        self.manifest_path = self.directory / MANIFEST_FILE
+        self.lock = FileLock(lock_path_for(Path(directory) / "tasks.json"))
+        self.workers = workers or min(MAX_WORKERS, os.cpu_count() or 1)
+        manifest = self._read_manifest()
+        self.prefix_length = manifest.get("prefix_length", prefix_length)
+        self._generation = manifest.get("generation", 0)
+        # Task ids per shard, in store order; dict keys keep the order of insertion.
+        self._members: Dict[str, Dict[UUID, None]] = {}
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _shard(self, task_id: UUID) -> str:
+        return task_id.hex[:self.prefix_length]
+
+    def shard_path(self, shard: str) -> Path:
+        """
+        Returns the file of a shard.
+        Args:
+            shard (str): The shard name (an id prefix).
+        Returns:
+            Path: The shard's JSON file.
+        """
+        return self.directory / f"{shard}.json"
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def locked(self) -> ContextManager:
+        return self.lock
+
+    def version(self) -> Optional[str]:
+        return f"sharded:{self._read_manifest().get('generation', 0)}"
+
+    def load(self) -> List[Task]:
+        """
+        Loads every shard, several at a time.
+
+        Returns:
+            List[Task]: The tasks, oldest first (by created_at).
+        """
+        with self.lock:
+            manifest = self._read_manifest()
+            recorded = manifest.get("shards", {})
+            names = sorted(path.stem for path in self.directory.glob("*.json") if path.name != MANIFEST_FILE)
+            with span("read_shards") as phase:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    shards = list(pool.map(lambda name: self._read_shard(name, recorded.get(name)), names))
+                for _, tasks, size in shards:
+                    phase.add(records=len(tasks), bytes_read=size)
+            self._generation = manifest.get("generation", 0)
+        self._members = {name: dict.fromkeys(task.id for task in tasks) for name, tasks, _ in shards}
+        # Reason: shards split the store by id, so the tasks are put back in creation
+        # order; the sort is stable, so tasks created at the same time keep shard order.
+        merged = [task for _, tasks, _ in shards for task in tasks]
+        merged.sort(key=lambda task: task.created_at.timestamp())
+        return merged
+
+    def _read_shard(self, name: str, recorded: Optional[List[int]]) -> Tuple[str, List[Task], int]:
+        # Runs on a pool thread: reads and decodes one shard.
+        path = self.shard_path(name)
+        with open(path, "rb") as f:
+            raw = f.read()
+        stat = os.stat(path)
+        trusted = recorded == [stat.st_size, stat.st_mtime_ns]
+        try:
+            tasks = deserialize_tasks_trusted(raw) if trusted else deserialize_tasks_strict(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid shard {path}: {e}") from e
+        return name, tasks, len(raw)
+
+    def mark_current(self, tasks: Dict[UUID, Task]) -> None:
+        with self.lock:
+            self._generation = self._read_manifest().get("generation", 0)
+        self._members = {}
+        for task_id in tasks:
+            self._members.setdefault(self._shard(task_id), {})[task_id] = None
+
+    def write(self, tasks: Dict[UUID, Task], changes: List[Change]) -> None:
+        with self.lock:
+            manifest = self._read_manifest()
+            if manifest.get("generation", 0) != self._generation:
+                raise StaleStoreError(f"{self.directory} was changed by another process.")
+            dirty = set()
+            for _, task_id, task in changes:
+                shard = self._shard(task_id)
+                members = self._members.setdefault(shard, {})
+                if task is None:
+                    members.pop(task_id, None)
+                else:
+                    members[task_id] = None
+                dirty.add(shard)
+            self._write_shards(tasks, dirty, manifest)
+
+    def _write_shards(self, tasks: Dict[UUID, Task], dirty: Iterable[str], manifest: dict) -> None:
+        """
+        Rewrites the given shards from their members, then the manifest.
+        Args:
+            tasks (Dict[UUID, Task]): Every task in the store.
+            dirty (Iterable[str]): Names of the shards to rewrite.
+            manifest (dict): The manifest as last read, updated and written back.
+        """
+        recorded = manifest.get("shards", {})
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with span("write_shards") as phase:
+            for shard in sorted(dirty):
+                path = self.shard_path(shard)
+                members = self._members.get(shard)
+                if not members:
+                    self._members.pop(shard, None)
+                    recorded.pop(shard, None)
+                    if path.exists():
+                        os.remove(path)
+                    continue
+                data = json.dumps([serialize_task(tasks[task_id]) for task_id in members], separators=(",", ":"))
+                atomic_write(path, data)
+                stat = os.stat(path)
+                recorded[shard] = [stat.st_size, stat.st_mtime_ns]
+                phase.add(records=len(members), bytes_written=stat.st_size)
+        self._generation = manifest.get("generation", 0) + 1
+        atomic_write(self.manifest_path, json.dumps({
+            "format": FORMAT,
+            "prefix_length": self.prefix_length,
+            "generation": self._generation,
+            "shards": recorded,
+        }))
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        tasks = {task.id: task for task in tasks}
+        with self.lock:
+            manifest = self._read_manifest()
+            stale = {path.stem for path in self.directory.glob("*.json") if path.name != MANIFEST_FILE}
+            self._members = {}
+            for task_id in tasks:
+                self._members.setdefault(self._shard(task_id), {})[task_id] = None
+            self._write_shards(tasks, stale | set(self._members), manifest)
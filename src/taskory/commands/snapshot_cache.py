@@ -0,0 +1,110 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from taskory.schemas import Task
+from taskory.commands.locking import atomic_write, evict_least_recent
+from taskory.commands.task_table import TaskTable, TaskValues
+
+CACHE_DIR = "cache"
+SUFFIX = ".snap"
+# Total size of the entries in one cache directory; the least recently used entries
+# are removed past it.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(raw: bytes, stat: os.stat_result) -> str:
+    """
+    Names the cache entry for the contents of a tasks.json file.
+    Args:
+        raw (bytes): The file's contents.
+        stat (os.stat_result): The file's status, taken when it was read.
+    Returns:
+        str: The entry name: content hash, size and modification time.
+    """
+    digest = hashlib.blake2b(raw, digest_size=20).hexdigest()
+    return f"{digest}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+class SnapshotCache:
+    """
+    Directory of validated task snapshots (.taskory/cache/), one per tasks.json state.
+
+    An entry holds the tasks of one version of tasks.json as an encoded TaskTable, so a
+    hit loads the store's columns directly: no JSON is parsed, no record is validated and
+    no Task object is built. Entries are named after the size, mtime and content hash of
+    the JSON they were decoded from, so any change to the file misses and old entries are
+    never read again; they are removed, least recently used first, once the directory
+    outgrows max_bytes. Several stores may share one cache directory.
+    """
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Args:
+            directory (str | Path): The cache directory (created on first write).
+            max_bytes (int): Size past which the least recently used entries are removed.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def get(self, raw: bytes, stat: os.stat_result) -> Optional[TaskTable]:
+        """
+        Loads the tasks cached for a tasks.json state.
+        Args:
+            raw (bytes): The file's contents.
+            stat (os.stat_result): The file's status, taken when it was read.
+        Returns:
+            Optional[TaskTable]: The tasks, in file order, or None on a miss.
+        """
+        path = self._path(cache_key(raw, stat))
+        try:
+            with open(path, "rb") as f:
+                table = TaskTable.from_bytes(f.read())
+            # Reason: the modification time records the last use, for eviction.
+            os.utime(path)
+        except OSError:
+            return None
+        except ValueError:
+            # A damaged entry is dropped and rebuilt from the JSON.
+            self._remove(path)
+            return None
+        return table
+
+    def put(self, raw: bytes, stat: os.stat_result, tasks: Union[TaskTable, Iterable[Task]]) -> None:
+        """
+        Caches the tasks decoded from a tasks.json state, then evicts old entries.
+
+        A cache that cannot be written is skipped: the tasks are already loaded or saved.
+        Args:
+            raw (bytes): The file's contents.
+            stat (os.stat_result): The file's status, taken when it was read or written.
+            tasks (TaskTable | Iterable[Task]): The validated tasks, in file order.
+        """
+        if isinstance(tasks, TaskValues):
+            # Reason: a store's table view is encoded from its columns, as they are.
+            tasks = tasks.table
+        table = tasks if isinstance(tasks, TaskTable) else TaskTable.from_tasks(tasks)
+        path = self._path(cache_key(raw, stat))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, table.to_bytes())
+        except OSError:
+            return
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """
+        Removes the least recently used entries until the directory fits max_bytes.
+        Args:
+            keep (Optional[Path]): An entry that is never removed (the one just written).
+        """
+        evict_least_recent(self.directory, f"*{SUFFIX}", self.max_bytes, keep)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,194 @@
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+from taskory.schemas import Task
+
+SORT_FIELDS = ("priority", "created_at", "updated_at")
+
+# A sort entry: the task's sort key with its id as the final tie-breaker, so that every
+# entry is unique and the order is total. Cursors point between two entries.
+Entry = Tuple[Tuple, UUID]
+
+
+class TaskPage(NamedTuple):
+    """
+    One page of a sorted listing.
+    """
+    tasks: List[Task]
+    # Pass to the next call to continue after the last task; None on the last page.
+    cursor: Optional[str]
+
+
+def priority_key(task: Task) -> Tuple[int, float]:
+    """
+    Sort key that puts higher priority first (no priority ranks below low), then
+    oldest first. timestamp() also orders naive and aware datetimes against each other.
+    Args:
+        task (Task): The task.
+    Returns:
+        Tuple[int, float]: The key.
+    """
+    return -(int(task.priority) if task.priority is not None else 0), task.created_at.timestamp()
+
+
+def sort_key(task: Task, sort_by: str) -> Tuple:
+    """
+    Computes the key of a task for one of SORT_FIELDS.
+    Args:
+        task (Task): The task.
+        sort_by (str): "priority", "created_at" or "updated_at".
+    Returns:
+        Tuple: The key; smaller keys come first.
+    """
+    if sort_by == "priority":
+        return priority_key(task)
+    return (getattr(task, sort_by).timestamp(),)
+
+
+def check_sort(sort_by: str, limit: Optional[int]) -> None:
+    """
+    Validates the sort field and page size of a sorted query.
+    Raises:
+        ValueError: If the field is unknown or the limit is not positive.
+    """
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort field: {sort_by} (choose from {', '.join(SORT_FIELDS)})")
+    if limit is not None and limit < 1:
+        raise ValueError("The limit must be at least 1.")
+
+
+def encode_cursor(sort_by: str, reverse: bool, entry: Entry) -> str:
+    """
+    Turns the last entry of a page into an opaque cursor string.
+    """
+    key, task_id = entry
+    raw = json.dumps([sort_by, reverse, list(key), task_id.hex], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, reverse: bool) -> Entry:
+    """
+    Reads a cursor made by encode_cursor for the same sort order.
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort order.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_reverse, key, task_hex = json.loads(raw)
+        entry = (tuple(key), UUID(hex=task_hex))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if (cursor_sort, cursor_reverse) != (sort_by, reverse):
+        raise ValueError("The cursor belongs to a listing with another sort order.")
+    return entry
+
+
+def select(entries: Iterable[Entry], limit: Optional[int], after: Optional[Entry] = None,
+           reverse: bool = False) -> List[Entry]:
+    """
+    Picks the first `limit` entries in sort order that come after a cursor position.
+
+    Uses a bounded heap, so n entries cost O(n log limit) time and O(limit) memory
+    instead of a full sort.
+    Args:
+        entries (Iterable[Entry]): Unordered entries. They may carry a payload after the
+            id, such as the task itself; ids are unique, so it is never compared.
+        limit (Optional[int]): How many to keep; None keeps them all (a full sort).
+        after (Optional[Entry]): Only keep entries past this one.
+        reverse (bool): Largest keys first.
+    Returns:
+        List[Entry]: The selected entries, in order.
+    """
+    if after is not None:
+        entries = (entry for entry in entries if (entry[:2] < after if reverse else entry[:2] > after))
+    if limit is None:
+        return sorted(entries, reverse=reverse)
+    return heapq.nlargest(limit, entries) if reverse else heapq.nsmallest(limit, entries)
+
+
+def make_page(entries: List[Entry], limit: Optional[int], sort_by: str, reverse: bool,
+              tasks: Dict[UUID, Task]) -> TaskPage:
+    """
+    Builds a page from up to limit + 1 selected entries; the extra one only tells
+    whether another page follows.
+    Args:
+        entries (List[Entry]): The selected entries, in order.
+        limit (Optional[int]): The page size.
+        sort_by (str): The sort field, recorded in the cursor.
+        reverse (bool): The sort direction, recorded in the cursor.
+        tasks (Dict[UUID, Task]): Lookup for the tasks of the entries.
+    Returns:
+        TaskPage: The page.
+    """
+    cursor = None
+    if limit is not None and len(entries) > limit:
+        entries = entries[:limit]
+        cursor = encode_cursor(sort_by, reverse, entries[-1][:2])
+    return TaskPage([tasks[entry[1]] for entry in entries], cursor)
+
+
+class SortedIndex:
+    """
+    The tasks of a store in the order of one sort field, kept up to date on every change.
+
+    Entries live in a plain list ordered with bisect, so a page or the top k tasks are a
+    slice away and a change costs one binary search plus a list insert or delete.
+    """
+    def __init__(self, sort_by: str, tasks: Iterable[Task] = ()) -> None:
+        """
+        Builds the index with one sort over the given tasks.
+        Args:
+            sort_by (str): One of SORT_FIELDS.
+            tasks (Iterable[Task]): The tasks to index.
+        """
+        self.sort_by = sort_by
+        self._keys: Dict[UUID, Entry] = {task.id: (sort_key(task, sort_by), task.id) for task in tasks}
+        self._entries: List[Entry] = sorted(self._keys.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, task_id: UUID) -> Entry:
+        """
+        Returns the entry of an indexed task.
+        """
+        return self._keys[task_id]
+
+    def add(self, task: Task) -> None:
+        """
+        Indexes a task under its current field values.
+        Args:
+            task (Task): The task to index.
+        """
+        entry = (sort_key(task, self.sort_by), task.id)
+        self._keys[task.id] = entry
+        insort(self._entries, entry)
+
+    def remove(self, task_id: UUID) -> None:
+        """
+        Removes a task, using the entry it was indexed under.
+        Args:
+            task_id (UUID): The task to unindex.
+        """
+        entry = self._keys.pop(task_id, None)
+        if entry is not None:
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def iter_from(self, after: Optional[Entry] = None, reverse: bool = False) -> Iterator[Entry]:
+        """
+        Walks the entries in order, starting past a cursor position.
+        Args:
+            after (Optional[Entry]): Start after this entry; None starts at the beginning.
+            reverse (bool): Walk from the largest key down.
+        Returns:
+            Iterator[Entry]: The entries.
+        """
+        entries = self._entries
+        if reverse:
+            stop = bisect_left(entries, after) if after is not None else len(entries)
+            return (entries[i] for i in range(stop - 1, -1, -1))
+        start = bisect_right(entries, after) if after is not None else 0
+        return (entries[i] for i in range(start, len(entries)))
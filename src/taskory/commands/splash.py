@@ -1,11 +1,13 @@
 import json
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.align import Align
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 def load_config(config_file: Path) -> dict:
-    config_file.parent.mkdir(parents=True, exist_ok=True)
+    # Reason: this runs before every command, so it only reads; the directory is
+    # created when the config is first saved.
     if config_file.exists():
         with open(config_file, "r", encoding="utf-8") as f:
             try:
@@ -19,7 +21,9 @@ def save_config(cfg: dict, config_file: Path):
     with open(config_file, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2)
 
-def show_splash(console: Console):
+def show_splash(console: "Console"):
+    from rich.panel import Panel
+    from rich.align import Align
     ascii_art = '''
 [#65007a bold]████████  █████  ███████ ██   ██  ██████  ██████  ██    ██     █████  ██ 
    ██    ██   ██ ██      ██  ██  ██    ██ ██   ██  ██  ██     ██   ██ ██ 
@@ -40,7 +44,7 @@ def show_splash(console: Console):
     )
     console.print(splash_text)
 
-def maybe_show_splash(console: Console, config_file: Path):
+def maybe_show_splash(console: "Console", config_file: Path):
     cfg = load_config(config_file)
     if not cfg.get("splash_shown", False):
         show_splash(console)
@@ -0,0 +1,223 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.serialization import serialize_task, deserialize_task
+from taskory.commands.storage import StorageBackend, Change
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER,
+    assignee TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    has_tags INTEGER NOT NULL DEFAULT 0,
+    depends_on TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag);
+"""
+
+# Reason: ON CONFLICT ... DO UPDATE keeps the row's seq, so an updated task keeps its
+# place in store order (INSERT OR REPLACE would move it to the end).
+UPSERT = """
+INSERT INTO tasks (id, title, status, priority, assignee, created_at, updated_at, has_tags, depends_on)
+VALUES (:id, :title, :status, :priority, :assignee, :created_at, :updated_at, :has_tags, :depends_on)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    status = excluded.status,
+    priority = excluded.priority,
+    assignee = excluded.assignee,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    has_tags = excluded.has_tags,
+    depends_on = excluded.depends_on
+"""
+
+COLUMNS = "t.id, t.title, t.status, t.priority, t.assignee, t.created_at, t.updated_at, t.has_tags, t.depends_on"
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Stores tasks in an embedded SQLite database with indexed columns and a tag table.
+
+    Writes touch only the rows of changed tasks, and query_tasks answers filtered
+    lookups from the indexes without loading the whole store.
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Opens (or creates) the database.
+        Args:
+            path (str | Path): Path to the SQLite file (e.g. .taskory/tasks.db).
+        """
+        self.path = Path(path)
+        self._existed = self.path.exists()
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        if "depends_on" not in columns:
+            # Databases created before tasks had dependencies.
+            self.connection.execute("ALTER TABLE tasks ADD COLUMN depends_on TEXT")
+
+    def exists(self) -> bool:
+        return self._existed
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+    @staticmethod
+    def _row(task: Task) -> dict:
+        row = serialize_task(task)
+        row["has_tags"] = 0 if task.tags is None else 1
+        # Reason: dependencies are only read back with their task, so a JSON list is
+        # enough; they do not need a table of their own like tags.
+        row["depends_on"] = json.dumps(row["depends_on"]) if row["depends_on"] is not None else None
+        return row
+
+    def _tags_by_task(self, ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        tags: Dict[str, List[str]] = {}
+        if ids is None:
+            batches = [("SELECT task_id, tag FROM task_tags ORDER BY task_id, position", [])]
+        else:
+            # Reason: SQLite caps the number of bound parameters per statement.
+            batches = [
+                (
+                    f"SELECT task_id, tag FROM task_tags WHERE task_id IN ({','.join('?' * len(chunk))})"
+                    " ORDER BY task_id, position",
+                    chunk,
+                )
+                for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))
+            ]
+        for query, params in batches:
+            for task_id, tag in self.connection.execute(query, params):
+                tags.setdefault(task_id, []).append(tag)
+        return tags
+
+    def _tasks_from_rows(self, rows: List[tuple], tags: Dict[str, List[str]]) -> List[Task]:
+        tasks = []
+        for task_id, title, status, priority, assignee, created_at, updated_at, has_tags, depends_on in rows:
+            tasks.append(deserialize_task({
+                "id": task_id,
+                "title": title,
+                "status": status,
+                "priority": priority,
+                "assignee": assignee,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "tags": tags.get(task_id, []) if has_tags else None,
+                "depends_on": json.loads(depends_on) if depends_on is not None else None,
+            }))
+        return tasks
+
+    def load(self) -> List[Task]:
+        rows = self.connection.execute(f"SELECT {COLUMNS} FROM tasks t ORDER BY t.seq").fetchall()
+        return self._tasks_from_rows(rows, self._tags_by_task())
+
+    def _apply(self, changes: Iterable[Change]) -> None:
+        for op, task_id, task in changes:
+            key = str(task_id)
+            if task is None:
+                self.connection.execute("DELETE FROM tasks WHERE id = ?", (key,))
+                continue
+            self.connection.execute(UPSERT, self._row(task))
+            self.connection.execute("DELETE FROM task_tags WHERE task_id = ?", (key,))
+            self.connection.executemany(
+                "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)",
+                [(key, position, tag) for position, tag in enumerate(task.tags or ())],
+            )
+
+    def _bump_version(self) -> None:
+        # Reason: user_version lives in the database header and is written in the same
+        # transaction as the changes, so it counts committed writes.
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        self.connection.execute(f"PRAGMA user_version = {version + 1}")
+
+    def write(self, tasks: Dict[UUID, Task], changes: List[Change]) -> None:
+        with self.connection:
+            self._apply(changes)
+            self._bump_version()
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self._apply(("add", task.id, task) for task in tasks)
+            self._bump_version()
+        self._existed = True
+
+    def version(self) -> Optional[str]:
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        return f"sqlite:{version}"
+
+    def query_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[TaskPriority] = None,
+        max_priority: Optional[TaskPriority] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """
+        Answers a filtered lookup with SQL, using the column and tag indexes.
+
+        Args:
+            status (Optional[TaskStatus]): Status to filter by.
+            assignee (Optional[str]): Assignee to filter by.
+            tags (Optional[Iterable[str]]): Tags that must all be present on the task.
+            priority (Optional[TaskPriority]): Exact priority to filter by.
+            min_priority (Optional[TaskPriority]): Lowest priority to include (inclusive).
+            max_priority (Optional[TaskPriority]): Highest priority to include (inclusive).
+            limit (Optional[int]): Maximum number of tasks to return.
+
+        Returns:
+            List[Task]: Matching tasks, in store order.
+        """
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("t.status = ?")
+            params.append(TaskStatus(status).value)
+        if assignee is not None:
+            clauses.append("t.assignee = ?")
+            params.append(assignee)
+        if priority is not None:
+            clauses.append("t.priority = ?")
+            params.append(int(priority))
+        if min_priority is not None:
+            clauses.append("t.priority >= ?")
+            params.append(int(min_priority))
+        if max_priority is not None:
+            clauses.append("t.priority <= ?")
+            params.append(int(max_priority))
+        for tag in tags or ():
+            clauses.append("EXISTS (SELECT 1 FROM task_tags g WHERE g.task_id = t.id AND g.tag = ?)")
+            params.append(tag)
+        query = f"SELECT {COLUMNS} FROM tasks t"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY t.seq"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.connection.execute(query, params).fetchall()
+        return self._tasks_from_rows(rows, self._tags_by_task([row[0] for row in rows]))
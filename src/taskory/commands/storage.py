@@ -0,0 +1,396 @@
+import json
+import os
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Collection, ContextManager, Dict, Iterable, List, MutableMapping, Optional, Tuple, Union
+from uuid import UUID
+from taskory.schemas import Task
+from taskory.commands.journal import TaskJournal, journal_path_for, DEFAULT_COMPACT_THRESHOLD
+from taskory.commands.serialization import (
+    serialize_task,
+    deserialize_task,
+    deserialize_tasks_strict,
+    deserialize_tasks_trusted,
+    write_stamp,
+    read_generation,
+)
+from taskory.commands.locking import FileLock, atomic_write, lock_path_for
+from taskory.commands.tracing import span
+from taskory.commands.binary_snapshot import (
+    binary_path_for,
+    binary_is_current,
+    read_binary_snapshot,
+    write_binary_snapshot,
+)
+from taskory.commands.snapshot_cache import SnapshotCache
+from taskory.commands.task_table import TaskTable
+
+# A single mutation: ("add" | "update" | "delete", task id, task after the change or None).
+Change = Tuple[str, UUID, Optional[Task]]
+
+BACKENDS = ("json", "sqlite", "sharded")
+
+
+class StaleStoreError(RuntimeError):
+    """
+    Raised by StorageBackend.write when another process changed the storage since this
+    backend last loaded or wrote it.
+    """
+
+
+class StorageBackend:
+    """
+    Persistence interface that TaskStore delegates to.
+
+    TaskStore keeps every task in memory and hands each committed set of changes to
+    write(). Backends that can write rows individually only look at the changes;
+    document-style backends rewrite everything from the task map.
+    """
+    def exists(self) -> bool:
+        """
+        Checks whether the backend already holds stored tasks.
+
+        Returns:
+            bool: True if there is something to load.
+        """
+        raise NotImplementedError
+
+    def load(self) -> List[Task]:
+        """
+        Loads every stored task.
+
+        Returns:
+            List[Task]: The tasks, in store order.
+        """
+        raise NotImplementedError
+
+    def load_table(self) -> Optional[TaskTable]:
+        """
+        Loads every stored task straight into a TaskTable, for backends that can do so
+        without building each Task (JsonBackend with a SnapshotCache).
+
+        Returns:
+            Optional[TaskTable]: The tasks, or None if the backend only supports load().
+        """
+        return None
+
+    def write(self, tasks: Dict[UUID, Task], changes: List[Change]) -> None:
+        """
+        Persists a set of committed changes.
+
+        Args:
+            tasks (Dict[UUID, Task]): Every task in the store after the changes.
+            changes (List[Change]): The changes since the last write, latest state per task.
+        """
+        raise NotImplementedError
+
+    def version(self) -> Optional[str]:
+        """
+        Identifies the current state of the storage, so that data derived from it (such
+        as the search index) can tell whether it is still current.
+
+        Returns:
+            Optional[str]: A value that changes with every write, or None if the
+                backend cannot tell.
+        """
+        return None
+
+    def mark_current(self, tasks: Dict[UUID, Task]) -> None:
+        """
+        Takes the storage as it is now for the state this backend last loaded, once the
+        caller has brought its tasks in line with it by other means (see
+        FeedFollower.catch_up), so the next write is not refused as stale.
+        Args:
+            tasks (Dict[UUID, Task]): The tasks now stored.
+        """
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        """
+        Replaces the stored tasks with the given ones (used by migrations).
+
+        Args:
+            tasks (Iterable[Task]): The tasks to store.
+        """
+        raise NotImplementedError
+
+    def locked(self) -> ContextManager:
+        """
+        Returns a context manager that keeps other processes from writing the storage.
+
+        Backends whose storage does its own locking (SQLite) return a no-op.
+
+        Returns:
+            ContextManager: The lock, held while the with block runs.
+        """
+        return nullcontext()
+
+
+class JsonBackend(StorageBackend):
+    """
+    Stores tasks as a JSON document (tasks.json), optionally with an append-only journal
+    and a binary snapshot (tasks.bin) that is loaded instead of the JSON while it is current.
+    With a SnapshotCache, tasks read from or written to the JSON file are also cached in
+    validated form, so loading an unchanged file skips parsing and validation.
+
+    Files are replaced atomically, and loads and writes hold an advisory lock on
+    tasks.lock. The backend remembers the version of the files it last saw (stamp
+    generation, JSON size and mtime, journal size); write raises StaleStoreError
+    instead of overwriting changes another process made since then.
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        journal: bool = False,
+        trusted: bool = False,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        binary: bool = False,
+        cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        """
+        Initializes the backend.
+        Args:
+            path (str | Path): Path to the JSON file.
+            journal (bool): Append changes to a journal next to the file instead of rewriting it.
+            trusted (bool): Load the file with the bulk fast path (for files TaskStore wrote).
+            compact_threshold (int): Journal size in bytes that triggers compaction.
+            binary (bool): Also write a binary snapshot, and load it while it is not older
+                than the JSON file.
+            cache (Optional[SnapshotCache]): Cache of the validated tasks of each JSON
+                file state.
+        """
+        self.path = Path(path)
+        self.trusted = trusted
+        self.cache = cache
+        self.binary_path: Optional[Path] = binary_path_for(self.path) if binary else None
+        self.journal: Optional[TaskJournal] = None
+        self.lock = FileLock(lock_path_for(self.path))
+        if journal:
+            self.enable_journal(compact_threshold)
+        self._version = self._current_version()
+
+    def _current_version(self) -> tuple:
+        """
+        Identifies the state of the files on disk.
+
+        The journal is append-only between snapshots, so its size tells journal writes
+        apart; the JSON fingerprint catches edits made without TaskStore.
+        Returns:
+            tuple: (stamp generation, JSON size and mtime, journal size).
+        """
+        try:
+            stat = os.stat(self.path)
+            fingerprint = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            fingerprint = None
+        journal_size = self.journal.size() if self.journal is not None else 0
+        return read_generation(self.path), fingerprint, journal_size
+
+    def locked(self) -> ContextManager:
+        return self.lock
+
+    def version(self) -> Optional[str]:
+        return json.dumps(self._current_version())
+
+    def enable_journal(self, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD) -> None:
+        """
+        Switches to journaled writes.
+        Args:
+            compact_threshold (int): Journal size in bytes that triggers compaction.
+        """
+        self.journal = TaskJournal(journal_path_for(self.path), compact_threshold)
+        self._version = self._current_version()
+
+    def exists(self) -> bool:
+        return (
+            self.path.exists()
+            or (self.binary_path is not None and self.binary_path.exists())
+            or (self.journal is not None and self.journal.path.exists())
+        )
+
+    def load(self) -> List[Task]:
+        with self.lock:
+            tasks = self._read()
+            self._version = self._current_version()
+        return tasks
+
+    def _read(self) -> List[Task]:
+        tasks: Dict[UUID, Task] = {}
+        if self.binary_path is not None and binary_is_current(self.path, self.binary_path):
+            with span("read_binary") as phase:
+                tasks = {task.id: task for task in read_binary_snapshot(self.binary_path)}
+                phase.add(records=len(tasks), bytes_read=self.binary_path.stat().st_size)
+        elif self.path.exists():
+            raw, _ = self._read_json()
+            tasks = {task.id: task for task in self._deserialize(raw)}
+        self._replay_journal(tasks)
+        return list(tasks.values())
+
+    def load_table(self) -> Optional[TaskTable]:
+        # Reason: a current binary snapshot already loads without validation, so the
+        # cache only stands in for tasks.json.
+        if self.cache is None or (self.binary_path is not None and binary_is_current(self.path, self.binary_path)):
+            return None
+        with self.lock:
+            table = self._read_cached()
+            self._replay_journal(table)
+            self._version = self._current_version()
+        return table
+
+    def _read_cached(self) -> TaskTable:
+        # Loads tasks.json through the cache, filling the cache on a miss.
+        if not self.path.exists():
+            return TaskTable()
+        raw, stat = self._read_json()
+        with span("read_cache") as phase:
+            table = self.cache.get(raw, stat)
+            phase.add(records=len(table) if table is not None else 0)
+        if table is None:
+            table = TaskTable.from_tasks(self._deserialize(raw))
+            with span("write_cache"):
+                self.cache.put(raw, stat, table)
+        return table
+
+    def _read_json(self) -> Tuple[bytes, os.stat_result]:
+        with span("read") as phase:
+            with open(self.path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                raw = f.read()
+            phase.add(bytes_read=len(raw))
+        return raw, stat
+
+    def _deserialize(self, raw: bytes) -> List[Task]:
+        with span("deserialize_trusted" if self.trusted else "deserialize_strict") as phase:
+            loaded = deserialize_tasks_trusted(raw) if self.trusted else deserialize_tasks_strict(raw)
+            phase.add(records=len(loaded))
+        return loaded
+
+    def _replay_journal(self, tasks: MutableMapping[UUID, Task]) -> None:
+        # Applies the journaled changes on top of the tasks loaded from a snapshot.
+        if self.journal is None:
+            return
+        with span("journal_replay") as phase:
+            for op, task_id, task in self.journal_changes():
+                if task is None:
+                    tasks.pop(task_id, None)
+                else:
+                    tasks[task_id] = task
+                phase.add(records=1)
+
+    def journal_changes(self) -> Iterable[Change]:
+        """
+        Yields the changes recorded in the journal that are not yet in the JSON file.
+
+        Returns:
+            Iterable[Change]: The journaled changes, oldest first.
+        """
+        if self.journal is None:
+            return
+        # Reason: records carry full task state and deletes ignore missing ids, so a
+        # journal replayed over a snapshot that already contains it yields the same store.
+        for record in self.journal.replay():
+            task = deserialize_task(record["task"]) if record["op"] != "delete" else None
+            yield record["op"], UUID(record["id"]), task
+
+    def mark_current(self, tasks: Dict[UUID, Task]) -> None:
+        self._version = self._current_version()
+
+    def write(self, tasks: Dict[UUID, Task], changes: List[Change]) -> None:
+        with self.lock:
+            if self._current_version() != self._version:
+                raise StaleStoreError(f"{self.path} was changed by another process.")
+            if self.journal is None:
+                self.save_snapshot(tasks.values())
+                return
+            records = []
+            for op, task_id, task in changes:
+                record = {"op": op, "id": str(task_id)}
+                if task is not None:
+                    record["task"] = serialize_task(task)
+                records.append(record)
+            self.journal.append_many(records)
+            if self.journal.needs_compaction():
+                self.save_snapshot(tasks.values())
+            else:
+                self._version = self._current_version()
+
+    def save_snapshot(self, tasks: Iterable[Task], path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Writes every task to a JSON file, followed by the binary snapshot when enabled.
+        Args:
+            tasks (Iterable[Task]): The tasks to write.
+            path (Optional[str | Path]): Target file; defaults to the backend's file.
+        """
+        target = Path(path) if path is not None else self.path
+        # Reason: a view over a TaskStore's table builds each task as it is read, so it
+        # is iterated again for the binary snapshot instead of being copied into a list.
+        if not isinstance(tasks, Collection):
+            tasks = list(tasks)
+        with FileLock(lock_path_for(target)):
+            with span("serialize") as phase:
+                data = json.dumps([serialize_task(task) for task in tasks], indent=2)
+                phase.add(records=len(tasks))
+            with span("write") as phase:
+                generation = read_generation(target) + 1
+                raw = data.encode("utf-8")
+                atomic_write(target, raw)
+                write_stamp(target, generation)
+                phase.add(bytes_written=len(raw))
+            if self.cache is not None and target == self.path:
+                # Reason: the next load of this file, usually the next command, then
+                # finds it in the cache instead of parsing what was just written.
+                with span("write_cache"):
+                    self.cache.put(raw, os.stat(target), tasks)
+            if self.binary_path is not None:
+                # Reason: written after the JSON file, so it is never older than the JSON it
+                # matches and is the one loaded next time.
+                with span("write_binary") as phase:
+                    write_binary_snapshot(binary_path_for(target), tasks)
+                    phase.add(records=len(tasks), bytes_written=binary_path_for(target).stat().st_size)
+            if target == self.path:
+                if self.journal is not None:
+                    # The snapshot now holds every journaled mutation.
+                    self.journal.clear()
+                self._version = self._current_version()
+
+    def replace_all(self, tasks: Iterable[Task]) -> None:
+        with self.lock:
+            self.save_snapshot(tasks)
+            # Reason: a journal left over from earlier use of this file would otherwise be
+            # replayed on top of the replaced tasks.
+            TaskJournal(journal_path_for(self.path)).clear()
+            self._version = self._current_version()
+
+
+def open_backend(
+    kind: str,
+    directory: Union[str, Path],
+    journal: bool = False,
+    trusted: bool = False,
+    binary: bool = False,
+) -> StorageBackend:
+    """
+    Creates the backend configured for a .taskory directory.
+
+    Args:
+        kind (str): "json", "sqlite" or "sharded".
+        directory (str | Path): The .taskory directory.
+        journal (bool): Enable the journal (JSON backend only).
+        trusted (bool): Use the bulk load fast path (JSON backend only).
+        binary (bool): Keep a binary snapshot next to tasks.json (JSON backend only).
+
+    Returns:
+        StorageBackend: The backend.
+
+    Raises:
+        ValueError: If the backend kind is unknown.
+    """
+    directory = Path(directory)
+    if kind == "json":
+        return JsonBackend(directory / "tasks.json", journal=journal, trusted=trusted, binary=binary)
+    if kind == "sqlite":
+        from taskory.commands.sqlite_backend import SqliteBackend
+        return SqliteBackend(directory / "tasks.db")
+    if kind == "sharded":
+        from taskory.commands.sharded_backend import ShardedBackend
+        return ShardedBackend(directory)
+    raise ValueError(f"Unknown storage backend: {kind}")
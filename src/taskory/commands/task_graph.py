@@ -0,0 +1,234 @@
+import heapq
+from collections import defaultdict
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus
+from taskory.commands.sorted_views import priority_key
+
+
+class DependencyCycleError(ValueError):
+    """
+    Raised when a task's depends_on would make it depend on itself.
+    """
+    def __init__(self, path: List[UUID]) -> None:
+        self.path = path
+        super().__init__("Dependency cycle: " + " -> ".join(str(task_id) for task_id in path))
+
+
+def find_cycle(
+    task_id: UUID,
+    depends_on: Optional[Iterable[UUID]],
+    edges: Callable[[UUID], Iterable[UUID]],
+) -> Optional[List[UUID]]:
+    """
+    Checks whether giving a task these dependencies would create a cycle, walking only
+    the dependencies reachable from the new ones.
+    Args:
+        task_id (UUID): The task to check.
+        depends_on (Optional[Iterable[UUID]]): Its proposed dependencies.
+        edges (Callable[[UUID], Iterable[UUID]]): The stored dependencies of a task.
+    Returns:
+        Optional[List[UUID]]: The cycle as a path from task_id back to it, or None.
+    """
+    parents: Dict[UUID, Optional[UUID]] = {}
+    stack = []
+    for dep in depends_on or ():
+        if dep not in parents:
+            parents[dep] = None
+            stack.append(dep)
+    while stack:
+        current = stack.pop()
+        if current == task_id:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            return [task_id] + path[::-1]
+        for dep in edges(current):
+            if dep not in parents:
+                parents[dep] = current
+                stack.append(dep)
+    return None
+
+
+def check_dependencies(
+    task_id: UUID,
+    depends_on: Any,
+    edges: Callable[[UUID], Iterable[UUID]],
+) -> Optional[List[UUID]]:
+    """
+    Parses a depends_on value and makes sure it does not create a cycle.
+    Args:
+        task_id (UUID): The task the dependencies are for.
+        depends_on (Any): A list of task IDs (as strings or UUIDs), or None.
+        edges (Callable[[UUID], Iterable[UUID]]): The stored dependencies of a task.
+    Returns:
+        Optional[List[UUID]]: The dependencies as UUIDs.
+    Raises:
+        ValueError: If an ID is invalid.
+        DependencyCycleError: If the task would end up depending on itself.
+    """
+    if depends_on is None:
+        return None
+    parsed = []
+    for dep in depends_on:
+        try:
+            parsed.append(dep if isinstance(dep, UUID) else UUID(str(dep)))
+        except ValueError as e:
+            raise ValueError(f"Invalid UUID string: {dep}") from e
+    cycle = find_cycle(task_id, parsed, edges)
+    if cycle is not None:
+        raise DependencyCycleError(cycle)
+    return parsed
+
+
+class DependencyGraph:
+    """
+    Dependency edges between tasks, with the set of ready tasks kept up to date.
+
+    A task is ready when it is todo and none of the tasks it depends on is still open.
+    Ids in depends_on that are not in the store do not block (a deleted dependency is
+    treated as resolved). Each task counts its open dependencies, so a status change
+    only touches the tasks that depend on the changed one. Ready tasks sit in a heap
+    ordered by priority and created_at; stale heap entries are skipped when they reach
+    the top.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty graph.
+        """
+        # Both maps leave out tasks without dependencies or without open ones, which
+        # in most stores is nearly every task.
+        self.depends_on: Dict[UUID, Tuple[UUID, ...]] = {}
+        # Reverse edges; kept for ids not in the store too, so adding a dependency
+        # later still finds the tasks waiting for it.
+        self.dependents: Dict[UUID, Set[UUID]] = defaultdict(set)
+        self._open_deps: Dict[UUID, int] = {}
+        self._status: Dict[UUID, TaskStatus] = {}
+        self._key: Dict[UUID, Tuple[int, float]] = {}
+        self._heap: List[Tuple[Tuple[int, float], int, UUID]] = []
+        # Heap entry number of each task's current entry, for ready tasks only.
+        self._ready: Dict[UUID, int] = {}
+        self._entries = count()
+
+    def find_cycle(self, task_id: UUID, depends_on: Optional[Iterable[UUID]]) -> Optional[List[UUID]]:
+        """
+        Checks whether giving a task these dependencies would create a cycle.
+
+        Walks the dependencies reachable from the new ones, so it costs the size of that
+        part of the graph, not of the store.
+        Args:
+            task_id (UUID): The task to check.
+            depends_on (Optional[Iterable[UUID]]): Its proposed dependencies.
+        Returns:
+            Optional[List[UUID]]: The cycle as a path from task_id back to it, or None.
+        """
+        return find_cycle(task_id, depends_on, lambda dep: self.depends_on.get(dep, ()))
+
+    def add(self, task: Task) -> None:
+        """
+        Adds a task (or re-adds it after remove) and updates readiness around it.
+        Args:
+            task (Task): The task to add.
+        """
+        task_id = task.id
+        self._status[task_id] = task.status
+        self._key[task_id] = priority_key(task)
+        if task.depends_on:
+            deps = self.depends_on[task_id] = tuple(dict.fromkeys(task.depends_on))
+            for dep in deps:
+                self.dependents[dep].add(task_id)
+            open_deps = sum(1 for dep in deps if self._is_open(dep))
+            if open_deps:
+                self._open_deps[task_id] = open_deps
+        if task.status != TaskStatus.done:
+            for dependent in self.dependents.get(task_id, ()):
+                self._open_deps[dependent] = self._open_deps.get(dependent, 0) + 1
+                self._refresh(dependent)
+        self._refresh(task_id)
+
+    def remove(self, task: Task) -> None:
+        """
+        Removes a task and updates readiness of the tasks depending on it.
+        Args:
+            task (Task): The task to remove.
+        """
+        task_id = task.id
+        was_open = self._is_open(task_id)
+        for dep in self.depends_on.pop(task_id, ()):
+            dependents = self.dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self.dependents[dep]
+        self._status.pop(task_id, None)
+        self._key.pop(task_id, None)
+        self._open_deps.pop(task_id, None)
+        self._ready.pop(task_id, None)
+        if was_open:
+            for dependent in self.dependents.get(task_id, ()):
+                open_deps = self._open_deps.pop(dependent) - 1
+                if open_deps:
+                    self._open_deps[dependent] = open_deps
+                self._refresh(dependent)
+
+    def clear(self) -> None:
+        """
+        Drops every task.
+        """
+        self.__init__()
+
+    def _is_open(self, task_id: UUID) -> bool:
+        status = self._status.get(task_id)
+        return status is not None and status != TaskStatus.done
+
+    def _refresh(self, task_id: UUID) -> None:
+        if self._status.get(task_id) == TaskStatus.todo and task_id not in self._open_deps:
+            if task_id not in self._ready:
+                entry = next(self._entries)
+                self._ready[task_id] = entry
+                heapq.heappush(self._heap, (self._key[task_id], entry, task_id))
+        else:
+            self._ready.pop(task_id, None)
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self._ready):
+            # Reason: entries of tasks that stopped being ready are only dropped when
+            # they reach the top, so rebuild before they outnumber the live ones.
+            self._heap = [item for item in self._heap if self._ready.get(item[2]) == item[1]]
+            heapq.heapify(self._heap)
+
+    def is_blocked(self, task_id: UUID) -> bool:
+        """
+        Checks whether a task still waits for open dependencies.
+        Args:
+            task_id (UUID): The task.
+        Returns:
+            bool: True if any dependency is not done.
+        """
+        return self._open_deps.get(task_id, 0) > 0
+
+    def blockers(self, task_id: UUID) -> List[UUID]:
+        """
+        Lists the dependencies of a task that are not done yet.
+        Args:
+            task_id (UUID): The task.
+        Returns:
+            List[UUID]: The open dependencies, in depends_on order.
+        """
+        return [dep for dep in self.depends_on.get(task_id, ()) if self._is_open(dep)]
+
+    def next_ready(self) -> Optional[UUID]:
+        """
+        Returns the highest-priority ready task, oldest first among equals.
+
+        Stale heap entries are popped on the way, so the cost is O(log n) amortized.
+        Returns:
+            Optional[UUID]: The task id, or None if no task is ready.
+        """
+        heap = self._heap
+        while heap:
+            _, entry, task_id = heap[0]
+            if self._ready.get(task_id) == entry:
+                return task_id
+            heapq.heappop(heap)
+        return None
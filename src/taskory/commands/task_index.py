@@ -0,0 +1,199 @@
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+from taskory.commands.sorted_views import Entry, SortedIndex, select, sort_key
+
+# Reason: a single sorted query, as in a CLI run, costs less as a heap over the store
+# than as a full sort. Sorted indexes are built when a field is queried a second time.
+BUILD_SORTED_AFTER = 2
+
+
+class TaskIndex:
+    """
+    In-memory secondary indexes over status, assignee, tags and priority, plus ordered
+    indexes by priority, created_at and updated_at.
+
+    Each index maps a field value to the set of task ids holding it, so filtered
+    lookups intersect a few sets instead of scanning every task. Ordered indexes are
+    built on demand (see ordered) and then kept up to date like the others.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes empty indexes.
+        """
+        self.by_status: Dict[TaskStatus, Set[UUID]] = defaultdict(set)
+        self.by_assignee: Dict[Optional[str], Set[UUID]] = defaultdict(set)
+        self.by_tag: Dict[str, Set[UUID]] = defaultdict(set)
+        self.by_priority: Dict[Optional[TaskPriority], Set[UUID]] = defaultdict(set)
+        # Reason: sets are unordered, so each id remembers when it entered the store
+        # and filtered results come back in the same order as an unfiltered listing.
+        self._position: Dict[UUID, int] = {}
+        self._next_position = 0
+        self.sorted: Dict[str, SortedIndex] = {}
+        self._sort_queries: Dict[str, int] = defaultdict(int)
+
+    def add(self, task: Task) -> None:
+        """
+        Indexes a task under its current field values.
+        Args:
+            task (Task): The task to index.
+        """
+        if task.id not in self._position:
+            self._position[task.id] = self._next_position
+            self._next_position += 1
+        self.by_status[task.status].add(task.id)
+        self.by_assignee[task.assignee].add(task.id)
+        self.by_priority[task.priority].add(task.id)
+        for tag in task.tags or ():
+            self.by_tag[tag].add(task.id)
+        for index in self.sorted.values():
+            index.add(task)
+
+    def remove(self, task: Task, keep_position: bool = False) -> None:
+        """
+        Removes a task from the indexes, using its current field values.
+        Args:
+            task (Task): The task to unindex.
+            keep_position (bool): Keep the task's listing position (used while it is re-indexed after an update).
+        """
+        self._discard(self.by_status, task.status, task.id)
+        self._discard(self.by_assignee, task.assignee, task.id)
+        self._discard(self.by_priority, task.priority, task.id)
+        for tag in task.tags or ():
+            self._discard(self.by_tag, tag, task.id)
+        for index in self.sorted.values():
+            index.remove(task.id)
+        if not keep_position:
+            self._position.pop(task.id, None)
+
+    @staticmethod
+    def _discard(index: Dict, key: Hashable, task_id: UUID) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.discard(task_id)
+        if not bucket:
+            del index[key]
+
+    def clear(self) -> None:
+        """
+        Drops every indexed task.
+        """
+        self.__init__()
+
+    def query(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> Optional[List[UUID]]:
+        """
+        Finds the ids of tasks matching every given filter.
+
+        Args:
+            status (Optional[TaskStatus]): Required status.
+            assignee (Optional[str]): Required assignee.
+            tags (Optional[Iterable[str]]): Tags the task must all carry.
+            priority (Optional[TaskPriority]): Required priority.
+            min_priority (Optional[int]): Lowest accepted priority (inclusive).
+            max_priority (Optional[int]): Highest accepted priority (inclusive).
+
+        Returns:
+            Optional[List[UUID]]: Matching ids in store order, or None if no filter was given.
+        """
+        candidates = self._candidates(status, assignee, tags, priority, min_priority, max_priority)
+        if candidates is None:
+            return None
+        matches = self._intersect(candidates)
+        matches.sort(key=self._position.__getitem__)
+        return matches
+
+    def _candidates(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> Optional[List[Set[UUID]]]:
+        # The id sets a match must belong to, smallest first; None without filters.
+        candidates: List[Set[UUID]] = []
+        if status is not None:
+            candidates.append(self.by_status.get(status, set()))
+        if assignee is not None:
+            candidates.append(self.by_assignee.get(assignee, set()))
+        for tag in tags or ():
+            candidates.append(self.by_tag.get(tag, set()))
+        if priority is not None:
+            candidates.append(self.by_priority.get(priority, set()))
+        if min_priority is not None or max_priority is not None:
+            low = min_priority if min_priority is not None else min(TaskPriority)
+            high = max_priority if max_priority is not None else max(TaskPriority)
+            in_range: Set[UUID] = set()
+            for level in TaskPriority:
+                if low <= level <= high:
+                    in_range |= self.by_priority.get(level, set())
+            candidates.append(in_range)
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        return candidates
+
+    @staticmethod
+    def _intersect(candidates: List[Set[UUID]]) -> List[UUID]:
+        # Reason: walking the smallest set and probing the others keeps the cost
+        # proportional to the most selective filter, not to the store size.
+        smallest, rest = candidates[0], candidates[1:]
+        return [task_id for task_id in smallest if all(task_id in other for other in rest)]
+
+    def ordered(
+        self,
+        sort_by: str,
+        tasks: Mapping[UUID, Task],
+        limit: Optional[int] = None,
+        after: Optional[Entry] = None,
+        reverse: bool = False,
+        **filters: Any,
+    ) -> List[Entry]:
+        """
+        Finds the first `limit` matching tasks in the order of a sort field.
+
+        Without a sorted index for the field, the matching tasks go through a bounded
+        heap in O(m log limit). Once the field has been queried BUILD_SORTED_AFTER
+        times, a SortedIndex is built. Later queries walk it from the cursor and stop
+        after `limit` matches. For selective filters, where walking would pass over
+        many non-matching tasks, the heap over the matches is still used.
+        Args:
+            sort_by (str): One of sorted_views.SORT_FIELDS.
+            tasks (Mapping[UUID, Task]): Every task of the store, by id.
+            limit (Optional[int]): How many entries to return; None returns all matches.
+            after (Optional[Entry]): Cursor position to continue after.
+            reverse (bool): Largest keys first.
+            **filters: The filters of query().
+        Returns:
+            List[Entry]: The selected entries, in order.
+        """
+        candidates = self._candidates(**filters)
+        index = self.sorted.get(sort_by)
+        if index is None:
+            self._sort_queries[sort_by] += 1
+            if self._sort_queries[sort_by] >= BUILD_SORTED_AFTER:
+                index = self.sorted[sort_by] = SortedIndex(sort_by, tasks.values())
+        if index is None:
+            pool = tasks if candidates is None else self._intersect(candidates)
+            return select(((sort_key(tasks[task_id], sort_by), task_id) for task_id in pool), limit, after, reverse)
+        # Reason: a walk visits about limit * n / m entries to find limit of m matches;
+        # the heap visits all m of them. The smallest candidate set bounds m.
+        if candidates is not None and (limit is None or limit * len(tasks) > len(candidates[0]) ** 2):
+            pool = self._intersect(candidates)
+            return select((index.entry(task_id) for task_id in pool), limit, after, reverse)
+        walk = index.iter_from(after, reverse)
+        if candidates is not None:
+            walk = (entry for entry in walk if all(entry[1] in other for other in candidates))
+        return list(islice(walk, limit))
@@ -1,27 +1,168 @@
-import json
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Union
 from uuid import UUID
 from datetime import datetime, UTC
 from taskory.schemas import Task, TaskStatus, TaskPriority
-from enum import Enum
 from pathlib import Path
+from taskory.commands.journal import TaskJournal, DEFAULT_COMPACT_THRESHOLD
+from taskory.commands.task_index import TaskIndex
+from taskory.commands.task_table import TaskTable
+from taskory.commands.task_graph import DependencyGraph, check_dependencies
+from taskory.commands.serialization import serialize_task, deserialize_task
+from taskory.commands.storage import StorageBackend, JsonBackend, Change
+from taskory.commands.binary_snapshot import read_binary_snapshot, write_binary_snapshot
+from taskory.commands.change_tracking import ChangeTracking
+from taskory.commands.bulk import BulkOperations
+from taskory.commands.change_feed import ChangeFeed, FeedFollower
+from taskory.commands.sorted_views import TaskPage, check_sort, decode_cursor, make_page
+from taskory.commands.tracing import span, traced
 
-class TaskStore:
+
+class TaskStore(ChangeTracking, BulkOperations, FeedFollower):
     """
-    In-memory store for managing Task objects, with optional persistent JSON file storage.
+    In-memory store for managing Task objects, persisted through a pluggable storage
+    backend (a JSON file by default).
     """
-    def __init__(self, file_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        journal: bool = False,
+        trusted: bool = False,
+        backend: Optional[StorageBackend] = None,
+        binary: bool = False,
+        auto_save: bool = True,
+    ) -> None:
         """
-        Initializes the TaskStore with an empty dictionary or loads from file if provided.
+        Initializes the TaskStore with an empty dictionary or loads from storage if provided.
         Args:
             file_path (Optional[str]): Path to the JSON file for persistence.
+            journal (bool): Append mutations to a journal next to the file instead of rewriting it.
+            trusted (bool): Load the file with the bulk fast path (see load_from_file).
+            backend (Optional[StorageBackend]): Storage backend to use instead of a JSON file.
+            binary (bool): Keep a binary snapshot next to the JSON file and load it while
+                it is not older than the JSON file.
+            auto_save (bool): Persist every change as it happens. When False, changes are
+                kept until flush() writes them together.
         """
-        self._tasks: Dict[UUID, Task] = {}
+        self._tasks = TaskTable()
+        self._index = TaskIndex()
+        self._graph = DependencyGraph()
         self.file_path = file_path
-        if file_path and Path(file_path).exists():
-            loaded = self.load_from_file(file_path)
-            self._tasks = loaded._tasks
+        # Open batch state: tasks as they were before the batch (None if added in it)
+        # and the changes waiting for commit, both keyed by task id.
+        self._batch_undo: Optional[Dict[UUID, Optional[Task]]] = None
+        self._batch_pending: Dict[UUID, Change] = {}
+        self.auto_save = auto_save
+        # Committed changes not yet written (only used when auto_save is False).
+        self._unsaved: Dict[UUID, Change] = {}
+        # Called with each list of changes once it is written (see ChangeTracking).
+        self.write_listeners: List[Callable[[Optional[List[Change]]], None]] = []
+        # Log of written changes shared with other processes (see change_feed), and the
+        # sequence number of its last event reflected in memory.
+        self.change_feed: Optional[ChangeFeed] = None
+        self.feed_position = 0
+        if journal and not file_path:
+            raise ValueError("A file path is required to journal tasks.")
+        if backend is None and file_path:
+            backend = JsonBackend(file_path, journal=journal, trusted=trusted, binary=binary)
+        self.backend = backend
+        if backend is not None and backend.exists():
+            self._load_backend()
+
+    @property
+    def journal(self) -> Optional[TaskJournal]:
+        """
+        The journal of the JSON backend, or None when mutations are not journaled.
+        """
+        return getattr(self.backend, "journal", None)
+
+    def enable_journal(self, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD) -> None:
+        """
+        Switches the store to journaled persistence and replays any pending journal records.
+
+        Each mutation then appends one compact record to the journal instead of rewriting
+        the whole JSON file. The journal is folded back into the JSON file once it grows
+        past compact_threshold.
+        Args:
+            compact_threshold (int): Journal size in bytes that triggers compaction.
+        """
+        if not isinstance(self.backend, JsonBackend):
+            raise ValueError("A file path is required to journal tasks.")
+        self.backend.enable_journal(compact_threshold)
+        for _, task_id, task in self.backend.journal_changes():
+            if task is None:
+                self._drop(task_id)
+            else:
+                self._put(task)
+
+    def _load_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Fills an empty store with freshly loaded tasks.
+        Args:
+            tasks (Iterable[Task]): The tasks, in file order (later duplicates win).
+        """
+        with span("index") as phase:
+            for task in tasks:
+                if task.id in self._tasks:
+                    self._put(task)
+                    continue
+                # Reason: the loaded task is indexed directly instead of being read
+                # back from the table, which would build it a second time.
+                self._tasks.append(task)
+                self._index.add(task)
+                self._graph.add(task)
+            phase.add(records=len(self._tasks))
 
+    def _put(self, task: Task) -> None:
+        """
+        Stores a task, replacing any task with the same ID, and indexes it.
+        Args:
+            task (Task): The task to store.
+        """
+        previous = self._tasks.get(task.id)
+        # Reason: the table checks every field before storing, so a task it rejects
+        # leaves the indexes untouched.
+        self._tasks[task.id] = task
+        if previous is not None:
+            self._index.remove(previous, keep_position=True)
+            self._graph.remove(previous)
+        self._index.add(task)
+        self._graph.add(task)
+
+    def _drop(self, task_id: UUID) -> Optional[Task]:
+        """
+        Removes a task and its index entries, if present.
+        Args:
+            task_id (UUID): The ID of the task to remove.
+        Returns:
+            Optional[Task]: The removed task, or None if it was not stored.
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._index.remove(task)
+            self._graph.remove(task)
+        return task
+
+    def _check_dependencies(self, task_id: UUID, depends_on: Any) -> Optional[List[UUID]]:
+        """
+        Parses a depends_on value and makes sure it does not create a cycle.
+        Args:
+            task_id (UUID): The task the dependencies are for.
+            depends_on (Any): A list of task IDs (as strings or UUIDs), or None.
+        Returns:
+            Optional[List[UUID]]: The dependencies as UUIDs.
+        Raises:
+            ValueError: If an ID is invalid.
+            DependencyCycleError: If the task would end up depending on itself.
+        """
+        return check_dependencies(task_id, depends_on, lambda dep: self._graph.depends_on.get(dep, ()))
+
+    def compact(self) -> None:
+        """
+        Folds the journal into the JSON file and truncates the journal.
+        """
+        self.save_to_file()
+
+    @traced("save_to_file")
     def save_to_file(self, path: Optional[str] = None) -> None:
         """
         Saves all tasks to a JSON file.
@@ -31,70 +172,57 @@ class TaskStore:
         file_path = path or self.file_path
         if not file_path:
             raise ValueError("No file path specified for saving tasks.")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump([self._serialize_task(task) for task in self._tasks.values()], f, indent=2)
+        if isinstance(self.backend, JsonBackend):
+            self.backend.save_snapshot(self._tasks.values(), file_path)
+        else:
+            JsonBackend(file_path).save_snapshot(self._tasks.values())
+
+    def save_binary(self, path: str) -> None:
+        """
+        Saves all tasks to a binary snapshot file (see commands.binary_snapshot).
+        Args:
+            path (str): Path to the binary file.
+        """
+        write_binary_snapshot(path, self._tasks.values())
 
     @classmethod
-    def load_from_file(cls, path: str) -> 'TaskStore':
+    def load_from_binary(cls, path: str) -> 'TaskStore':
         """
-        Loads tasks from a JSON file and returns a new TaskStore instance.
+        Loads tasks from a binary snapshot file into a new, unbound TaskStore.
+
+        Together with save_to_file and load_from_file this converts between the two
+        formats without losing any field.
         Args:
-            path (str): Path to the JSON file.
+            path (str): Path to the binary file.
         Returns:
             TaskStore: A new TaskStore instance populated with tasks from the file.
         """
         store = cls()
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            for item in data:
-                task = cls._deserialize_task(item)
-                store._tasks[task.id] = task
-        store.file_path = path
+        store._load_tasks(read_binary_snapshot(path))
         return store
 
-    @staticmethod
-    def _serialize_task(task: Task) -> dict:
-        """
-        Serializes a Task object to a dict suitable for JSON.
-        Args:
-            task (Task): The task to serialize.
-        Returns:
-            dict: The serialized task.
+    @classmethod
+    @traced("load_from_file")
+    def load_from_file(cls, path: str, journal: bool = False, trusted: bool = False) -> 'TaskStore':
         """
-        return {
-            'id': str(task.id),
-            'title': task.title,
-            'status': task.status.value if isinstance(task.status, Enum) else str(task.status),
-            'created_at': task.created_at.isoformat(),
-            'updated_at': task.updated_at.isoformat(),
-            'priority': int(task.priority) if task.priority is not None else None,
-            'assignee': task.assignee,
-            'tags': task.tags,
-        }
+        Loads tasks from a JSON file and returns a new TaskStore instance.
 
-    @staticmethod
-    def _deserialize_task(data: dict) -> Task:
-        """
-        Deserializes a dict into a Task object.
+        By default every record is deserialized and checked on its own, which suits
+        hand-edited files. Files written by TaskStore (see serialization.written_by_store)
+        can be loaded with trusted=True, which validates the whole list in one bulk pass.
         Args:
-            data (dict): The task data.
+            path (str): Path to the JSON file.
+            journal (bool): Replay the journal next to the file and keep journaling mutations.
+            trusted (bool): Use the bulk deserialization fast path.
         Returns:
-            Task: The deserialized Task object.
-        """
-        return Task(
-            id=UUID(data['id']),
-            title=data['title'],
-            status=TaskStatus(data['status']),
-            created_at=datetime.fromisoformat(data['created_at']),
-            updated_at=datetime.fromisoformat(data['updated_at']),
-            priority=TaskPriority(data['priority']) if data.get('priority') is not None else None,
-            assignee=data.get('assignee'),
-            tags=data.get('tags'),
-        )
+            TaskStore: A new TaskStore instance populated with tasks from the file.
+        """
+        if not Path(path).exists():
+            raise FileNotFoundError(path)
+        return cls(path, journal=journal, trusted=trusted)
 
-    def _auto_save(self):
-        if self.file_path:
-            self.save_to_file()
+    _serialize_task = staticmethod(serialize_task)
+    _deserialize_task = staticmethod(deserialize_task)
 
     def add_task(self, task: Task) -> None:
         """
@@ -105,25 +233,166 @@ class TaskStore:
 
         Raises:
             ValueError: If a task with the same ID already exists.
+            DependencyCycleError: If its dependencies would form a cycle.
         """
         if task.id in self._tasks:
             raise ValueError(f"Task with id {task.id} already exists.")
-        self._tasks[task.id] = task
-        self._auto_save()
+        self._check_dependencies(task.id, task.depends_on)
+        self._remember(task.id)
+        self._put(task)
+        self._record_change("add", task.id, task)
 
-    def list_tasks(self, status: Optional[TaskStatus] = None) -> List[Task]:
+    def list_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> List[Task]:
         """
-        Lists all tasks, optionally filtered by status.
+        Lists all tasks, optionally filtered. Filters are combined with AND and answered
+        from the secondary indexes, so the cost follows the size of the result.
 
         Args:
             status (Optional[TaskStatus]): Status to filter by.
+            assignee (Optional[str]): Assignee to filter by.
+            tags (Optional[Iterable[str]]): Tags that must all be present on the task.
+            priority (Optional[TaskPriority]): Exact priority to filter by.
+            min_priority (Optional[int]): Lowest priority to include (inclusive).
+            max_priority (Optional[int]): Highest priority to include (inclusive).
 
         Returns:
-            List[Task]: List of tasks.
+            List[Task]: List of tasks, in store order.
         """
-        if status is None:
-            return list(self._tasks.values())
-        return [task for task in self._tasks.values() if task.status == status]
+        return list(self.iter_tasks(status, assignee, tags, priority, min_priority, max_priority))
+
+    def iter_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        assignee: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        priority: Optional[TaskPriority] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Iterates over the tasks list_tasks would return, without building the list.
+        The store must not change while the iterator is in use.
+
+        Returns:
+            Iterator[Task]: Matching tasks, in store order.
+        """
+        ids = self._index.query(
+            status=status,
+            assignee=assignee,
+            tags=tags,
+            priority=priority,
+            min_priority=min_priority,
+            max_priority=max_priority,
+        )
+        if ids is None:
+            return iter(self._tasks.values())
+        return map(self._tasks.__getitem__, ids)
+
+    def page_tasks(
+        self,
+        limit: Optional[int] = None,
+        sort_by: str = "priority",
+        reverse: bool = False,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> TaskPage:
+        """
+        Lists tasks sorted by priority, created_at or updated_at, one page at a time.
+
+        "priority" puts the highest priority first and the oldest task first among
+        equals; the date fields put the oldest first. reverse flips the order. Ties are
+        broken by task ID, so the order is total. A cursor continues exactly after the
+        last task of the previous page, even if tasks were added, changed or deleted in
+        between. Only the requested page is selected (see TaskIndex.ordered), so the
+        store is never sorted just to show its first few tasks.
+
+        Args:
+            limit (Optional[int]): Page size; None returns every match.
+            sort_by (str): "priority", "created_at" or "updated_at".
+            reverse (bool): Reverse the order.
+            cursor (Optional[str]): The cursor of the previous page.
+            **filters: The filters of list_tasks.
+
+        Returns:
+            TaskPage: The tasks and the cursor of the next page (None on the last page).
+
+        Raises:
+            ValueError: If the sort field, limit or cursor is invalid.
+        """
+        check_sort(sort_by, limit)
+        after = decode_cursor(cursor, sort_by, reverse) if cursor else None
+        entries = self._index.ordered(
+            sort_by,
+            self._tasks,
+            limit=limit + 1 if limit is not None else None,
+            after=after,
+            reverse=reverse,
+            **filters,
+        )
+        return make_page(entries, limit, sort_by, reverse, self._tasks)
+
+    def top_tasks(self, limit: int, sort_by: str = "priority", reverse: bool = False, **filters: Any) -> List[Task]:
+        """
+        Returns the first `limit` tasks in a sort order (see page_tasks).
+
+        Args:
+            limit (int): How many tasks to return.
+            sort_by (str): "priority", "created_at" or "updated_at".
+            reverse (bool): Reverse the order.
+            **filters: The filters of list_tasks.
+
+        Returns:
+            List[Task]: The tasks, in order.
+        """
+        return self.page_tasks(limit, sort_by=sort_by, reverse=reverse, **filters).tasks
+
+    def next_task(self) -> Optional[Task]:
+        """
+        Picks the task to work on next: the highest-priority todo task whose dependencies
+        are all done, oldest first among equals.
+
+        Answered from the dependency graph's ready heap in O(log n), without scanning
+        the store.
+
+        Returns:
+            Optional[Task]: The task, or None if every todo task is blocked.
+        """
+        task_id = self._graph.next_ready()
+        return self._tasks[task_id] if task_id is not None else None
+
+    def blockers(self, task_id: Union[str, UUID]) -> List[Task]:
+        """
+        Lists the dependencies of a task that are not done yet.
+
+        Args:
+            task_id (str | UUID): The ID of the task (as string or UUID).
+
+        Returns:
+            List[Task]: The open dependencies, in depends_on order.
+
+        Raises:
+            KeyError: If the task is not found.
+            ValueError: If the ID string is not a valid UUID.
+        """
+        task = self.get_task_by_id(task_id)
+        return [self._tasks[dep] for dep in self._graph.blockers(task.id)]
+
+    def task_ids(self) -> List[UUID]:
+        """
+        Lists the ids of all tasks without building Task objects.
+
+        Returns:
+            List[UUID]: The ids, in store order.
+        """
+        return list(self._tasks)
 
     def get_task_by_id(self, task_id: Union[str, UUID]) -> Task:
         """
@@ -163,17 +432,24 @@ class TaskStore:
         Raises:
             KeyError: If the task is not found.
             ValueError: If an invalid field is provided or ID is invalid.
+            DependencyCycleError: If new dependencies would form a cycle.
         """
         task = self.get_task_by_id(task_id)
         update_fields = kwargs.copy()
-        for key, value in update_fields.items():
+        for key in update_fields:
             if not hasattr(task, key):
                 raise ValueError(f"Invalid field: {key}")
+        if "depends_on" in update_fields:
+            update_fields["depends_on"] = self._check_dependencies(task.id, update_fields["depends_on"])
+        self._remember(task.id)
+        # The task is a copy built from the table, so the stored row and its index
+        # entries keep the old values until _put replaces them.
+        for key, value in update_fields.items():
             setattr(task, key, value)
         # Always update the updated_at timestamp
         task.updated_at = datetime.now(UTC)
-        self._tasks[task.id] = task
-        self._auto_save()
+        self._put(task)
+        self._record_change("update", task.id, task)
         return task
 
     def delete_task(self, task_id: Union[str, UUID]) -> None:
@@ -194,5 +470,6 @@ class TaskStore:
                 raise ValueError(f"Invalid UUID string: {task_id}") from e
         if task_id not in self._tasks:
             raise KeyError(f"Task with id {task_id} not found.")
-        del self._tasks[task_id]
-        self._auto_save() 
\ No newline at end of file
+        self._remember(task_id)
+        self._drop(task_id)
+        self._record_change("delete", task_id) 
\ No newline at end of file
@@ -0,0 +1,418 @@
+import json
+import struct
+import sys
+from array import array
+from copy import copy as shallow_copy
+from datetime import datetime, timedelta, UTC
+from typing import Dict, Iterable, Iterator, List, MutableMapping, NamedTuple, Optional, Tuple, ValuesView
+from uuid import UUID
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+STATUSES: Tuple[TaskStatus, ...] = tuple(TaskStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Priority codes: 0 for no priority, otherwise the level itself.
+PRIORITIES: Tuple[Optional[TaskPriority], ...] = (None, *TaskPriority)
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(PRIORITIES)}
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+_MICROSECOND = timedelta(microseconds=1)
+# Timestamp column value for datetimes that are not in UTC (kept as objects instead).
+NOT_UTC = -2 ** 63
+# Code of a missing assignee or of tags=None.
+NONE = -1
+# Deleted rows are dropped once there are this many and they outnumber the live ones.
+COMPACT_AFTER = 1024
+
+# Layout of to_bytes: a header, the 16-byte ids, the numeric columns in column order
+# (native byte order), then the string data as UTF-8 JSON.
+MAGIC = b"TKTT"
+FORMAT = 1
+HEADER = struct.Struct("<4sHBxI")  # magic, format, little-endian flag, row count
+_COLUMNS = ("_status", "_priority", "_created", "_updated", "_assignee", "_tags")
+
+_FIELDS = frozenset(Task.model_fields)
+_new_task = Task.__new__
+_set = object.__setattr__
+
+
+class IndexRow(NamedTuple):
+    """
+    The fields of a task that TaskIndex and DependencyGraph read, taken from a table
+    row without building the Task.
+    """
+    id: UUID
+    status: TaskStatus
+    priority: Optional[TaskPriority]
+    assignee: Optional[str]
+    tags: Optional[Tuple[str, ...]]
+    depends_on: Optional[Tuple[UUID, ...]]
+    created_at: datetime
+
+
+class TaskTable(MutableMapping[UUID, Task]):
+    """
+    Compact, column-per-field storage for the tasks of a TaskStore, keyed by task id.
+
+    Each task is one row. Status and priority are one-byte codes, timestamps are
+    microseconds since the epoch, and assignees and tag lists are codes into interned
+    tables, so a repeated value such as an assignee is stored once for the whole table.
+    Titles are kept as strings and dependencies only for the tasks that have any.
+
+    Task objects are only built when a task is read (see __getitem__ and values()), and
+    every read returns a new object: changing it does not change the table until it is
+    stored again. Rows keep their position when a task is replaced, and iteration follows
+    row order, like a dict's insertion order.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty table.
+        """
+        self._rows: Dict[UUID, int] = {}
+        # Per-row columns; a deleted row has id None until the table is compacted.
+        self._ids: List[Optional[UUID]] = []
+        self._titles: List[Optional[str]] = []
+        self._status = array("b")
+        self._priority = array("b")
+        self._created = array("q")
+        self._updated = array("q")
+        self._assignee = array("i")
+        self._tags = array("i")
+        self._depends_on: Dict[int, Tuple[UUID, ...]] = {}
+        self._not_utc: Dict[Tuple[int, str], datetime] = {}
+        # Interned values: code -> value and value -> code.
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._tag_lists: List[Tuple[str, ...]] = []
+        self._tag_list_codes: Dict[Tuple[str, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._rows
+
+    def __iter__(self) -> Iterator[UUID]:
+        return (task_id for task_id in self._ids if task_id is not None)
+
+    def __getitem__(self, task_id: UUID) -> Task:
+        return self._task(self._rows[task_id])
+
+    def get(self, task_id: UUID, default: Optional[Task] = None) -> Optional[Task]:
+        row = self._rows.get(task_id)
+        return self._task(row) if row is not None else default
+
+    def values(self) -> "TaskValues":
+        """
+        A view that builds every task, in row order, each time it is iterated.
+        Returns:
+            TaskValues: The view; the table must not change while it is iterated.
+        """
+        return TaskValues(self)
+
+    def __setitem__(self, task_id: UUID, task: Task) -> None:
+        """
+        Stores a task in its existing row, or in a new last row.
+
+        All fields are encoded before anything is written, so an invalid status or
+        priority leaves the table unchanged.
+        Raises:
+            ValueError: If task_id is not the task's id, or a field cannot be stored.
+        """
+        if task.id != task_id:
+            raise ValueError(f"Task {task.id} stored under id {task_id}.")
+        row = self._rows.get(task_id)
+        if row is None:
+            self.append(task)
+            return
+        status, priority, created, updated, assignee, tags = self._encode(task)
+        self._titles[row] = task.title
+        self._status[row] = status
+        self._priority[row] = priority
+        self._created[row] = created
+        self._updated[row] = updated
+        self._assignee[row] = assignee
+        self._tags[row] = tags
+        self._set_extras(row, task, created, updated)
+
+    def append(self, task: Task) -> None:
+        """
+        Stores a task whose id is not in the table yet, in a new last row.
+
+        The fast path for loading a store; use item assignment when the id may exist.
+        Args:
+            task (Task): The task.
+        Raises:
+            ValueError: If a field cannot be stored.
+        """
+        status, priority, created, updated, assignee, tags = self._encode(task)
+        row = self._rows[task.id] = len(self._ids)
+        self._ids.append(task.id)
+        self._titles.append(task.title)
+        self._status.append(status)
+        self._priority.append(priority)
+        self._created.append(created)
+        self._updated.append(updated)
+        self._assignee.append(assignee)
+        self._tags.append(tags)
+        if task.depends_on is not None or created == NOT_UTC or updated == NOT_UTC:
+            self._set_extras(row, task, created, updated)
+
+    def _encode(self, task: Task) -> Tuple[int, int, int, int, int, int]:
+        # The column values of a task, in column order.
+        status = _STATUS_CODES.get(task.status)
+        if status is None:
+            status = _STATUS_CODES[TaskStatus(task.status)]
+        priority = _PRIORITY_CODES.get(task.priority)
+        if priority is None:
+            priority = int(TaskPriority(task.priority))
+        assignee = task.assignee
+        if assignee is not None:
+            code = self._string_codes.get(assignee)
+            assignee = code if code is not None else self._intern(assignee)
+        tags = task.tags
+        if tags is not None:
+            code = self._tag_list_codes.get(tuple(tags))
+            tags = code if code is not None else self._intern_tags(tags)
+        return (
+            status,
+            priority,
+            _micros(task.created_at),
+            _micros(task.updated_at),
+            assignee if assignee is not None else NONE,
+            tags if tags is not None else NONE,
+        )
+
+    def _set_extras(self, row: int, task: Task, created: int, updated: int) -> None:
+        # Stores what does not fit the columns: dependencies and non-UTC datetimes.
+        for field, value, micros in (("created_at", task.created_at, created), ("updated_at", task.updated_at, updated)):
+            if micros == NOT_UTC:
+                self._not_utc[row, field] = value
+            else:
+                self._not_utc.pop((row, field), None)
+        if task.depends_on is not None:
+            self._depends_on[row] = tuple(task.depends_on)
+        else:
+            self._depends_on.pop(row, None)
+
+    def __delitem__(self, task_id: UUID) -> None:
+        row = self._rows.pop(task_id)
+        self._ids[row] = None
+        self._titles[row] = None
+        self._depends_on.pop(row, None)
+        self._not_utc.pop((row, "created_at"), None)
+        self._not_utc.pop((row, "updated_at"), None)
+        dead = len(self._ids) - len(self._rows)
+        if dead >= COMPACT_AFTER and dead > len(self._rows):
+            self._compact()
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def copy(self) -> "TaskTable":
+        """
+        Copies the table; cheaper than building every task.
+        Returns:
+            TaskTable: A table with the same rows, independent of this one.
+        """
+        table = TaskTable.__new__(TaskTable)
+        for name, value in vars(self).items():
+            setattr(table, name, shallow_copy(value))
+        return table
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> "TaskTable":
+        """
+        Builds a table from tasks; a later task with the same id replaces the earlier one.
+        Args:
+            tasks (Iterable[Task]): The tasks, in order.
+        Returns:
+            TaskTable: The table.
+        """
+        table = cls()
+        for task in tasks:
+            table[task.id] = task
+        return table
+
+    def index_rows(self) -> Iterator[IndexRow]:
+        """
+        Yields the indexed fields of every task, in row order, for filling the store's
+        indexes without building each task.
+        Returns:
+            Iterator[IndexRow]: The rows; the table must not change while it is iterated.
+        """
+        not_utc = self._not_utc
+        for row, task_id in enumerate(self._ids):
+            if task_id is None:
+                continue
+            created, assignee, tags = self._created[row], self._assignee[row], self._tags[row]
+            yield IndexRow(
+                task_id,
+                STATUSES[self._status[row]],
+                PRIORITIES[self._priority[row]],
+                self._strings[assignee] if assignee != NONE else None,
+                self._tag_lists[tags] if tags != NONE else None,
+                self._depends_on.get(row),
+                EPOCH + created * _MICROSECOND if created != NOT_UTC else not_utc[row, "created_at"],
+            )
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the table's columns, for TaskTable.from_bytes.
+
+        Numeric columns are stored in native byte order, so the encoding is meant for
+        caches on the same machine, not for exchange (see binary_snapshot for that).
+        Returns:
+            bytes: The encoded table.
+        """
+        table = self
+        if len(self._ids) != len(self._rows):
+            table = self.copy()
+            table._compact()
+        strings = {
+            "titles": table._titles,
+            "strings": table._strings,
+            "tag_lists": [[table._string_codes[tag] for tag in tags] for tags in table._tag_lists],
+            "depends_on": [[row, [dep.hex for dep in deps]] for row, deps in table._depends_on.items()],
+            "not_utc": [[row, field, value.isoformat()] for (row, field), value in table._not_utc.items()],
+        }
+        return b"".join([
+            HEADER.pack(MAGIC, FORMAT, sys.byteorder == "little", len(table._ids)),
+            b"".join(task_id.bytes for task_id in table._ids),
+            *(getattr(table, name).tobytes() for name in _COLUMNS),
+            json.dumps(strings, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        ])
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "TaskTable":
+        """
+        Decodes a table encoded by to_bytes, without building or validating any task.
+        Args:
+            raw (bytes): The encoded table.
+        Returns:
+            TaskTable: The table.
+        Raises:
+            ValueError: If the data is not an encoded table from this platform, or is
+                truncated.
+        """
+        try:
+            magic, version, little, count = HEADER.unpack_from(raw, 0)
+            if magic != MAGIC or version != FORMAT or bool(little) != (sys.byteorder == "little"):
+                raise ValueError("not an encoded task table for this platform")
+            table = cls()
+            position = HEADER.size + 16 * count
+            table._ids = [UUID(bytes=raw[start:start + 16]) for start in range(HEADER.size, position, 16)]
+            for name in _COLUMNS:
+                column = array(getattr(table, name).typecode)
+                end = position + column.itemsize * count
+                column.frombytes(raw[position:end])
+                setattr(table, name, column)
+                position = end
+            if len(table._tags) != count:
+                raise ValueError("truncated")
+            strings = json.loads(raw[position:])
+            table._titles = strings["titles"]
+            table._strings = strings["strings"]
+            table._tag_lists = [tuple(table._strings[code] for code in codes) for codes in strings["tag_lists"]]
+            table._depends_on = {row: tuple(UUID(dep) for dep in deps) for row, deps in strings["depends_on"]}
+            table._not_utc = {(row, field): datetime.fromisoformat(value) for row, field, value in strings["not_utc"]}
+        except (struct.error, KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Corrupt task table: {e}") from e
+        if len(table._titles) != count:
+            raise ValueError("Corrupt task table: the titles do not match the rows")
+        table._rows = dict(zip(table._ids, range(count)))
+        table._string_codes = {value: code for code, value in enumerate(table._strings)}
+        table._tag_list_codes = {tags: code for code, tags in enumerate(table._tag_lists)}
+        return table
+
+    def _task(self, row: int) -> Task:
+        # Reason: the columns only ever hold values taken from validated tasks, so the
+        # model is filled in directly; pydantic validation would cost several times more.
+        created, updated = self._created[row], self._updated[row]
+        assignee, tags, depends_on = self._assignee[row], self._tags[row], self._depends_on.get(row)
+        task = _new_task(Task)
+        _set(task, "__dict__", {
+            "id": self._ids[row],
+            "title": self._titles[row],
+            "status": STATUSES[self._status[row]],
+            "created_at": EPOCH + created * _MICROSECOND if created != NOT_UTC else self._not_utc[row, "created_at"],
+            "updated_at": EPOCH + updated * _MICROSECOND if updated != NOT_UTC else self._not_utc[row, "updated_at"],
+            "priority": PRIORITIES[self._priority[row]],
+            "assignee": self._strings[assignee] if assignee != NONE else None,
+            "tags": list(self._tag_lists[tags]) if tags != NONE else None,
+            "depends_on": list(depends_on) if depends_on is not None else None,
+        })
+        _set(task, "__pydantic_fields_set__", set(_FIELDS))
+        _set(task, "__pydantic_extra__", None)
+        _set(task, "__pydantic_private__", None)
+        return task
+
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def _intern_tags(self, tags: List[str]) -> int:
+        key = tuple(tags)
+        code = self._tag_list_codes.get(key)
+        if code is None:
+            key = tuple(self._strings[self._intern(tag)] for tag in key)
+            code = self._tag_list_codes[key] = len(self._tag_lists)
+            self._tag_lists.append(key)
+        return code
+
+    def _compact(self) -> None:
+        """
+        Drops deleted rows, keeping the order of the others.
+        """
+        live = [row for row, task_id in enumerate(self._ids) if task_id is not None]
+        moved = {old: new for new, old in enumerate(live)}
+        self._ids = [self._ids[row] for row in live]
+        self._titles = [self._titles[row] for row in live]
+        for name in ("_status", "_priority", "_created", "_updated", "_assignee", "_tags"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[row] for row in live)))
+        self._rows = dict(zip(self._ids, range(len(live))))
+        self._depends_on = {moved[row]: deps for row, deps in self._depends_on.items()}
+        self._not_utc = {(moved[row], field): value for (row, field), value in self._not_utc.items()}
+
+
+class TaskValues(ValuesView):
+    """
+    The tasks of a TaskTable, built as they are iterated instead of looked up by id.
+    """
+    _mapping: TaskTable
+
+    @property
+    def table(self) -> TaskTable:
+        """
+        Returns:
+            TaskTable: The table these tasks are read from.
+        """
+        return self._mapping
+
+    def __iter__(self) -> Iterator[Task]:
+        table = self._mapping
+        return (table._task(row) for row, task_id in enumerate(table._ids) if task_id is not None)
+
+
+def _micros(value: datetime) -> int:
+    """
+    Converts a UTC datetime to microseconds since the epoch.
+    Args:
+        value (datetime): The datetime.
+    Returns:
+        int: The microseconds, or NOT_UTC for naive datetimes and other UTC offsets,
+            which are stored as they are so that they read back unchanged.
+    """
+    # Reason: pydantic parses "+00:00" into its own tzinfo class, so UTC is recognised
+    # by its offset rather than by identity with datetime.UTC.
+    tz = value.tzinfo
+    if tz is not UTC and (tz is None or tz.utcoffset(value)):
+        return NOT_UTC
+    # Reason: the offset is zero, so the fields already are UTC; reading them is
+    # several times faster than subtracting datetimes with different tzinfo objects.
+    days = value.toordinal() - _EPOCH_ORDINAL
+    return ((days * 86400 + value.hour * 3600 + value.minute * 60 + value.second) * 1_000_000
+            + value.microsecond)
@@ -0,0 +1,257 @@
+import functools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, TypeVar
+
+# TASKORY_TRACE=1 (or "text") prints a per-phase summary to stderr after each command;
+# TASKORY_TRACE=json prints it as one JSON line instead.
+ENV_VAR = "TASKORY_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """
+    One timed phase: its wall time, nesting depth and what it processed.
+    """
+    __slots__ = ("name", "depth", "ms", "records", "bytes_read", "bytes_written", "_tracer", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, depth: int) -> None:
+        self.name = name
+        self.depth = depth
+        self.ms = 0.0
+        self.records = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._tracer = tracer
+        self._start = 0.0
+
+    def add(self, records: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """
+        Counts records and bytes handled in this phase.
+        Args:
+            records (int): Tasks or records processed.
+            bytes_read (int): Bytes read from disk.
+            bytes_written (int): Bytes written to disk.
+        """
+        self.records += records
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+    def __enter__(self) -> "Span":
+        self._tracer._depth += 1
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.ms += (time.perf_counter() - self._start) * 1000
+        self._tracer._depth -= 1
+        return False
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            dict: The span's name, depth, milliseconds and counts, as printed by
+                TASKORY_TRACE=json.
+        """
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "ms": round(self.ms, 3),
+            "records": self.records,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+
+class _NullSpan:
+    """
+    Stand-in for Span while tracing is off; entering and counting cost next to nothing.
+    """
+    def add(self, records: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects the spans of one command, in the order they started.
+    """
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._depth = 0
+
+    def span(self, name: str) -> Span:
+        span = Span(self, name, self._depth)
+        self.spans.append(span)
+        return span
+
+    def record(self, name: str, ms: float) -> None:
+        """
+        Adds a phase that was timed elsewhere (such as the CLI import).
+        """
+        span = self.span(name)
+        span.ms = ms
+
+    def summary(self, command: str, total_ms: float) -> str:
+        """
+        Formats the spans as an indented table, one line per phase.
+        Args:
+            command (str): The command name for the heading.
+            total_ms (float): Wall time of the whole command.
+        Returns:
+            str: The summary.
+        """
+        lines = [f"taskory {command}: {total_ms:.1f} ms total"]
+        for span in self.spans:
+            label = "  " * (span.depth + 1) + span.name
+            details = []
+            if span.records:
+                details.append(f"{span.records} records")
+            if span.bytes_read:
+                details.append(f"{_size(span.bytes_read)} read")
+            if span.bytes_written:
+                details.append(f"{_size(span.bytes_written)} written")
+            lines.append(f"{label:<28} {span.ms:9.1f} ms  {', '.join(details)}".rstrip())
+        return "\n".join(lines)
+
+    def to_json(self, command: str, total_ms: float) -> str:
+        """
+        Formats the spans as one JSON line.
+        Args:
+            command (str): The command name.
+            total_ms (float): Wall time of the whole command.
+        Returns:
+            str: The JSON line, without a trailing newline.
+        """
+        return json.dumps({
+            "command": command,
+            "total_ms": round(total_ms, 3),
+            "phases": [span.as_dict() for span in self.spans],
+        }, separators=(",", ":"))
+
+
+def _size(count: int) -> str:
+    for unit in ("B", "kB", "MB"):
+        if count < 1000:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1000
+    return f"{count:.1f} GB"
+
+
+_tracer: Optional[Tracer] = None
+
+
+def env_mode() -> Optional[str]:
+    """
+    Reads TASKORY_TRACE.
+    Returns:
+        Optional[str]: "text", "json", or None when tracing is not requested.
+    """
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "false", "off"):
+        return None
+    return "json" if value == "json" else "text"
+
+
+def enable() -> Tracer:
+    """
+    Starts collecting spans, replacing any earlier tracer.
+    Returns:
+        Tracer: The active tracer.
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """
+    Stops collecting spans.
+    Returns:
+        Optional[Tracer]: The tracer that was active, with its spans.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name: str):
+    """
+    Times a phase while tracing is on.
+
+    Use as `with span("read") as phase: ...; phase.add(bytes_read=n)`. While tracing
+    is off this returns a shared no-op object, so instrumented code pays one function
+    call and one attribute check.
+    Args:
+        name (str): The phase name.
+    Returns:
+        Span | _NullSpan: The context manager.
+    """
+    return _tracer.span(name) if _tracer is not None else NULL_SPAN
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorator that times every call of a function as a span.
+    Args:
+        name (str): The phase name.
+    """
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_command(command: str, mode: Optional[str], cprofile: Optional[Path], started: float) -> Callable[[], None]:
+    """
+    Starts tracing and/or profiling one CLI command.
+
+    The trace lists the wall time of each phase (CLI import, loading, deserializing,
+    rendering, saving) with its record and byte counts, on stderr.
+    Args:
+        command (str): The command name, for the report.
+        mode (Optional[str]): "text", "json", or None to skip tracing.
+        cprofile (Optional[Path]): File to write cProfile stats to, or None.
+        started (float): perf_counter() value when the CLI module started importing.
+    Returns:
+        Callable[[], None]: Stops everything and prints the report; call it when the
+            command is done.
+    """
+    start = time.perf_counter()
+    if mode is not None:
+        enable().record("import", (start - started) * 1000)
+    profiler = None
+    if cprofile is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def report() -> None:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(cprofile))
+            print(f"cProfile stats written to {cprofile}", file=sys.stderr)
+        tracer = disable()
+        if tracer is not None:
+            total = (time.perf_counter() - started) * 1000
+            text = tracer.to_json(command, total) if mode == "json" else tracer.summary(command, total)
+            print(text, file=sys.stderr)
+
+    return report
@@ -0,0 +1,285 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional, Union
+from uuid import UUID
+
+# Reason: the CLI imports this module for every command, so the storage modules are
+# imported only once the configured storage is known.
+if TYPE_CHECKING:
+    from taskory.schemas import Task
+    from taskory.commands.task_store import TaskStore
+    from taskory.commands.mapped_store import MappedTaskStore
+    from taskory.commands.snapshot_cache import SnapshotCache
+
+TASKS_FILE = "tasks.json"
+SEARCH_INDEX_FILE = "search.db"
+ID_INDEX_FILE = "ids.idx"
+
+
+def open_store(directory: Union[str, Path], config: dict) -> Union["TaskStore", "MappedTaskStore"]:
+    """
+    Opens the store configured for a .taskory directory.
+
+    The store is bound to its storage, so each mutation (or batch of mutations) is
+    persisted as it happens. With the default "json" storage, tasks live in tasks.json:
+    "journal" replays and appends to tasks.journal, and "binary_snapshot" also writes
+    tasks.bin, which is loaded instead of tasks.json while it is not older than it.
+    Otherwise the validated tasks are cached in cache/ (see snapshot_cache), unless
+    "snapshot_cache" is false.
+    "sqlite" keeps tasks in tasks.db, "sharded" in shards/ (one small file per id
+    prefix), and "mapped" returns a lazy MappedTaskStore. Except for "mapped", writes
+    are also recorded in the change feed (changes.jsonl) once it is enabled.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        config (dict): Its taskory.config settings.
+
+    Returns:
+        TaskStore | MappedTaskStore: The loaded task store.
+    """
+    from taskory.commands.task_store import TaskStore
+    from taskory.commands.change_feed import FEED_FILE, ChangeFeed
+    from taskory.commands.serialization import written_by_store
+    from taskory.commands.storage import JsonBackend, open_backend
+    directory = Path(directory)
+    storage = config.get("storage", "json")
+    if storage == "mapped":
+        return watch_indexes(open_mapped_store(directory), directory)
+    feed = ChangeFeed(directory / FEED_FILE)
+    # Reason: the feed position must match the tasks loaded, so no write may land between
+    # loading them and reading the feed's head.
+    with feed.locked():
+        if storage != "json":
+            store = TaskStore(backend=open_backend(storage, directory))
+        else:
+            tasks_file = directory / TASKS_FILE
+            journal = bool(config.get("journal", False))
+            binary = bool(config.get("binary_snapshot", False))
+            # Files last written by TaskStore take the bulk fast path; hand-edited ones
+            # are checked record by record.
+            trusted = written_by_store(tasks_file)
+            backend = JsonBackend(tasks_file, journal=journal, trusted=trusted, binary=binary,
+                                  cache=snapshot_cache(directory, config, binary))
+            store = TaskStore(str(tasks_file), backend=backend)
+        store.feed_position = feed.head()
+    store.change_feed = feed
+    return watch_indexes(store, directory)
+
+
+def query_stored(directory: Union[str, Path], config: dict, filters: dict) -> Optional[List["Task"]]:
+    """
+    Answers a filtered listing from storage that indexes the filtered fields, without
+    loading the store: "sqlite" runs it as one query on its column and tag indexes
+    (see SqliteBackend.query_tasks).
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        config (dict): Its taskory.config settings.
+        filters (dict): list_tasks keyword arguments (see listing.parse_filters).
+
+    Returns:
+        Optional[List[Task]]: The matching tasks, in store order, or None when the
+            storage has no such indexes, or a daemon holds changes not yet written, and
+            the tasks must be listed from a loaded store.
+    """
+    if config.get("storage", "json") != "sqlite":
+        return None
+    from taskory.commands.daemon import socket_path_for
+    if socket_path_for(directory).exists():
+        return None
+    from taskory.commands.storage import open_backend
+    backend = open_backend("sqlite", directory)
+    try:
+        return backend.query_tasks(**filters)
+    finally:
+        backend.close()
+
+
+def snapshot_cache(directory: Path, config: dict, binary: bool) -> Optional["SnapshotCache"]:
+    """
+    Creates the snapshot cache configured for a .taskory directory.
+
+    Args:
+        directory (Path): The .taskory directory.
+        config (dict): Its taskory.config settings: "snapshot_cache" (default true) and
+            "snapshot_cache_mb", the size past which old entries are evicted.
+        binary (bool): Whether tasks.bin is kept, which already loads without validation.
+
+    Returns:
+        Optional[SnapshotCache]: The cache, or None when it is off.
+    """
+    from taskory.commands.snapshot_cache import CACHE_DIR, DEFAULT_MAX_BYTES, SnapshotCache
+    if binary or not config.get("snapshot_cache", True):
+        return None
+    max_mb = config.get("snapshot_cache_mb")
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else DEFAULT_MAX_BYTES
+    return SnapshotCache(directory / CACHE_DIR, max_bytes)
+
+
+def open_mapped_store(directory: Union[str, Path]) -> "MappedTaskStore":
+    """
+    Opens the memory-mapped store in a .taskory directory, building it from tasks.json
+    on first use.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+
+    Returns:
+        MappedTaskStore: The lazy task store.
+    """
+    from taskory.commands.task_store import TaskStore
+    from taskory.commands.mapped_store import MappedTaskStore
+    from taskory.commands.serialization import written_by_store
+    tasks_file = Path(directory) / TASKS_FILE
+    if not MappedTaskStore.exists(directory) and tasks_file.exists():
+        tasks = TaskStore.load_from_file(str(tasks_file), trusted=written_by_store(tasks_file)).list_tasks()
+        return MappedTaskStore.from_tasks(directory, tasks)
+    return MappedTaskStore(directory)
+
+
+def watch_indexes(store: Union["TaskStore", "MappedTaskStore"],
+                  directory: Union[str, Path]) -> Union["TaskStore", "MappedTaskStore"]:
+    """
+    Keeps the directory's search and id indexes, where it has them, up to date with
+    every write of the store (see search_index.SearchUpdater and id_index.IdIndexUpdater).
+
+    Args:
+        store (TaskStore | MappedTaskStore): A store bound to the directory's storage.
+        directory (str | Path): The .taskory directory.
+
+    Returns:
+        TaskStore | MappedTaskStore: The same store.
+    """
+    # Reason: the mapped store has no backend; its own version() is what store_version
+    # reports for it.
+    version = store.backend.version if hasattr(store, "backend") else store.version
+    index_path = Path(directory) / SEARCH_INDEX_FILE
+    # Reason: checked before importing search_index, so that stores without an index
+    # do not pay for importing sqlite3.
+    if index_path.exists():
+        from taskory.commands.search_index import SearchUpdater
+        store.write_listeners.append(SearchUpdater(index_path, version))
+    ids_path = Path(directory) / ID_INDEX_FILE
+    if ids_path.exists():
+        from taskory.commands.id_index import IdIndexUpdater
+        store.write_listeners.append(IdIndexUpdater(ids_path, version))
+    return store
+
+
+def store_version(directory: Union[str, Path], config: dict) -> Optional[str]:
+    """
+    The version (StorageBackend.version) of a .taskory directory's configured storage,
+    read without loading any task.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        config (dict): Its taskory.config settings.
+
+    Returns:
+        Optional[str]: The version, or None if there is nothing to compare it with.
+    """
+    storage = config.get("storage", "json")
+    if storage == "mapped":
+        from taskory.commands.mapped_store import MappedTaskStore
+        # Reason: opening a mapped store creates it; the first one is built from tasks.json.
+        return MappedTaskStore(directory).version() if MappedTaskStore.exists(directory) else None
+    from taskory.commands.storage import open_backend
+    return open_backend(storage, directory, journal=bool(config.get("journal", False))).version()
+
+
+def read_tasks(directory: Union[str, Path], config: dict) -> List["Task"]:
+    """
+    Reads the tasks of a .taskory directory's configured storage without writing
+    anything there: unlike open_store, it fills no snapshot cache, builds no id or search
+    index and opens no change feed. A mapped store not built yet is read from tasks.json.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        config (dict): Its taskory.config settings.
+
+    Returns:
+        List[Task]: The stored tasks.
+
+    Raises:
+        ValueError: If the storage is unknown or its files are invalid.
+    """
+    from taskory.commands.mapped_store import MappedTaskStore
+    from taskory.commands.serialization import written_by_store
+    from taskory.commands.storage import JsonBackend, open_backend
+    directory = Path(directory)
+    storage = config.get("storage", "json")
+    if storage == "mapped" and MappedTaskStore.exists(directory):
+        store = MappedTaskStore(directory)
+        try:
+            return list(store.iter_tasks())
+        finally:
+            store.close()
+    if storage in ("json", "mapped"):
+        tasks_file = directory / TASKS_FILE
+        json_config = config if storage == "json" else {}
+        return JsonBackend(tasks_file, journal=bool(json_config.get("journal", False)),
+                           trusted=written_by_store(tasks_file),
+                           binary=bool(json_config.get("binary_snapshot", False))).load()
+    if storage == "sqlite" and not (directory / "tasks.db").exists():
+        return []
+    backend = open_backend(storage, directory)
+    try:
+        return backend.load()
+    finally:
+        if storage == "sqlite":
+            backend.close()
+
+
+def id_finder(directory: Union[str, Path], store) -> Callable[[str, Optional[int]], List[UUID]]:
+    """
+    The prefix lookup for a loaded store, for id_index.resolve_id: the daemon answers for
+    a RemoteStore, and the directory's id index (checked against the store's version and
+    rebuilt from its ids when out of date) for the others.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        store (TaskStore | MappedTaskStore | RemoteStore): The store, e.g. from open_store.
+
+    Returns:
+        Callable[[str, Optional[int]], List[UUID]]: Maps a hex prefix and a limit to the
+            matching ids.
+    """
+    from taskory.commands.id_index import match_ids
+    from taskory.commands.mapped_store import MappedTaskStore
+    from taskory.commands.daemon_client import RemoteStore
+    if isinstance(store, RemoteStore):
+        return store.match_ids
+    version = store.version() if isinstance(store, MappedTaskStore) else store.backend.version()
+    path = Path(directory) / ID_INDEX_FILE
+    return lambda prefix, limit: match_ids(path, prefix, store.task_ids, version=version, limit=limit)
+
+
+def complete_ids(directory: Union[str, Path], config: dict, prefix: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Lists the task ids starting with a prefix, for shell completion.
+
+    The id index is used as it is, without checking the store's version, so that
+    completion reads one small file. The store is only loaded to build a missing index.
+
+    Args:
+        directory (str | Path): The .taskory directory.
+        config (dict): Its taskory.config settings.
+        prefix (str): What has been typed so far.
+        limit (Optional[int]): Largest number of ids to return.
+
+    Returns:
+        List[str]: The matching ids, in ascending order.
+    """
+    from taskory.commands.id_index import match_ids, parse_prefix
+    directory = Path(directory)
+    try:
+        hex_prefix = parse_prefix(prefix) if prefix else ""
+    except ValueError:
+        return []
+    if not directory.is_dir():
+        return []
+    path = directory / ID_INDEX_FILE
+    # Only a new index needs the version, which costs importing the storage layer.
+    version = None if path.exists() else store_version(directory, config)
+    found = match_ids(path, hex_prefix, lambda: open_store(directory, config).task_ids(),
+                      version=version, trusted=True, limit=limit)
+    return [str(task_id) for task_id in found]
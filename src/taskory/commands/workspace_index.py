@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from uuid import UUID
+from taskory.schemas import Task
+from taskory.commands.locking import FileLock, atomic_write
+from taskory.commands.splash import load_config
+from taskory.commands.storage import Change, StorageBackend
+from taskory.commands.task_store import TaskStore
+from taskory.commands.task_table import TaskTable
+
+TASKS_DIR = ".taskory"
+CONFIG_FILE = "taskory.config"
+# Directory, under the workspace root, holding the cached index.
+INDEX_DIR = ".taskory-workspace"
+MANIFEST_FILE = "manifest.json"
+MERGED_FILE = "merged.tbl"
+FORMAT = 1
+# Directories never searched for stores, besides hidden ones.
+SKIPPED_DIRS = frozenset({"node_modules", "__pycache__", "venv", "build", "dist"})
+# Fewer changed stores than this are loaded in this process: starting worker processes
+# costs more than loading a store or two.
+POOL_MIN_STORES = 3
+
+
+def discover_projects(root: Union[str, Path]) -> List[str]:
+    """
+    Finds the projects under a root: the directories that hold a .taskory directory.
+
+    Hidden directories and SKIPPED_DIRS are not searched; projects nested in other
+    projects are found too.
+    Args:
+        root (str | Path): The workspace root (e.g. a monorepo).
+    Returns:
+        List[str]: The projects' paths relative to root, in POSIX form ("." for the root
+            itself), sorted.
+    """
+    root = Path(root)
+    found = []
+    for directory, subdirs, _ in os.walk(root):
+        if TASKS_DIR in subdirs:
+            found.append(Path(directory).relative_to(root).as_posix())
+        subdirs[:] = [name for name in subdirs if not name.startswith(".") and name not in SKIPPED_DIRS]
+    return sorted(found)
+
+
+def project_version(tasks_dir: Union[str, Path]) -> Optional[str]:
+    """
+    Identifies the state of a project's store without loading it: its configured
+    storage and that storage's version (see workspace.store_version).
+    Args:
+        tasks_dir (str | Path): The project's .taskory directory.
+    Returns:
+        Optional[str]: The version, or None if it cannot be told (always reloaded).
+    """
+    from taskory.commands.workspace import store_version
+    config = load_config(Path(tasks_dir) / CONFIG_FILE)
+    version = store_version(tasks_dir, config)
+    return json.dumps([config.get("storage", "json"), version]) if version is not None else None
+
+
+def load_project(tasks_dir: str) -> Tuple[Optional[str], bytes]:
+    """
+    Loads one project's tasks, as a worker process does, without writing to its
+    .taskory directory (see workspace.read_tasks).
+
+    The version is read before the tasks, so a write that lands while they load makes
+    the next refresh load them again.
+    Args:
+        tasks_dir (str): The project's .taskory directory.
+    Returns:
+        Tuple[Optional[str], bytes]: The store version and the encoded TaskTable.
+    Raises:
+        ValueError: If the store cannot be loaded.
+    """
+    from taskory.commands.workspace import read_tasks
+    version = project_version(tasks_dir)
+    try:
+        tasks = read_tasks(tasks_dir, load_config(Path(tasks_dir) / CONFIG_FILE))
+        return version, TaskTable.from_tasks(tasks).to_bytes()
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{tasks_dir}: {e}") from e
+
+
+class ReadOnlyBackend(StorageBackend):
+    """
+    Backend of the merged workspace store: it hands over a ready table and refuses
+    writes, which belong in each project's own store.
+    """
+    def __init__(self, table: TaskTable) -> None:
+        self.table = table
+
+    def exists(self) -> bool:
+        return True
+
+    def load(self) -> List[Task]:
+        return list(self.table.values())
+
+    def load_table(self) -> Optional[TaskTable]:
+        return self.table
+
+    def write(self, tasks: Dict[UUID, Task], changes: List[Change]) -> None:
+        raise ValueError("The workspace view is read-only; change tasks in their own project.")
+
+
+class WorkspaceIndex:
+    """
+    Merged view of the task stores of every project under a root.
+
+    Each project's tasks are cached as an encoded TaskTable in <root>/.taskory-workspace/,
+    together with the version of the store they were loaded from, and all of them are
+    merged into one table there as well. refresh() only reloads the projects whose
+    store version changed, in parallel worker processes when there are several, and
+    rebuilds the merged table only when something changed. Queries run on an in-memory
+    TaskStore over the merged table, so list filters and next_task work across projects.
+    """
+    def __init__(self, root: Union[str, Path], workers: Optional[int] = None) -> None:
+        """
+        Args:
+            root (str | Path): The workspace root.
+            workers (Optional[int]): Largest number of worker processes (default: the
+                number of CPUs).
+        """
+        self.root = Path(root)
+        self.directory = self.root / INDEX_DIR
+        self.workers = workers
+        self.store: Optional[TaskStore] = None
+        # Project of each task id, and the projects that could not be loaded.
+        self.projects: Dict[UUID, str] = {}
+        self.errors: Dict[str, str] = {}
+
+    def _entry_path(self, project: str) -> Path:
+        return self.directory / (hashlib.sha1(project.encode("utf-8")).hexdigest() + ".tbl")
+
+    def _read_manifest(self) -> dict:
+        try:
+            manifest = json.loads((self.directory / MANIFEST_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get("format") == FORMAT else {}
+
+    def refresh(self) -> List[str]:
+        """
+        Brings the merged view up to date with the stores on disk.
+        Returns:
+            List[str]: The projects that were (re)loaded; empty when the cached index
+                was current.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.directory / "workspace.lock"):
+            manifest = self._read_manifest()
+            known = manifest.get("projects", {})
+            projects = discover_projects(self.root)
+            versions = {project: project_version(self.root / project / TASKS_DIR) for project in projects}
+            stale = [project for project in projects
+                     if versions[project] is None or known.get(project) != versions[project]
+                     or not self._entry_path(project).exists()]
+            table = None
+            if not stale and list(known) == projects:
+                table = self._read_merged(manifest)
+            if table is None:
+                loaded = self._load(stale)
+                recorded = {project: known[project] for project in projects
+                            if project not in stale and project in known}
+                recorded.update(loaded)
+                table, owners = self._merge([project for project in projects if project in recorded])
+                atomic_write(self.directory / MERGED_FILE, table.to_bytes())
+                manifest = {"format": FORMAT, "projects": recorded, "owners": owners}
+                atomic_write(self.directory / MANIFEST_FILE, json.dumps(manifest))
+                for project in set(known) - set(recorded):
+                    self._entry_path(project).unlink(missing_ok=True)
+            else:
+                stale = []
+        owners = manifest["owners"]
+        self.projects = dict(zip(table, chain.from_iterable(repeat(name, count) for name, count in owners)))
+        self.store = TaskStore(backend=ReadOnlyBackend(table))
+        return stale
+
+    def _read_merged(self, manifest: dict) -> Optional[TaskTable]:
+        try:
+            table = TaskTable.from_bytes((self.directory / MERGED_FILE).read_bytes())
+        except (OSError, ValueError):
+            return None
+        return table if len(table) == sum(count for _, count in manifest.get("owners", ())) else None
+
+    def _load(self, projects: List[str]) -> Dict[str, Optional[str]]:
+        # Loads the projects' stores and caches their tables; returns their versions.
+        self.errors = {}
+        tasks_dirs = [str(self.root / project / TASKS_DIR) for project in projects]
+        if len(projects) >= POOL_MIN_STORES and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(load_project, tasks_dir) for tasks_dir in tasks_dirs]
+                results = []
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except ValueError as e:
+                        results.append(e)
+        else:
+            results = []
+            for tasks_dir in tasks_dirs:
+                try:
+                    results.append(load_project(tasks_dir))
+                except ValueError as e:
+                    results.append(e)
+        versions = {}
+        for project, result in zip(projects, results):
+            if isinstance(result, Exception):
+                # Reason: one broken store should not hide the others; it is left out
+                # of the index and tried again by the next refresh.
+                self.errors[project] = str(result)
+                continue
+            version, encoded = result
+            atomic_write(self._entry_path(project), encoded)
+            versions[project] = version
+        return versions
+
+    def _merge(self, projects: List[str]) -> Tuple[TaskTable, List[list]]:
+        # Joins the cached tables in project order; an id found in two projects (a
+        # copied store) is kept in the first.
+        merged = TaskTable()
+        owners = []
+        for project in projects:
+            table = TaskTable.from_bytes(self._entry_path(project).read_bytes())
+            added = 0
+            for task in table.values():
+                if task.id not in merged:
+                    merged.append(task)
+                    added += 1
+            owners.append([project, added])
+        return merged, owners
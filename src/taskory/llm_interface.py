@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from taskory.commands.locking import atomic_write, evict_least_recent
+
+# Interface to the language models behind `taskory parse`: providers, a concurrent
+# client with retries, and the on-disk response cache (.taskory/llm_cache/).
+
+CACHE_DIR = "llm_cache"
+CACHE_SUFFIX = ".txt"
+# Total size of the cached responses; the least recently used are removed past it.
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+# Seconds before the first retry; each further retry waits twice as long.
+DEFAULT_BACKOFF = 0.5
+# Prompts end with this line followed by their input as one JSON object, so that
+# responses (and the stub provider) can rely on it.
+INPUT_MARKER = "Input (JSON):"
+
+
+class LLMError(RuntimeError):
+    """
+    Raised when a model request fails for good (bad request, unusable response).
+    """
+
+
+class TransientLLMError(LLMError):
+    """
+    Raised by providers for failures worth retrying (rate limits, timeouts, 5xx).
+    """
+
+
+class LLMProvider:
+    """
+    A model endpoint. Subclasses implement complete().
+    """
+    name = "provider"
+
+    async def complete(self, prompt: str, model: str) -> str:
+        """
+        Sends one prompt to the model.
+
+        Args:
+            prompt (str): The prompt.
+            model (str): The model name.
+
+        Returns:
+            str: The model's reply.
+
+        Raises:
+            TransientLLMError: If the request may succeed when retried.
+            LLMError: If it will not.
+        """
+        raise NotImplementedError
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic local provider for tests, benchmarks and offline use.
+
+    For a prompt whose input holds a "goal" (see commands.planning), it answers with
+    one to three steps derived from the goal's title, the count depending only on the
+    title; other prompts get an echo of their hash. The same prompt always gets the same
+    reply.
+    """
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, failures: int = 0) -> None:
+        """
+        Args:
+            latency (float): Seconds each request takes, to simulate a remote model.
+            failures (int): Transient failures of each prompt before it succeeds, to
+                exercise retries.
+        """
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+        self._failed: Dict[str, int] = {}
+
+    async def complete(self, prompt: str, model: str) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        if self._failed.get(digest, 0) < self.failures:
+            self._failed[digest] = self._failed.get(digest, 0) + 1
+            raise TransientLLMError("stub failure")
+        try:
+            goal = json.loads(prompt.rsplit(INPUT_MARKER, 1)[1])["goal"]
+        except (IndexError, KeyError, TypeError, ValueError):
+            return json.dumps({"echo": digest})
+        title = goal["title"]
+        steps = [f"Design {title}", f"Implement {title}", f"Test {title}"]
+        count = 1 + int(hashlib.sha256(title.encode("utf-8")).hexdigest(), 16) % len(steps)
+        tasks = [{"title": step, "priority": goal.get("priority") or 2, "tags": goal.get("tags"),
+                  "depends_on": [number - 1] if number else []}
+                 for number, step in enumerate(steps[-count:])]
+        return json.dumps({"tasks": tasks})
+
+
+PROVIDERS = {"stub": StubProvider}
+
+
+def open_provider(name: str) -> LLMProvider:
+    """
+    Creates a provider by name.
+
+    Args:
+        name (str): The provider name from taskory.config.
+
+    Returns:
+        LLMProvider: The provider.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    factory = PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown LLM provider: {name} (choose from {', '.join(PROVIDERS)})")
+    return factory()
+
+
+def cache_key(provider: str, model: str, prompt: str) -> str:
+    """
+    Content address of a response: the hash of everything that determines it.
+
+    Args:
+        provider (str): The provider name.
+        model (str): The model name.
+        prompt (str): The prompt.
+
+    Returns:
+        str: The key (hex digits).
+    """
+    request = json.dumps([provider, model, prompt], ensure_ascii=False)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Model responses stored on disk by content address (.taskory/llm_cache/<key>.txt),
+    so a prompt already answered by the same provider and model is not sent again.
+    Entries are touched when read and the least recently used are removed once the
+    directory outgrows max_bytes.
+    """
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        """
+        Args:
+            directory (str | Path): The cache directory (created on first write).
+            max_bytes (int): Size past which the least recently used entries are removed.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            response = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Stores a response. A cache that cannot be written is skipped.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(self._path(key), response)
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the directory fits max_bytes.
+        """
+        evict_least_recent(self.directory, f"*{CACHE_SUFFIX}", self.max_bytes)
+
+
+class LLMClient:
+    """
+    Sends prompts to a provider concurrently, at most `concurrency` at a time, retrying
+    transient failures with exponential backoff and answering repeated prompts from
+    the response cache. Identical prompts in one batch are sent once.
+    """
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str,
+        cache: Optional[ResponseCache] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            provider (LLMProvider): The model endpoint.
+            model (str): The model name.
+            cache (Optional[ResponseCache]): The response cache, if any.
+            concurrency (int): Largest number of requests in flight.
+            retries (int): Retries of a request after a transient failure or timeout.
+            backoff (float): Seconds before the first retry, doubled for each next one.
+            timeout (Optional[float]): Seconds after which a request counts as failed.
+
+        Raises:
+            ValueError: If concurrency is below 1 or retries is negative.
+        """
+        if concurrency < 1 or retries < 0:
+            raise ValueError("concurrency must be at least 1 and retries at least 0.")
+        self.provider = provider
+        self.model = model
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache_hits = 0
+
+    async def complete_many(self, prompts: Iterable[str]) -> List[str]:
+        """
+        Answers prompts, sending those not in the cache to the provider in parallel.
+
+        Args:
+            prompts (Iterable[str]): The prompts.
+
+        Returns:
+            List[str]: The responses, in prompt order.
+
+        Raises:
+            LLMError: If a request still fails after its retries; the other requests
+                are cancelled.
+        """
+        prompts = list(prompts)
+        keys = [cache_key(self.provider.name, self.model, prompt) for prompt in prompts]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        requests: Dict[str, asyncio.Future] = {}
+        for key, prompt in zip(keys, prompts):
+            if key not in requests:
+                requests[key] = asyncio.ensure_future(self._answer(key, prompt, semaphore))
+        try:
+            await asyncio.gather(*requests.values())
+        except BaseException:
+            for request in requests.values():
+                request.cancel()
+            raise
+        finally:
+            if self.cache is not None:
+                self.cache.evict()
+        return [requests[key].result() for key in keys]
+
+    async def complete(self, prompt: str) -> str:
+        """
+        Answers one prompt (see complete_many).
+        """
+        return (await self.complete_many([prompt]))[0]
+
+    async def _answer(self, key: str, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        async with semaphore:
+            response = await self._request(prompt)
+        if self.cache is not None:
+            self.cache.put(key, response)
+        return response
+
+    async def _request(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.wait_for(self.provider.complete(prompt, self.model), self.timeout)
+            except (TransientLLMError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise LLMError(f"{self.provider.name} request failed after {attempt + 1} attempts: {e!r}") from e
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+
+def open_client(directory: Union[str, Path], config: dict) -> LLMClient:
+    """
+    Creates the client configured for a .taskory directory.
+
+    Args:
+        directory (str | Path): The .taskory directory, which holds llm_cache/.
+        config (dict): Its taskory.config settings; the "llm" object may set
+            "provider", "model", "concurrency", "retries", "timeout", "cache"
+            (default true) and "cache_mb".
+
+    Returns:
+        LLMClient: The client.
+
+    Raises:
+        ValueError: If no provider is configured or it is unknown.
+    """
+    settings = config.get("llm") or {}
+    name = settings.get("provider")
+    if not name:
+        raise ValueError('No LLM provider configured; set "llm": {"provider": ...} in taskory.config.')
+    provider = open_provider(name)
+    model = settings.get("model") or os.environ.get("TASKORY_DEFAULT_MODEL") or name
+    cache = None
+    if settings.get("cache", True):
+        cache_mb = settings.get("cache_mb")
+        max_bytes = int(cache_mb * 1024 * 1024) if cache_mb is not None else DEFAULT_CACHE_BYTES
+        cache = ResponseCache(Path(directory) / CACHE_DIR, max_bytes)
+    return LLMClient(
+        provider,
+        model,
+        cache=cache,
+        concurrency=int(settings.get("concurrency", DEFAULT_CONCURRENCY)),
+        retries=int(settings.get("retries", DEFAULT_RETRIES)),
+        timeout=settings.get("timeout"),
+    )
@@ -33,6 +33,7 @@ class Task(BaseModel):
         priority (Optional[TaskPriority]): Priority of the task.
         assignee (Optional[str]): Person assigned to the task.
         tags (Optional[List[str]]): Tags associated with the task.
+        depends_on (Optional[List[UUID]]): IDs of tasks that must be done before this one.
 
     Returns:
         Task: A validated Task object.
@@ -45,9 +46,49 @@ class Task(BaseModel):
     priority: Optional[TaskPriority] = None
     assignee: Optional[str] = None
     tags: Optional[List[str]] = None
+    depends_on: Optional[List[UUID]] = None
 
     @field_validator("updated_at", mode="before")
     @classmethod
     def set_updated_at(cls, v, values):
         # Reason: Ensure updated_at is set to created_at if not provided
-        return v or values.data.get("created_at") or datetime.now(UTC) 
\ No newline at end of file
+        return v or values.data.get("created_at") or datetime.now(UTC) 
+
+class Goal(BaseModel):
+    """
+    A goal in planning.json, which `taskory parse` turns into tasks.
+
+    Args:
+        title (str): What the goal is.
+        description (Optional[str]): More detail for the model.
+        priority (Optional[TaskPriority]): Priority of the tasks made for it.
+        tags (Optional[List[str]]): Tags of the tasks made for it.
+    """
+    title: str
+    description: Optional[str] = None
+    priority: Optional[TaskPriority] = None
+    tags: Optional[List[str]] = None
+
+
+class Planning(BaseModel):
+    """
+    The project plan in planning.json.
+
+    Args:
+        project (dict): Project details, such as its name.
+        goals (List[Goal]): The goals; a plain string is a goal with only a title.
+        scope (Optional[str]): What the project covers.
+        constraints (Optional[List[str]]): Limits the tasks must respect.
+    """
+    project: dict = Field(default_factory=dict)
+    goals: List[Goal]
+    scope: Optional[str] = None
+    constraints: Optional[List[str]] = None
+
+    @field_validator("goals", mode="before")
+    @classmethod
+    def goals_from_strings(cls, v):
+        # Reason: short plans list goals as plain strings.
+        if isinstance(v, list):
+            return [{"title": item} if isinstance(item, str) else item for item in v]
+        return v
@@ -0,0 +1,77 @@
+import sys
+import asyncio
+import json
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.async_store import AsyncTaskStore
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task, TaskStatus
+
+
+def count_writes(store: AsyncTaskStore) -> list:
+    calls = []
+    original = store.store.backend.write
+
+    def write(tasks, changes):
+        calls.append(len(changes))
+        original(tasks, changes)
+
+    store.store.backend.write = write
+    return calls
+
+
+def test_burst_of_mutations_is_written_once(tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        store = await AsyncTaskStore.open(str(path), debounce=0.05)
+        writes = count_writes(store)
+        for i in range(50):
+            await store.add_task(Task(title=f"Task {i}"))
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+        assert writes == [50]
+        await store.aclose()
+
+    asyncio.run(scenario())
+    assert len(json.loads(path.read_text())) == 50
+
+
+def test_flush_makes_changes_durable(tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        async with await AsyncTaskStore.open(str(path), debounce=60) as store:
+            task = Task(title="Durable")
+            await store.add_task(task)
+            await store.update_task(task.id, status=TaskStatus.done)
+            await store.flush()
+            assert TaskStore.load_from_file(str(path)).get_task_by_id(task.id).status == TaskStatus.done
+            await store.delete_task(task.id)
+        with pytest.raises(RuntimeError):
+            await store.add_task(Task(title="Too late"))
+
+    asyncio.run(scenario())
+    assert json.loads(path.read_text()) == []
+
+
+def test_failed_background_write_is_reported_and_retried(tmp_path):
+    path = tmp_path / "tasks.json"
+
+    async def scenario():
+        store = await AsyncTaskStore.open(str(path), debounce=0.01)
+        original = store.store.backend.write
+        store.store.backend.write = lambda tasks, changes: (_ for _ in ()).throw(OSError("disk full"))
+        await store.add_task(Task(title="Kept"))
+        await asyncio.sleep(0.1)
+        store.store.backend.write = original
+        with pytest.raises(OSError, match="disk full"):
+            await store.flush()
+        await store.aclose()
+
+    asyncio.run(scenario())
+    assert [item["title"] for item in json.loads(path.read_text())] == ["Kept"]
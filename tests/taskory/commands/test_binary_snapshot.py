@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.binary_snapshot import encode_tasks, decode_tasks, binary_path_for
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+def sample_tasks():
+    return [
+        Task(title="Plain"),
+        Task(title="Tagged ✓", status=TaskStatus.in_progress, priority=TaskPriority.high,
+             assignee="jeff", tags=["a", "b", "a"]),
+        Task(title="Empty tags", status=TaskStatus.done, tags=[], assignee="jeff"),
+        Task(
+            title="Other zones",
+            created_at=datetime(1969, 7, 20, 20, 17, 40, 123456),
+            updated_at=datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+        ),
+        Task(title="Waiting", depends_on=[UUID(int=1), UUID(int=2)]),
+    ]
+
+
+def test_round_trip_is_lossless():
+    tasks = sample_tasks()
+    decoded = decode_tasks(encode_tasks(tasks))
+    assert [t.model_dump() for t in decoded] == [t.model_dump() for t in tasks]
+    assert decoded[3].created_at.tzinfo is None
+    assert decoded[3].updated_at.utcoffset() == timedelta(hours=-5, minutes=-30)
+
+
+def test_json_and_binary_convert_losslessly(tmp_path):
+    store = TaskStore()
+    for task in sample_tasks():
+        store.add_task(task)
+    store.save_binary(str(tmp_path / "tasks.bin"))
+    TaskStore.load_from_binary(str(tmp_path / "tasks.bin")).save_to_file(str(tmp_path / "tasks.json"))
+    reloaded = TaskStore.load_from_file(str(tmp_path / "tasks.json"))
+    reloaded.save_binary(str(tmp_path / "again.bin"))
+    assert (tmp_path / "again.bin").read_bytes() == (tmp_path / "tasks.bin").read_bytes()
+    assert reloaded.list_tasks(assignee="jeff")[0].title == "Tagged ✓"
+
+
+def test_binary_is_smaller_than_json(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.json"), binary=True)
+    with store.batch():
+        for i in range(200):
+            store.add_task(Task(title=f"Task {i}", assignee="jeff", tags=["backend", "v2"]))
+    assert binary_path_for(tmp_path / "tasks.json").stat().st_size * 3 < (tmp_path / "tasks.json").stat().st_size
+
+
+def test_store_prefers_binary_only_while_it_is_newer(tmp_path):
+    path = tmp_path / "tasks.json"
+    store = TaskStore(str(path), binary=True)
+    store.add_task(Task(title="Original"))
+    assert TaskStore(str(path), binary=True).list_tasks()[0].title == "Original"
+
+    data = json.loads(path.read_text())
+    data[0]["title"] = "Edited by hand"
+    path.write_text(json.dumps(data))
+    stat = binary_path_for(path).stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert TaskStore(str(path), binary=True).list_tasks()[0].title == "Edited by hand"
+
+
+def test_rejects_foreign_or_truncated_data():
+    raw = encode_tasks(sample_tasks())
+    with pytest.raises(ValueError, match="Not a taskory"):
+        decode_tasks(b"XXXX" + raw[4:])
+    with pytest.raises(ValueError, match="Corrupt"):
+        decode_tasks(raw[:-3])
@@ -0,0 +1,135 @@
+import sys
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.bulk import parse_age, parse_assignments, parse_where
+from taskory.commands.daemon import TaskService
+from taskory.commands.mapped_store import MappedTaskStore
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+runner = CliRunner()
+
+
+def test_parsers():
+    assert parse_age("90d") == timedelta(days=90)
+    assert parse_age("2W") == timedelta(weeks=2) and parse_age("30m") == timedelta(minutes=30)
+    assert parse_where(["status=in_progress", "tag=api", "tag=sprint-12", "min-priority=high"]) == {
+        "status": TaskStatus.in_progress, "tags": ["api", "sprint-12"], "min_priority": 3}
+    assert parse_assignments(["status=done", "tags=a, b", "assignee=", "priority=low"]) == {
+        "status": TaskStatus.done, "tags": ["a", "b"], "assignee": None, "priority": 1}
+    for bad in ("90", "d", "-1d", "3y"):
+        with pytest.raises(ValueError, match="Invalid age"):
+            parse_age(bad)
+    with pytest.raises(ValueError, match="expected key=value"):
+        parse_where(["status"])
+    with pytest.raises(ValueError, match="Invalid --where key"):
+        parse_where(["colour=red"])
+    with pytest.raises(ValueError, match="given twice"):
+        parse_where(["status=todo", "status=done"])
+    with pytest.raises(ValueError, match="Invalid status"):
+        parse_assignments(["status=later"])
+    with pytest.raises(ValueError, match="title cannot be empty"):
+        parse_assignments(["title="])
+
+
+def make_store(store):
+    old = datetime.now(UTC) - timedelta(days=120)
+    tasks = [
+        Task(title="Old done", status=TaskStatus.done, updated_at=old),
+        Task(title="New done", status=TaskStatus.done),
+        Task(title="Busy api", status=TaskStatus.in_progress, tags=["api", "sprint-12"]),
+        Task(title="Busy web", status=TaskStatus.in_progress, tags=["web"]),
+    ]
+    for task in tasks:
+        store.add_task(task)
+    return store
+
+
+@pytest.mark.parametrize("kind", ["json", "mapped"])
+def test_update_and_delete_where(tmp_path, kind):
+    if kind == "json":
+        store = make_store(TaskStore(str(tmp_path / "tasks.json")))
+        writes = []
+        store.write_listeners.append(writes.append)
+    else:
+        store = make_store(MappedTaskStore(tmp_path / "tasks.map"))
+        writes = None
+
+    matched = store.update_where({"status": TaskStatus.done}, dry_run=True, status=TaskStatus.in_progress)
+    assert sorted(t.title for t in matched) == ["Busy api", "Busy web"]
+    assert len(store.list_tasks(status=TaskStatus.in_progress)) == 2
+
+    updated = store.update_where({"status": TaskStatus.done, "priority": TaskPriority.high},
+                                 status=TaskStatus.in_progress, tags=["sprint-12"])
+    assert [t.title for t in updated] == ["Busy api"]
+    assert store.get_task_by_id(updated[0].id).priority == TaskPriority.high
+    assert len(store.list_tasks(status=TaskStatus.done)) == 3
+    if writes is not None:
+        # The whole update is one write.
+        assert len(writes) == 1 and len(writes[0]) == 1
+
+    stale = store.delete_where(older_than=timedelta(days=90), dry_run=True, status=TaskStatus.done)
+    assert [t.title for t in stale] == ["Old done"]
+    assert len(store.list_tasks()) == 4
+    deleted = store.delete_where(older_than=timedelta(days=90), status=TaskStatus.done)
+    assert [t.title for t in deleted] == ["Old done"]
+    assert sorted(t.title for t in store.list_tasks()) == ["Busy api", "Busy web", "New done"]
+    assert store.delete_where(status=TaskStatus.todo) == []
+
+    with pytest.raises(ValueError, match="Nothing to set"):
+        store.update_where({}, status=TaskStatus.done)
+    with pytest.raises(ValueError):
+        store.update_where({"colour": "red"}, status=TaskStatus.done)
+    # A failed update changes nothing.
+    assert len(store.list_tasks(status=TaskStatus.done)) == 2
+
+
+def test_daemon_service_ops(tmp_path):
+    service = TaskService(make_store(TaskStore(str(tmp_path / "tasks.json"))))
+    reply = service.handle({"op": "update_where", "fields": {"status": "done"}, "older_than": None,
+                            "dry_run": False, "filters": {"status": "in_progress", "tags": ["web"]}})
+    assert [t["title"] for t in reply["result"]] == ["Busy web"]
+    reply = service.handle({"op": "update_where", "fields": {"colour": "red"}, "filters": {}})
+    assert reply == {"ok": False, "error": "Invalid field: colour", "kind": "ValueError"}
+    reply = service.handle({"op": "delete_where", "older_than": 90 * 86400, "dry_run": False,
+                            "filters": {"status": "done"}})
+    assert [t["title"] for t in reply["result"]] == ["Old done"]
+    assert len(service.store.list_tasks()) == 3
+
+
+def test_cli_bulk(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        store = make_store(TaskStore(str(tmp_path / "tasks.json")))
+        task_id = str(store.list_tasks()[0].id)
+        result = runner.invoke(cli.app, ["update", "--where", "status=in_progress", "--where", "tag=api",
+                                         "--set", "status=done", "--set", "assignee=iris"])
+        assert result.exit_code == 0 and "Updated 1 tasks." in result.output
+        result = runner.invoke(cli.app, ["delete", "--where", "status=done", "--older-than", "90d", "--dry-run"])
+        assert result.exit_code == 0 and "Would delete 1 tasks (dry run)." in result.output
+        assert len(TaskStore.load_from_file(str(tmp_path / "tasks.json")).list_tasks()) == 4
+        result = runner.invoke(cli.app, ["delete", "--where", "status=done", "--older-than", "90d"])
+        assert "Deleted 1 tasks." in result.output
+        result = runner.invoke(cli.app, ["update", "--where", "tag=web", "--status", "done"])
+        assert "Updated 1 tasks." in result.output
+        tasks = TaskStore.load_from_file(str(tmp_path / "tasks.json")).list_tasks()
+        assert sorted((t.title, t.status.value, t.assignee) for t in tasks) == [
+            ("Busy api", "done", "iris"), ("Busy web", "done", None), ("New done", "done", None)]
+
+        for args, message in (
+            (["update", task_id, "--where", "status=done", "--set", "status=todo"], "not both"),
+            (["update", "--set", "status=todo"], "--where or --older-than"),
+            (["update", "--where", "status=done"], "Nothing to set"),
+            (["delete", "--where", "colour=red"], "Invalid --where key"),
+            (["delete", "--older-than", "soon"], "Invalid age"),
+        ):
+            result = runner.invoke(cli.app, args)
+            assert result.exit_code != 0 and message in result.output, args
@@ -0,0 +1,121 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.change_feed import FEED_FILE, ChangeFeed, FeedGapError
+from taskory.commands.task_store import TaskStore
+from taskory.commands.workspace import open_store
+from taskory.schemas import Task, TaskStatus
+
+runner = CliRunner()
+
+
+def test_feed_append_read_and_trim(tmp_path):
+    feed = ChangeFeed(tmp_path / FEED_FILE, max_bytes=2000)
+    task = Task(title="Logged")
+    assert feed.append([("add", task.id, task)]) == 0  # off until enabled
+    feed.enable()
+    assert feed.head() == 0 and list(feed.read()) == []
+    assert feed.append([("add", task.id, task), ("delete", task.id, None)]) == 2
+    events = list(feed.read())
+    assert [(e.seq, e.op, e.id) for e in events] == [(1, "add", str(task.id)), (2, "delete", str(task.id))]
+    assert events[0].task["title"] == "Logged" and events[1].task is None
+    # A consumer polling from its last position reads only what was appended since.
+    feed.append([("update", task.id, task)])
+    assert [e.seq for e in feed.read(2)] == [3] and list(feed.read(3)) == []
+    # A torn write is skipped and the next append starts on a new line.
+    with open(feed.path, "ab") as f:
+        f.write(b'{"seq":4,"op":"upd')
+    assert feed.append([("update", task.id, task)]) == 5
+    assert [e.seq for e in ChangeFeed(feed.path).read(3)] == [5]
+
+    for _ in range(20):
+        feed.append([("update", task.id, task)])
+    # Only the newer half is kept once the feed outgrows max_bytes.
+    assert feed.path.stat().st_size <= 2000
+    oldest = json.loads(feed.path.read_bytes().splitlines()[0])["seq"]
+    assert oldest > 5 and [e.seq for e in ChangeFeed(feed.path).read(oldest - 1)][-1] == feed.head() == 25
+    with pytest.raises(FeedGapError):
+        ChangeFeed(feed.path).read(1)
+    with pytest.raises(FeedGapError):
+        ChangeFeed(feed.path).read(feed.head() + 10)
+
+
+@pytest.mark.parametrize("config", [{}, {"journal": True}, {"storage": "sqlite"}, {"storage": "sharded"}])
+def test_store_changes_and_catch_up(tmp_path, config):
+    ChangeFeed(tmp_path / FEED_FILE).enable()
+    reader = open_store(tmp_path, config)
+    writer = open_store(tmp_path, config)
+    kept, gone = Task(title="Kept"), Task(title="Gone")
+    with writer.batch():
+        writer.add_task(kept)
+        writer.add_task(gone)
+    writer.update_task(kept.id, status=TaskStatus.done)
+    writer.delete_task(gone.id)
+    assert [(e.seq, e.op) for e in writer.changes()] == [(1, "add"), (2, "add"), (3, "update"), (4, "delete")]
+    assert [e.seq for e in reader.changes(since=3)] == [4]
+
+    assert reader.list_tasks() == []
+    assert reader.catch_up() == 4
+    assert [(t.title, t.status) for t in reader.list_tasks()] == [("Kept", TaskStatus.done)]
+    assert reader.feed_position == 4 and reader.catch_up() == 0
+    # The reader can still write after catching up, without merging by a full reload;
+    # its change follows the others and is not replayed to it.
+    with patch.object(reader, "_rebase", side_effect=AssertionError("reloaded")):
+        reader.update_task(kept.id, title="Kept and renamed")
+    assert [(e.seq, e.task["title"]) for e in reader.changes(since=4)] == [(5, "Kept and renamed")]
+    assert reader.feed_position == 5 and reader.catch_up() == 0
+    assert writer.catch_up() == 1 and writer.feed_position == 5
+    with patch.object(writer, "_rebase", side_effect=AssertionError("reloaded")):
+        writer.add_task(Task(title="Third"))
+    assert sorted(t.title for t in open_store(tmp_path, config).list_tasks()) == ["Kept and renamed", "Third"]
+
+
+def test_catch_up_after_gap_reloads(tmp_path):
+    store = open_store(tmp_path, {})
+    store.add_task(Task(title="Before the feed"))
+    with pytest.raises(ValueError, match="no change feed"):
+        TaskStore().catch_up()
+    ChangeFeed(tmp_path / FEED_FILE).enable()
+    store.add_task(Task(title="After"))
+    reader = open_store(tmp_path, {})
+    assert reader.feed_position == 1
+    store.add_task(Task(title="Lost"))
+    (tmp_path / FEED_FILE).write_text("")  # the feed was recreated
+    assert reader.catch_up() == -1
+    assert sorted(t.title for t in reader.list_tasks()) == ["After", "Before the feed", "Lost"]
+    with pytest.raises(ValueError, match="unwritten"):
+        with reader.batch():
+            reader.add_task(Task(title="Pending"))
+            reader.catch_up()
+
+
+def test_cli_watch(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        runner.invoke(cli.app, ["new", "First"])
+        result = runner.invoke(cli.app, ["watch", "--once"])
+        assert result.exit_code == 0
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [(e["seq"], e["op"]) for e in events] == [(0, "reset"), (0, "add")]
+        assert events[1]["task"]["title"] == "First"
+        runner.invoke(cli.app, ["new", "Second"])
+        runner.invoke(cli.app, ["update", events[1]["id"], "--status", "done"])
+        result = runner.invoke(cli.app, ["watch", "--since", "0", "--once"])
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [(e["seq"], e["op"]) for e in events] == [(1, "add"), (2, "update")]
+        assert events[1]["task"]["status"] == "done"
+        assert runner.invoke(cli.app, ["watch", "--since", "2", "--once"]).output == ""
+        # A position the feed does not hold gets a fresh snapshot.
+        result = runner.invoke(cli.app, ["watch", "--since", "50", "--once"])
+        assert [json.loads(line)["op"] for line in result.output.splitlines()] == ["reset", "add", "add"]
+        (tmp_path / "taskory.config").write_text('{"storage": "mapped"}')
+        result = runner.invoke(cli.app, ["watch", "--once"])
+        assert result.exit_code != 0 and "mapped" in result.output
@@ -1,8 +1,11 @@
+import os
+import subprocess
 import sys
 from pathlib import Path
 import pytest
 from typer.testing import CliRunner
 import tempfile
+import json
 from unittest.mock import patch
 
 # Add /src to sys.path
@@ -93,4 +96,163 @@ def test_delete_command():
             # Try deleting with an invalid ID
             result = runner.invoke(cli.app, ["delete", "bad-id"])
             assert result.exit_code != 0
-            assert "Invalid UUID string" in result.output or "not found" in result.output 
\ No newline at end of file
+            assert "Invalid UUID string" in result.output or "not found" in result.output 
+
+
+def test_import_command():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file):
+            import_file = temp_tasks_dir / "import.json"
+            import_file.write_text(json.dumps([{"title": f"Imported {i}", "priority": 2} for i in range(100)]))
+            result = runner.invoke(cli.app, ["import", str(import_file)])
+            assert result.exit_code == 0
+            assert "Imported 100 tasks" in result.output
+            assert len(json.loads(temp_tasks_file.read_text())) == 100
+            # An invalid record aborts the whole import
+            bad_file = temp_tasks_dir / "bad.jsonl"
+            bad_file.write_text('{"title": "Fine"}\n{"status": "todo"}\n')
+            result = runner.invoke(cli.app, ["import", str(bad_file)])
+            assert result.exit_code != 0
+            assert "no tasks were added" in result.output
+            assert len(json.loads(temp_tasks_file.read_text())) == 100
+
+def test_list_filters():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file):
+            import_file = temp_tasks_dir / "import.json"
+            import_file.write_text(json.dumps([
+                {"title": "Alpha", "assignee": "jeff", "tags": ["api"], "priority": 3},
+                {"title": "Beta", "assignee": "jeff", "tags": ["ui"], "priority": 1},
+                {"title": "Gamma", "assignee": "iris", "tags": ["api"], "priority": 2},
+            ]))
+            assert runner.invoke(cli.app, ["import", str(import_file)]).exit_code == 0
+            result = runner.invoke(cli.app, ["list", "--assignee", "jeff", "--tag", "api"])
+            assert result.exit_code == 0
+            assert "Alpha" in result.output and "Beta" not in result.output and "Gamma" not in result.output
+            result = runner.invoke(cli.app, ["list", "--min-priority", "medium"])
+            assert "Alpha" in result.output and "Gamma" in result.output and "Beta" not in result.output
+            result = runner.invoke(cli.app, ["list", "--priority", "urgent"])
+            assert result.exit_code != 0
+            assert "Invalid priority" in result.output
+
+def test_migrate_between_backends():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        temp_config_file = temp_tasks_dir / "taskory.config"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file), \
+                patch.object(cli, "CONFIG_FILE", temp_config_file):
+            assert runner.invoke(cli.app, ["new", "Travelling task"]).exit_code == 0
+            result = runner.invoke(cli.app, ["migrate", "--to", "sqlite"])
+            assert result.exit_code == 0
+            assert "Migrated 1 tasks from json to sqlite" in result.output
+            assert json.loads(temp_config_file.read_text())["storage"] == "sqlite"
+            assert runner.invoke(cli.app, ["new", "Stored in sqlite"]).exit_code == 0
+            assert len(json.loads(temp_tasks_file.read_text())) == 1
+            result = runner.invoke(cli.app, ["migrate", "--to", "json"])
+            assert result.exit_code == 0
+            assert len(json.loads(temp_tasks_file.read_text())) == 2
+            result = runner.invoke(cli.app, ["migrate", "--to", "csv"])
+            assert result.exit_code != 0
+            assert "Invalid storage" in result.output
+
+def test_dependencies_and_next():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file):
+            result = runner.invoke(cli.app, ["next"])
+            assert result.exit_code == 0
+            assert "No unblocked tasks." in result.output
+            assert runner.invoke(cli.app, ["new", "Design"]).exit_code == 0
+            design_id = json.loads(temp_tasks_file.read_text())[0]["id"]
+            result = runner.invoke(cli.app, ["new", "Build", "--depends-on", design_id])
+            assert result.exit_code == 0
+            result = runner.invoke(cli.app, ["next"])
+            assert "Design" in result.output
+            assert runner.invoke(cli.app, ["update", design_id, "--status", "done"]).exit_code == 0
+            result = runner.invoke(cli.app, ["next"])
+            assert "Build" in result.output
+            result = runner.invoke(cli.app, ["new", "Orphan", "--depends-on", "00000000-0000-0000-0000-000000000000"])
+            assert result.exit_code != 0
+            assert "Dependency not found" in result.output
+
+def test_import_and_help_stay_lazy():
+    src = str(Path(__file__).parent.parent.parent.parent / "src")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Importing the CLI must not pull in pydantic or the storage layer.
+        probe = (
+            "import sys, taskory.cli; "
+            "print([m for m in ('pydantic', 'taskory.schemas', 'taskory.commands.task_store', 'sqlite3') "
+            "if m in sys.modules])"
+        )
+        env = {**os.environ, "PYTHONPATH": src}
+        result = subprocess.run([sys.executable, "-c", probe], cwd=tmpdir, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+        # --help must not touch the filesystem (no .taskory directory, no config).
+        result = subprocess.run([sys.executable, "-m", "taskory.cli", "--help"], cwd=tmpdir, env=env,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert "migrate" in result.stdout and "serve" in result.stdout
+        assert os.listdir(tmpdir) == []
+
+def test_plan_focus_and_paged_list():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file):
+            import_file = temp_tasks_dir / "import.json"
+            import_file.write_text(json.dumps([
+                {"title": "Low", "priority": 1, "created_at": "2025-01-01T00:00:00Z"},
+                {"title": "High old", "priority": 3, "created_at": "2025-01-02T00:00:00Z"},
+                {"title": "High new", "priority": 3, "created_at": "2025-01-03T00:00:00Z"},
+                {"title": "Medium", "priority": 2, "created_at": "2025-01-04T00:00:00Z"},
+                {"title": "Busy", "status": "in_progress", "created_at": "2025-01-05T00:00:00Z"},
+            ]))
+            assert runner.invoke(cli.app, ["import", str(import_file)]).exit_code == 0
+            result = runner.invoke(cli.app, ["focus", "--limit", "2"])
+            assert result.exit_code == 0
+            assert "High old" in result.output and "High new" in result.output and "Medium" not in result.output
+            assert result.output.index("High old") < result.output.index("High new")
+            result = runner.invoke(cli.app, ["plan"])
+            assert "Busy" in result.output and "Low" not in result.output
+            result = runner.invoke(cli.app, ["list", "--limit", "3"])
+            assert "Low" in result.output and "Medium" not in result.output
+            cursor = result.output.split("--cursor")[1].split()[0]
+            result = runner.invoke(cli.app, ["list", "--limit", "3", "--cursor", cursor])
+            assert "Medium" in result.output and "Busy" in result.output and "Low" not in result.output
+            assert "--cursor" not in result.output
+            result = runner.invoke(cli.app, ["list", "--sort", "title"])
+            assert result.exit_code != 0
+            assert "Invalid sort field" in result.output
+            result = runner.invoke(cli.app, ["list", "--limit", "0"])
+            assert result.exit_code != 0 and "at least 1" in result.output
+
+
+def test_list_formats():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_tasks_dir = Path(tmpdir)
+        temp_tasks_file = temp_tasks_dir / "tasks.json"
+        with patch.object(cli, "TASKS_DIR", temp_tasks_dir), patch.object(cli, "TASKS_FILE", temp_tasks_file):
+            assert runner.invoke(cli.app, ["new", "Piped, task"]).exit_code == 0
+            result = runner.invoke(cli.app, ["list"])
+            assert result.exit_code == 0
+            task_id, status, title = result.output.strip().split(" | ")
+            assert (status, title) == ("todo", "Piped, task")
+            result = runner.invoke(cli.app, ["list", "--format", "jsonl"])
+            assert json.loads(result.output)["id"] == task_id
+            result = runner.invoke(cli.app, ["list", "--format", "csv", "--status", "todo"])
+            assert result.output.splitlines()[1].startswith(f'{task_id},"Piped, task",todo')
+            result = runner.invoke(cli.app, ["list", "--format", "tsv", "--status", "done"])
+            assert result.output.splitlines() == ["\t".join(["id", "title", "status", "priority", "assignee", "tags",
+                                                             "depends_on", "created_at", "updated_at"])]
+            result = runner.invoke(cli.app, ["focus", "--format", "plain"])
+            assert result.output.strip() == f"{task_id} | todo | Piped, task"
+            result = runner.invoke(cli.app, ["list", "--format", "xml"])
+            assert result.exit_code != 0
+            assert "Invalid format" in result.output
@@ -0,0 +1,102 @@
+import os
+import sys
+import multiprocessing
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.locking import FileLock, atomic_write, lock_path_for
+from taskory.schemas import Task, TaskStatus
+
+WORKERS = 4
+ROUNDS = 15
+
+
+def add_tasks(path: str, journal: bool, worker: int) -> None:
+    # One long-lived store per process, so almost every write finds it stale.
+    store = TaskStore(path, journal=journal)
+    for i in range(ROUNDS):
+        store.add_task(Task(title=f"worker {worker} task {i}"))
+
+
+def increment(path: str, worker: int) -> None:
+    for _ in range(ROUNDS):
+        with FileLock(lock_path_for(path)):
+            store = TaskStore(path)
+            task = store.list_tasks()[0]
+            store.update_task(task.id, title=str(int(task.title) + 1))
+
+
+def run_workers(target, *args) -> None:
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=(*args, worker)) for worker in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("old")
+    atomic_write(path, "new")
+    assert path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.txt"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="needs POSIX permissions")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        atomic_write(tmp_path / "new.txt", "new")
+        assert (tmp_path / "new.txt").stat().st_mode & 0o777 == 0o644
+        shared = tmp_path / "shared.txt"
+        shared.write_text("old")
+        shared.chmod(0o664)
+        atomic_write(shared, "new")
+        assert shared.stat().st_mode & 0o777 == 0o664
+    finally:
+        os.umask(umask)
+
+
+def test_stale_store_merges_instead_of_overwriting(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    first = TaskStore(path)
+    second = TaskStore(path)
+    first.add_task(Task(title="From first"))
+    second.add_task(Task(title="From second"))
+    titles = {task.title for task in TaskStore(path).list_tasks()}
+    assert titles == {"From first", "From second"}
+    assert {task.title for task in second.list_tasks()} == titles
+
+
+def test_update_of_task_deleted_elsewhere_is_dropped(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    task = Task(title="Shared")
+    TaskStore(path).add_task(task)
+    first, second = TaskStore(path), TaskStore(path)
+    first.delete_task(task.id)
+    second.update_task(task.id, status=TaskStatus.done)
+    assert TaskStore(path).list_tasks() == []
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+@pytest.mark.parametrize("journal", [False, True])
+def test_concurrent_writers_lose_no_updates(tmp_path, journal):
+    path = str(tmp_path / "tasks.json")
+    run_workers(add_tasks, path, journal)
+    tasks = TaskStore(path, journal=journal).list_tasks()
+    assert len(tasks) == WORKERS * ROUNDS
+    assert len({task.title for task in tasks}) == WORKERS * ROUNDS
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_locked_read_modify_write_counts_every_increment(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    TaskStore(path).add_task(Task(title="0"))
+    run_workers(increment, path)
+    assert TaskStore(path).list_tasks()[0].title == str(WORKERS * ROUNDS)
@@ -0,0 +1,125 @@
+import sys
+import asyncio
+import json
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.task_store import TaskStore
+from taskory.commands.workspace import open_store
+from taskory.commands.daemon import TaskDaemon, socket_path_for
+from taskory.commands.daemon_client import DaemonClient, RemoteStore
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.json"))
+    daemon = TaskDaemon(store, socket_path_for(tmp_path), flush_interval=60)
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(daemon.run(ready=ready.set)))
+    thread.start()
+    assert ready.wait(10)
+    yield daemon
+    daemon.stop()
+    thread.join(10)
+
+
+def remote(tmp_path) -> RemoteStore:
+    return RemoteStore(DaemonClient.connect(socket_path_for(tmp_path)))
+
+
+def test_remote_store_operations(tmp_path, daemon):
+    store = remote(tmp_path)
+    task = Task(title="Remote", priority=TaskPriority.high, tags=["api"])
+    store.add_task(task)
+    assert store.get_task_by_id(task.id).title == "Remote"
+    updated = store.update_task(str(task.id), status=TaskStatus.done, assignee="iris")
+    assert updated.status == TaskStatus.done and updated.assignee == "iris"
+    assert [t.id for t in store.list_tasks(status=TaskStatus.done, tags=["api"], min_priority=2)] == [task.id]
+    with pytest.raises(KeyError):
+        store.get_task_by_id(Task(title="missing").id)
+    with pytest.raises(ValueError, match="Invalid field"):
+        store.update_task(task.id, colour="red")
+    with store.batch():
+        store.add_task(Task(title="Batched 1"))
+        store.add_task(Task(title="Batched 2"))
+    page = store.page_tasks(1, sort_by="created_at")
+    assert [t.id for t in page.tasks] == [task.id]
+    assert [t.title for t in store.page_tasks(5, sort_by="created_at", cursor=page.cursor).tasks] == \
+        ["Batched 1", "Batched 2"]
+    store.delete_task(task.id)
+    assert sorted(t.title for t in store.list_tasks()) == ["Batched 1", "Batched 2"]
+
+
+def test_changes_are_flushed_in_batches(tmp_path, daemon):
+    store = remote(tmp_path)
+    for i in range(5):
+        store.add_task(Task(title=f"Task {i}"))
+    assert not (tmp_path / "tasks.json").exists()
+    store.flush()
+    assert len(json.loads((tmp_path / "tasks.json").read_text())) == 5
+    store.add_task(Task(title="Saved on exit"))
+    daemon.stop()
+    for _ in range(100):
+        if not socket_path_for(tmp_path).exists():
+            break
+        threading.Event().wait(0.05)
+    assert len(TaskStore.load_from_file(str(tmp_path / "tasks.json")).list_tasks()) == 6
+
+
+def test_cli_uses_running_daemon(tmp_path, daemon):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        result = runner.invoke(cli.app, ["new", "Through the daemon"])
+        assert result.exit_code == 0
+        assert not (tmp_path / "tasks.json").exists()
+        result = runner.invoke(cli.app, ["list"])
+        assert "Through the daemon" in result.output
+        task_id = daemon.service.store.list_tasks()[0].id
+        result = runner.invoke(cli.app, ["update", str(task_id), "--status", "done"])
+        assert result.exit_code == 0
+        assert daemon.service.store.get_task_by_id(task_id).status == TaskStatus.done
+        result = runner.invoke(cli.app, ["migrate", "--to", "sqlite"])
+        assert result.exit_code == 1
+
+
+def test_daemon_writes_reach_change_feed(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        assert runner.invoke(cli.app, ["watch", "--once"]).exit_code == 0  # enables the feed
+        store = open_store(tmp_path, {})
+        written = []
+        store.write_listeners.append(written.append)
+        daemon = TaskDaemon(store, socket_path_for(tmp_path), flush_interval=60)
+        ready = threading.Event()
+        thread = threading.Thread(target=lambda: asyncio.run(daemon.run(ready=ready.set)))
+        thread.start()
+        assert ready.wait(10)
+        try:
+            assert runner.invoke(cli.app, ["new", "DaemonAdd"]).exit_code == 0
+            remote(tmp_path).flush()
+            result = runner.invoke(cli.app, ["watch", "--since", "0", "--once"])
+            events = [json.loads(line) for line in result.output.splitlines()]
+            assert [(e["seq"], e["op"], e["task"]["title"]) for e in events] == [(1, "add", "DaemonAdd")]
+            assert [[op for op, _, _ in changes] for changes in written] == [["add"]]
+        finally:
+            daemon.stop()
+            thread.join(10)
+
+
+def test_no_daemon_means_direct_access(tmp_path):
+    assert DaemonClient.connect(socket_path_for(tmp_path)) is None
+    socket_path_for(tmp_path).touch()  # stale socket file from a dead daemon
+    assert DaemonClient.connect(socket_path_for(tmp_path)) is None
@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from uuid import UUID
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.daemon import TaskService
+from taskory.commands.id_index import AmbiguousIdError, IdIndex, match_ids, parse_prefix, resolve_id
+from taskory.commands.task_store import TaskStore
+from taskory.commands.workspace import complete_ids, id_finder, open_store
+from taskory.schemas import Task
+
+runner = CliRunner()
+
+IDS = [UUID(text) for text in (
+    "abcd0000-0000-0000-0000-000000000001",
+    "abcd0000-0000-0000-0000-000000000002",
+    "abce1234-0000-0000-0000-000000000000",
+    "12345678-0000-0000-0000-000000000000",
+)]
+
+
+def test_index_matches_and_resolve(tmp_path):
+    path = tmp_path / "ids.idx"
+    IdIndex.write(path, sorted(task_id.bytes for task_id in IDS), "v1")
+    with IdIndex(path) as index:
+        assert index.version == "v1" and len(index) == 4
+        assert index.matches("abcd") == IDS[:2]
+        assert index.matches("abc", limit=2) == IDS[:2]
+        assert index.matches("abce") == [IDS[2]] and index.matches("ff") == []
+
+        def find(prefix, limit):
+            return index.matches(prefix, limit)
+
+        assert resolve_id("ABCE", find) == IDS[2]
+        assert resolve_id("1234-56", find) == IDS[3]
+        assert resolve_id(str(IDS[0]), lambda prefix, limit: []) == IDS[0]
+        with pytest.raises(AmbiguousIdError, match="abcd0000-0000-0000-0000-000000000001") as error:
+            resolve_id("abcd", find)
+        assert error.value.candidates == IDS[:2]
+        with pytest.raises(KeyError):
+            resolve_id("ffff", find)
+        with pytest.raises(ValueError, match="too short"):
+            resolve_id("abc", find)
+    for bad in ("", "bad-id", "x" * 4, "a" * 33):
+        with pytest.raises(ValueError, match="Invalid UUID string"):
+            parse_prefix(bad)
+
+
+def test_apply_and_rebuild(tmp_path):
+    path = tmp_path / "ids.idx"
+    IdIndex.write(path, sorted(task_id.bytes for task_id in IDS[1:]), "v1")
+    added = UUID("abcd0000-0000-0000-0000-000000000003")
+    with IdIndex(path) as index:
+        index.apply([("add", IDS[0], Task(title="a")), ("add", added, Task(title="b")),
+                     ("delete", IDS[2], None), ("update", IDS[3], Task(title="c"))], "v2")
+    with IdIndex(path) as index:
+        assert index.version == "v2"
+        assert index.matches("") == sorted([IDS[0], IDS[1], added, IDS[3]], key=lambda task_id: task_id.bytes)
+
+    loads = []
+
+    def load_ids():
+        loads.append(1)
+        return IDS
+
+    assert match_ids(path, "abcd", load_ids, version="v2") != [] and not loads
+    assert match_ids(path, "abce", load_ids, version="v3") == [IDS[2]] and len(loads) == 1
+    assert match_ids(path, "abce", load_ids, version="v4", trusted=True) == [IDS[2]] and len(loads) == 1
+    path.write_bytes(b"garbage")
+    assert match_ids(path, "1234", load_ids, version="v4") == [IDS[3]] and len(loads) == 2
+
+
+@pytest.mark.parametrize("config", [{}, {"storage": "sharded"}, {"storage": "mapped"}])
+def test_index_follows_store_writes(tmp_path, monkeypatch, config):
+    store = open_store(tmp_path, config)
+    first = Task(title="First")
+    store.add_task(first)
+    assert resolve_id(first.id.hex[:6], id_finder(tmp_path, store)) == first.id
+    assert (tmp_path / "ids.idx").exists()
+    store = open_store(tmp_path, config)
+    second = Task(title="Second")
+    store.add_task(second)
+    store.delete_task(first.id)
+    # The writes kept ids.idx current, so the lookup does not rebuild it.
+    monkeypatch.setattr(store, "task_ids", lambda: pytest.fail("ids.idx was rebuilt"))
+    finder = id_finder(tmp_path, store)
+    assert resolve_id(second.id.hex[:6], finder) == second.id
+    with pytest.raises(KeyError):
+        resolve_id(first.id.hex[:6], finder)
+    assert complete_ids(tmp_path, config, "") == [str(second.id)]
+    assert complete_ids(tmp_path, config, "not hex") == []
+
+
+def test_daemon_match_ids(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.json"))
+    for task_id in IDS:
+        store.add_task(Task(id=task_id, title=str(task_id)))
+    service = TaskService(store)
+    reply = service.handle({"op": "match_ids", "prefix": "abc", "limit": 2})
+    assert reply == {"ok": True, "result": [str(IDS[0]), str(IDS[1])]}
+
+
+def test_cli_prefixes_and_completion(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        store = TaskStore(str(tmp_path / "tasks.json"))
+        for task_id in IDS:
+            store.add_task(Task(id=task_id, title=f"Task {task_id.hex[:4]}"))
+        result = runner.invoke(cli.app, ["show", "abce"])
+        assert result.exit_code == 0
+        assert f"id: {IDS[2]}" in result.output and "title: Task abce" in result.output
+        assert '"status": "todo"' in runner.invoke(cli.app, ["show", "1234", "--format", "json"]).output
+        result = runner.invoke(cli.app, ["update", "abcd", "--status", "done"])
+        assert result.exit_code != 0 and "ambiguous" in result.output
+        result = runner.invoke(cli.app, ["update", str(IDS[0]).upper(), "--status", "done"])
+        assert result.exit_code == 0 and str(IDS[0]) in result.output
+        result = runner.invoke(cli.app, ["new", "Follow-up", "--depends-on", "1234"])
+        assert result.exit_code == 0
+        result = runner.invoke(cli.app, ["delete", "abce"])
+        assert result.exit_code == 0 and f"Task deleted: {IDS[2]}" in result.output
+        assert runner.invoke(cli.app, ["show", "abce"]).exit_code != 0
+        assert cli.complete_task_id("abc") == [str(IDS[0]), str(IDS[1])]
+        follow_up = TaskStore.load_from_file(str(tmp_path / "tasks.json")).list_tasks()[-1]
+        assert follow_up.depends_on == [IDS[3]]
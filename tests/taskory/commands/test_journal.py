@@ -0,0 +1,75 @@
+import sys
+import json
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.journal import journal_path_for
+from taskory.schemas import Task, TaskStatus
+
+
+def test_mutations_append_to_journal_not_snapshot(tmp_path):
+    path = tmp_path / "tasks.json"
+    store = TaskStore(str(path), journal=True)
+    task = Task(title="Journaled")
+    store.add_task(task)
+    store.update_task(task.id, status=TaskStatus.done)
+    # The snapshot is never written; every mutation is one journal line.
+    assert not path.exists()
+    lines = journal_path_for(path).read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["add", "update"]
+
+    reloaded = TaskStore(str(path), journal=True)
+    assert reloaded.get_task_by_id(task.id).status == TaskStatus.done
+
+
+def test_replay_applies_journal_over_snapshot(tmp_path):
+    path = tmp_path / "tasks.json"
+    keep, drop = Task(title="Keep"), Task(title="Drop")
+    base = TaskStore()
+    base.add_task(keep)
+    base.add_task(drop)
+    base.save_to_file(str(path))
+
+    store = TaskStore.load_from_file(str(path), journal=True)
+    store.delete_task(drop.id)
+    store.update_task(keep.id, title="Kept")
+
+    reloaded = TaskStore.load_from_file(str(path), journal=True)
+    assert [t.title for t in reloaded.list_tasks()] == ["Kept"]
+    # Without the journal the snapshot is still the original, readable JSON.
+    plain = TaskStore.load_from_file(str(path))
+    assert len(plain.list_tasks()) == 2
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / "tasks.json"
+    store = TaskStore(str(path), journal=True)
+    store.enable_journal(compact_threshold=200)
+    for i in range(5):
+        store.add_task(Task(title=f"Task {i}"))
+    assert path.exists()
+    assert store.journal.size() <= 200
+    reloaded = TaskStore(str(path), journal=True)
+    assert len(reloaded.list_tasks()) == 5
+
+
+def test_torn_trailing_record_is_ignored(tmp_path):
+    path = tmp_path / "tasks.json"
+    store = TaskStore(str(path), journal=True)
+    store.add_task(Task(title="Complete"))
+    with open(journal_path_for(path), "a", encoding="utf-8") as f:
+        f.write('{"op":"add","id":"trunc')
+    reloaded = TaskStore(str(path), journal=True)
+    assert [t.title for t in reloaded.list_tasks()] == ["Complete"]
+    # The next append replaces the torn record instead of extending it.
+    reloaded.add_task(Task(title="After the crash"))
+    assert [t.title for t in TaskStore(str(path), journal=True).list_tasks()] == ["Complete", "After the crash"]
+
+
+def test_journal_requires_file_path():
+    with pytest.raises(ValueError):
+        TaskStore(journal=True)
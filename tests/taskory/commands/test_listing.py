@@ -0,0 +1,69 @@
+import sys
+import csv
+import io
+import json
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.listing import CSV_FIELDS, choose_format, write_tasks
+from taskory.commands.serialization import deserialize_task
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+def sample_tasks():
+    first = Task(title="Plain")
+    return [
+        first,
+        Task(title='Comma, "quoted"\ttabbed', status=TaskStatus.done, priority=TaskPriority.high,
+             assignee="jeff", tags=["a", "b"], depends_on=[first.id]),
+    ]
+
+
+def test_plain_lines():
+    out = io.StringIO()
+    tasks = sample_tasks()
+    assert write_tasks(iter(tasks), "plain", out) == 2
+    assert out.getvalue().splitlines()[0] == f"{tasks[0].id} | todo | Plain"
+
+
+def test_jsonl_round_trip():
+    out = io.StringIO()
+    tasks = sample_tasks()
+    write_tasks((task for task in tasks), "jsonl", out)
+    decoded = [deserialize_task(json.loads(line)) for line in out.getvalue().splitlines()]
+    assert [t.model_dump() for t in decoded] == [t.model_dump() for t in tasks]
+
+
+@pytest.mark.parametrize("fmt, delimiter", [("csv", ","), ("tsv", "\t")])
+def test_csv_and_tsv(fmt, delimiter):
+    out = io.StringIO()
+    tasks = sample_tasks()
+    assert write_tasks(tasks, fmt, out) == 2
+    rows = list(csv.reader(io.StringIO(out.getvalue()), delimiter=delimiter))
+    assert tuple(rows[0]) == CSV_FIELDS
+    row = dict(zip(rows[0], rows[2]))
+    assert row["title"] == tasks[1].title
+    assert row["priority"] == "high" and row["tags"] == "a,b" and row["depends_on"] == str(tasks[0].id)
+    assert write_tasks([], fmt, io.StringIO()) == 0
+
+
+def test_writes_rows_as_they_are_produced():
+    out = io.StringIO()
+
+    def tasks():
+        for i in range(3):
+            # Everything yielded so far is already written.
+            assert out.getvalue().count("\n") == i
+            yield Task(title=f"Task {i}")
+
+    assert write_tasks(tasks(), "plain", out) == 3
+
+
+def test_choose_format():
+    assert choose_format(None, io.StringIO()) == "plain"
+    assert choose_format("jsonl") == "jsonl"
+    with pytest.raises(ValueError, match="Invalid format"):
+        choose_format("xml")
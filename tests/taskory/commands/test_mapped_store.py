@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+from uuid import uuid4
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands import mapped_store
+from taskory.commands.mapped_store import MappedTaskStore
+from taskory.commands.task_graph import DependencyCycleError
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+def test_point_operations_survive_reopen(tmp_path):
+    store = MappedTaskStore(tmp_path)
+    task = Task(title="Mapped", assignee="jeff", tags=["a"])
+    store.add_task(task)
+    store.update_task(str(task.id), status=TaskStatus.done)
+    store.close()
+
+    reopened = MappedTaskStore(tmp_path)
+    fetched = reopened.get_task_by_id(task.id)
+    assert fetched.title == "Mapped" and fetched.status == TaskStatus.done
+    assert len(reopened) == 1
+    reopened.delete_task(task.id)
+    with pytest.raises(KeyError):
+        reopened.get_task_by_id(task.id)
+    assert reopened.list_tasks() == []
+
+
+def test_tail_merge_and_compaction_keep_lookups(tmp_path, monkeypatch):
+    monkeypatch.setattr(mapped_store, "TAIL_LIMIT", 8)
+    monkeypatch.setattr(mapped_store, "MIN_COMPACT_BYTES", 0)
+    store = MappedTaskStore(tmp_path)
+    tasks = [Task(title=f"Task {i}") for i in range(50)]
+    for task in tasks:
+        store.add_task(task)
+    for task in tasks[:30]:
+        store.update_task(task.id, title=task.title + " (updated)")
+    for task in tasks[30:45]:
+        store.delete_task(task.id)
+    assert len(store) == 35
+    assert store.get_task_by_id(tasks[0].id).title == "Task 0 (updated)"
+    assert store.get_task_by_id(tasks[45].id).title == "Task 45"
+    # Superseded and deleted records have been reclaimed.
+    assert store.data_path.read_bytes().count(b"\n") < 80
+
+
+def test_from_tasks_filters_and_stream(tmp_path):
+    tasks = [
+        Task(title="High", priority=TaskPriority.high, tags=["api"], assignee="jeff"),
+        Task(title="Low", priority=TaskPriority.low, tags=["api"]),
+        Task(title="Done", status=TaskStatus.done, tags=["ui"]),
+    ]
+    store = MappedTaskStore.from_tasks(tmp_path, tasks)
+    assert [t.title for t in store.iter_tasks(tags=["api"], min_priority=TaskPriority.medium)] == ["High"]
+    assert [t.title for t in store.list_tasks(status=TaskStatus.done)] == ["Done"]
+    assert [t.title for t in store.list_tasks(assignee="jeff")] == ["High"]
+
+
+def test_duplicate_and_invalid_ids(tmp_path):
+    store = MappedTaskStore(tmp_path)
+    task = Task(title="Once")
+    store.add_task(task)
+    with pytest.raises(ValueError):
+        store.add_task(task)
+    with pytest.raises(ValueError):
+        store.get_task_by_id("not-a-uuid")
+    with pytest.raises(KeyError):
+        store.delete_task(uuid4())
+
+
+def test_batch_rolls_back_on_exception(tmp_path):
+    store = MappedTaskStore(tmp_path)
+    keep = Task(title="Keep")
+    store.add_task(keep)
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.add_task(Task(title="Transient"))
+            store.delete_task(keep.id)
+            raise RuntimeError("boom")
+    assert [t.title for t in store.list_tasks()] == ["Keep"]
+
+
+def test_index_out_of_step_is_rebuilt_from_data(tmp_path, monkeypatch):
+    store = MappedTaskStore(tmp_path)
+    kept, gone, renamed = Task(title="Kept"), Task(title="Gone"), Task(title="Renamed")
+    for task in (kept, gone, renamed):
+        store.add_task(task)
+    store.delete_task(gone.id)
+    saved_index = store.index_path.read_bytes()
+    # A crash after the data append, before the index header: the update is in the data
+    # file only, followed by a torn record.
+    monkeypatch.setattr(mapped_store.MappedIndex, "update", lambda *args: None)
+    store.update_task(renamed.id, title="Renamed twice")
+    store.close()
+    with open(store.data_path, "ab") as f:
+        f.write(b'{"id":"trunc')
+    assert store.index_path.read_bytes() == saved_index
+
+    reopened = MappedTaskStore(tmp_path)
+    assert sorted(t.title for t in reopened.list_tasks()) == ["Kept", "Renamed twice"]
+    assert len(reopened) == 2 and reopened.data_path.read_bytes().endswith(b"\n")
+    with pytest.raises(KeyError):
+        reopened.get_task_by_id(gone.id)
+
+
+def test_dependencies_are_checked(tmp_path):
+    store = MappedTaskStore(tmp_path)
+    first = Task(title="First")
+    store.add_task(first)
+    second = Task(title="Second", depends_on=[first.id])
+    store.add_task(second)
+    with pytest.raises(DependencyCycleError):
+        store.update_task(first.id, depends_on=[str(second.id)])
+    with pytest.raises(ValueError, match="Invalid UUID"):
+        store.update_task(first.id, depends_on=["not-a-uuid"])
+    store.update_task(second.id, depends_on=[str(first.id)])
+    assert store.get_task_by_id(second.id).depends_on == [first.id]
+    looped = Task(title="Looped")
+    looped.depends_on = [looped.id]
+    with pytest.raises(DependencyCycleError):
+        store.add_task(looped)
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.planning import goal_prompt, parse_planning, read_planning, task_records
+from taskory.commands.task_store import TaskStore
+from taskory.llm_interface import LLMClient, LLMError, StubProvider
+from taskory.schemas import Goal, Planning, TaskPriority
+
+runner = CliRunner()
+
+
+def test_parse_planning_builds_linked_tasks():
+    planning = Planning(project={"name": "Demo"}, goals=["Search", {"title": "Login", "priority": 3, "tags": ["auth"]}])
+    provider = StubProvider()
+    tasks = asyncio.run(parse_planning(planning, LLMClient(provider, "m")))
+    assert provider.calls == 2
+    login = [task for task in tasks if task.title.endswith("Login")]
+    assert all(task.priority == TaskPriority.high and task.tags == ["auth"] for task in login)
+    assert all(later.depends_on == [earlier.id] for earlier, later in zip(login, login[1:]))
+    # The same plan gives the same task ids.
+    again = asyncio.run(parse_planning(planning, LLMClient(StubProvider(), "m")))
+    assert [task.id for task in again] == [task.id for task in tasks]
+
+
+def test_task_records_rejects_bad_replies():
+    goal = Goal(title="Ship", tags=["release"])
+    prompt = goal_prompt(Planning(goals=[goal]), goal)
+    fenced = '```json\n{"tasks": [{"title": "Tag"}, {"title": "Publish", "depends_on": [0]}]}\n```'
+    records = task_records(prompt, goal, fenced)
+    assert [record["title"] for record in records] == ["Tag", "Publish"]
+    assert records[1]["depends_on"] == [records[0]["id"]] and records[0]["tags"] == ["release"]
+    for reply in ("not json", '{"tasks": []}', '{"tasks": [{"title": "A", "depends_on": [0]}]}', '{"tasks": [{}]}'):
+        with pytest.raises(LLMError):
+            task_records(prompt, goal, reply)
+
+
+def test_cli_parse_is_cached_and_idempotent(tmp_path):
+    plan = tmp_path / "planning.json"
+    plan.write_text(json.dumps({"project": {"name": "Demo"}, "goals": [f"Goal {i}" for i in range(20)]}))
+    with patch.object(cli, "TASKS_DIR", tmp_path / ".taskory"), \
+            patch.object(cli, "TASKS_FILE", tmp_path / ".taskory" / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / ".taskory" / "taskory.config"):
+        result = runner.invoke(cli.app, ["parse"])
+        assert result.exit_code != 0 and "No LLM provider" in result.output
+        (tmp_path / ".taskory").mkdir()
+        (tmp_path / ".taskory" / "taskory.config").write_text('{"splash_shown": true, "llm": {"provider": "stub"}}')
+        result = runner.invoke(cli.app, ["parse", "--dry-run"])
+        assert result.exit_code == 0 and "0 cached replies" in result.output
+        result = runner.invoke(cli.app, ["parse"])
+        assert result.exit_code == 0 and "20 cached replies" in result.output
+        count = len(TaskStore(str(tmp_path / ".taskory" / "tasks.json")).list_tasks())
+        assert count >= 20 and f"Added {count} new tasks" in result.output
+        result = runner.invoke(cli.app, ["parse", str(plan)])
+        assert "Added 0 new tasks" in result.output
+        plan.write_text('{"goals": "not a list"}')
+        assert runner.invoke(cli.app, ["parse"]).exit_code != 0
+    with pytest.raises(ValueError):
+        read_planning(plan)
@@ -0,0 +1,143 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands import search_index
+from taskory.commands.search_index import SearchIndex, SearchUpdater, tokenize
+from taskory.commands.storage import JsonBackend, open_backend
+from taskory.commands.task_store import TaskStore
+from taskory.commands.workspace import open_store, store_version
+from taskory.schemas import Task, TaskStatus
+
+runner = CliRunner()
+
+
+def test_tokenize():
+    assert tokenize("Fix the API-gateway, v2!") == ["fix", "the", "api", "gateway", "v2"]
+    assert tokenize("  ") == []
+
+
+def test_ranking_prefix_and_status(tmp_path):
+    tasks = [
+        Task(title="Deploy api gateway", tags=["api"]),
+        Task(title="Document the api", status=TaskStatus.done),
+        Task(title="Apiary visit"),
+        Task(title="Write release notes", tags=["docs"]),
+    ]
+    with SearchIndex(tmp_path / "search.db") as index:
+        index.rebuild(tasks, "v1")
+        # The tagged task ranks first; a prefix match ("apiary") ranks below exact ones.
+        assert [hit.title for hit in index.search("api")] == ["Deploy api gateway", "Document the api", "Apiary visit"]
+        # Both are prefix matches; the tag "docs" weighs more than the title word.
+        assert [hit.title for hit in index.search("doc")] == ["Write release notes", "Document the api"]
+        assert [hit.title for hit in index.search("api doc")] == ["Document the api"]
+        assert [hit.status for hit in index.search("api", status=TaskStatus.done)] == ["done"]
+        assert len(index.search("api", limit=1)) == 1
+        assert index.search("missing") == [] and index.search("api missing") == [] and index.search("!!") == []
+        assert index.version == "v1"
+
+
+def test_write_listener_updates_index(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.json"))
+    kept = Task(title="Keep me")
+    store.add_task(kept)
+    with SearchIndex(tmp_path / "search.db") as index:
+        index.rebuild(store.iter_tasks(), store.backend.version())
+    store.write_listeners.append(SearchUpdater(tmp_path / "search.db", store.backend.version))
+    gone = Task(title="Remove me")
+    with store.batch():
+        store.add_task(gone)
+        store.add_task(Task(title="Added later", tags=["me"]))
+    store.update_task(kept.id, title="Renamed task")
+    store.delete_task(gone.id)
+
+    with SearchIndex(tmp_path / "search.db") as index:
+        assert index.version == JsonBackend(tmp_path / "tasks.json").version()
+        assert [hit.title for hit in index.search("me")] == ["Added later"]
+        assert [hit.id for hit in index.search("renamed")] == [str(kept.id)]
+        assert index.search("keep") == [] and index.search("remove") == []
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    store = TaskStore(backend=open_backend("sqlite", tmp_path))
+    store.add_task(Task(title="First"))
+    path = tmp_path / "search.db"
+    loads = []
+
+    def load_tasks():
+        loads.append(1)
+        return store.iter_tasks()
+
+    assert len(search_index.search(path, store.backend.version(), load_tasks, "first")) == 1
+    assert len(search_index.search(path, store.backend.version(), load_tasks, "first")) == 1
+    assert len(loads) == 1
+    # A write the index did not see (no listener) changes the version, so it is rebuilt.
+    store.add_task(Task(title="First again"))
+    assert store_version(tmp_path, {"storage": "sqlite"}) == store.backend.version()
+    assert len(search_index.search(path, store.backend.version(), load_tasks, "first")) == 2
+    assert len(loads) == 2
+
+
+def test_updater_leaves_stale_index_alone(tmp_path):
+    store = open_store(tmp_path, {})
+    store.add_task(Task(title="Before the index"))
+    with SearchIndex(tmp_path / "search.db") as index:
+        index.rebuild([], "outdated")
+    store = open_store(tmp_path, {})
+    assert len(store.write_listeners) == 1
+    store.add_task(Task(title="After the index"))
+    with SearchIndex(tmp_path / "search.db") as index:
+        assert index.version == "outdated" and index.search("after") == []
+    # After a merge with another writer's changes, the updater stops applying changes.
+    store.write_listeners[0](None)
+    assert store.write_listeners[0].expected is None
+
+
+def test_corrupt_index_is_replaced(tmp_path):
+    path = tmp_path / "search.db"
+    path.write_bytes(b"not a database at all" * 100)
+    with SearchIndex(path) as index:
+        assert index.version is None
+        index.rebuild([Task(title="Recovered")], "v1")
+        assert [hit.title for hit in index.search("recovered")] == ["Recovered"]
+
+
+@pytest.mark.parametrize("config", ['{}', '{"storage": "sqlite"}', '{"storage": "mapped"}'])
+def test_cli_search(tmp_path, config):
+    (tmp_path / "taskory.config").write_text(config)
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        runner.invoke(cli.app, ["new", "Fix login bug"])
+        runner.invoke(cli.app, ["new", "Write login docs"])
+        result = runner.invoke(cli.app, ["search", "login"])
+        assert result.exit_code == 0
+        assert "Fix login bug" in result.output and "Write login docs" in result.output
+        task_id = result.output.split(" | ")[0].strip()
+        assert runner.invoke(cli.app, ["update", task_id, "--status", "done"]).exit_code == 0
+        result = runner.invoke(cli.app, ["search", "log", "--status", "done"])
+        assert result.output.count(" | done | ") == 1
+        assert runner.invoke(cli.app, ["search", "nothing"]).output.strip() == "No matching tasks."
+        result = runner.invoke(cli.app, ["search", "login", "--status", "later"])
+        assert result.exit_code != 0 and "Invalid status" in result.output
+        result = runner.invoke(cli.app, ["search", "login", "--limit", "0"])
+        assert result.exit_code == 1 and "The limit must be at least 1." in result.output
+
+
+def test_sql_and_python_ranking_agree(tmp_path, monkeypatch):
+    tasks = [Task(title=f"Task {i} api", tags=["api"] if i % 3 else ["apis", "docs"],
+                  status=TaskStatus.done if i % 2 else TaskStatus.todo) for i in range(30)]
+    with SearchIndex(tmp_path / "search.db") as index:
+        index.rebuild(tasks, "v1")
+        for query, status in (("task api", None), ("api doc", None), ("ta ap", TaskStatus.done)):
+            probed = index.search(query, status=status, limit=None)
+            monkeypatch.setattr(search_index, "PROBE_LIMIT", 0)
+            ranked = index.search(query, status=status, limit=None)
+            monkeypatch.setattr(search_index, "PROBE_LIMIT", 2000)
+            assert [hit.id for hit in ranked] == [hit.id for hit in probed] and probed
+            assert [hit.score for hit in ranked] == pytest.approx([hit.score for hit in probed])
@@ -0,0 +1,48 @@
+import sys
+import json
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.serialization import written_by_store
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+@pytest.fixture
+def saved_store(tmp_path):
+    store = TaskStore()
+    store.add_task(Task(title="One", priority=TaskPriority.high, assignee="jeff", tags=["a"]))
+    store.add_task(Task(title="Two", status=TaskStatus.done))
+    path = tmp_path / "tasks.json"
+    store.save_to_file(str(path))
+    return store, path
+
+
+def test_trusted_load_matches_strict_load(saved_store):
+    store, path = saved_store
+    strict = TaskStore.load_from_file(str(path))
+    trusted = TaskStore.load_from_file(str(path), trusted=True)
+    assert [t.model_dump() for t in trusted.list_tasks()] == [t.model_dump() for t in strict.list_tasks()]
+    assert [t.model_dump() for t in trusted.list_tasks()] == [t.model_dump() for t in store.list_tasks()]
+    assert trusted.list_tasks(assignee="jeff")[0].title == "One"
+
+
+def test_hand_edited_file_is_not_trusted(saved_store):
+    _, path = saved_store
+    assert written_by_store(path)
+    data = json.loads(path.read_text())
+    data[0]["title"] = "Edited by hand"
+    path.write_text(json.dumps(data, indent=2))
+    assert not written_by_store(path)
+
+
+def test_strict_load_names_bad_record(saved_store):
+    _, path = saved_store
+    data = json.loads(path.read_text())
+    data[1]["status"] = "blocked"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="index 1"):
+        TaskStore.load_from_file(str(path))
@@ -0,0 +1,98 @@
+import json
+import sys
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from unittest.mock import patch
+from uuid import UUID
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.sharded_backend import ShardedBackend
+from taskory.commands.storage import open_backend
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task, TaskStatus
+
+runner = CliRunner()
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def make_task(shard: int, number: int, **fields) -> Task:
+    # A task whose id starts with the given hex digit, created `number` minutes after START.
+    return Task(id=UUID(int=(shard << 124) + number), title=f"Task {shard:x}-{number}",
+                created_at=START + timedelta(minutes=number), **fields)
+
+
+def shard_inodes(directory: Path) -> dict:
+    return {path.name: path.stat().st_ino for path in (directory / "shards").glob("?.json")}
+
+
+def test_round_trip_keeps_creation_order(tmp_path):
+    store = TaskStore(backend=ShardedBackend(tmp_path, prefix_length=1))
+    tasks = [make_task(0xb, 1), make_task(0x3, 2), make_task(0xb, 3), make_task(0x7, 4, tags=["x"])]
+    with store.batch():
+        for task in tasks:
+            store.add_task(task)
+    store.update_task(tasks[0].id, status=TaskStatus.done)
+    store.delete_task(tasks[3].id)
+
+    assert sorted(shard_inodes(tmp_path)) == ["3.json", "b.json"]
+    reloaded = TaskStore(backend=open_backend("sharded", tmp_path))
+    assert [task.id for task in reloaded.list_tasks()] == [task.id for task in tasks[:3]]
+    assert reloaded.get_task_by_id(tasks[0].id).status == TaskStatus.done
+
+
+def test_write_rewrites_only_dirty_shards(tmp_path):
+    store = TaskStore(backend=ShardedBackend(tmp_path, prefix_length=1), auto_save=False)
+    tasks = [make_task(shard, number) for number, shard in enumerate((0x1, 0x2, 0x3, 0x2))]
+    for task in tasks:
+        store.add_task(task)
+    store.flush()
+    before = shard_inodes(tmp_path)
+    store.update_task(tasks[1].id, title="Changed")
+    assert store.dirty_ids == {tasks[1].id}
+    store.flush()
+    after = shard_inodes(tmp_path)
+    assert [name for name in before if before[name] != after[name]] == ["2.json"]
+    assert not store.dirty
+
+
+def test_concurrent_writers_merge(tmp_path):
+    first = TaskStore(backend=ShardedBackend(tmp_path, prefix_length=1))
+    first.add_task(make_task(0x1, 1))
+    second = TaskStore(backend=ShardedBackend(tmp_path))
+    first.add_task(make_task(0x2, 2))
+    # second loaded before first's last write, so it merges instead of overwriting.
+    second.add_task(make_task(0x3, 3))
+    titles = [task.title for task in TaskStore(backend=ShardedBackend(tmp_path)).list_tasks()]
+    assert titles == ["Task 1-1", "Task 2-2", "Task 3-3"]
+
+
+def test_hand_edited_shard_is_checked(tmp_path):
+    store = TaskStore(backend=ShardedBackend(tmp_path, prefix_length=1))
+    task = make_task(0xa, 1)
+    store.add_task(task)
+    shard = tmp_path / "shards" / "a.json"
+    records = json.loads(shard.read_text())
+    records[0]["title"] = "Edited by hand"
+    shard.write_text(json.dumps(records, indent=2))
+    assert TaskStore(backend=ShardedBackend(tmp_path)).get_task_by_id(task.id).title == "Edited by hand"
+    records[0]["status"] = "someday"
+    shard.write_text(json.dumps(records))
+    with pytest.raises(ValueError, match="a.json"):
+        TaskStore(backend=ShardedBackend(tmp_path))
+
+
+def test_cli_migrate_to_sharded(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        assert runner.invoke(cli.app, ["new", "Sharded task"]).exit_code == 0
+        result = runner.invoke(cli.app, ["migrate", "--to", "sharded"])
+        assert "Migrated 1 tasks from json to sharded" in result.output
+        task_id = runner.invoke(cli.app, ["list", "--format", "plain"]).output.split(" | ")[0]
+        assert runner.invoke(cli.app, ["update", task_id, "--status", "done"]).exit_code == 0
+        assert " | done | Sharded task" in runner.invoke(cli.app, ["list", "--format", "plain"]).output
+        assert (tmp_path / "shards" / f"{task_id[:2]}.json").exists()
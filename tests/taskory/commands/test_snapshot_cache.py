@@ -0,0 +1,80 @@
+import sys
+import time
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands import storage
+from taskory.commands.snapshot_cache import SnapshotCache
+from taskory.commands.workspace import open_store
+from taskory.schemas import Task, TaskStatus
+
+
+def no_parsing(*args):
+    raise AssertionError("tasks.json was parsed")
+
+
+@pytest.mark.parametrize("config", [{}, {"journal": True}])
+def test_unchanged_file_loads_from_cache(tmp_path, monkeypatch, config):
+    store = open_store(tmp_path, config)
+    first = Task(title="First", tags=["a"])
+    store.add_task(first)
+    store.add_task(Task(title="Second", depends_on=[first.id]))
+    assert len(list((tmp_path / "cache").glob("*.snap"))) == (0 if config else 2)
+    open_store(tmp_path, config)
+    with monkeypatch.context() as patched:
+        patched.setattr(storage, "deserialize_tasks_trusted", no_parsing)
+        patched.setattr(storage, "deserialize_tasks_strict", no_parsing)
+        store = open_store(tmp_path, config)
+        assert [task.title for task in store.list_tasks()] == ["First", "Second"]
+        assert store.list_tasks(tags=["a"])[0].id == first.id and store.next_task().id == first.id
+        store.update_task(first.id, status=TaskStatus.done)
+        # The write cached the new file, so it is not parsed either.
+        assert open_store(tmp_path, config).get_task_by_id(first.id).status == TaskStatus.done
+    assert open_store(tmp_path, {**config, "snapshot_cache": False}).list_tasks() == store.list_tasks()
+
+
+def test_changed_file_misses(tmp_path, monkeypatch):
+    store = open_store(tmp_path, {})
+    store.add_task(Task(title="Before"))
+    path = tmp_path / "tasks.json"
+    text = path.read_text()
+    path.write_text(text.replace("Before", "Edited"))
+    assert [task.title for task in open_store(tmp_path, {}).list_tasks()] == ["Edited"]
+    # Same size and contents, new mtime: still a miss, served from the new entry after.
+    path.write_text(text)
+    assert [task.title for task in open_store(tmp_path, {}).list_tasks()] == ["Before"]
+    for entry in (tmp_path / "cache").glob("*.snap"):
+        entry.write_bytes(b"damaged")
+    assert [task.title for task in open_store(tmp_path, {}).list_tasks()] == ["Before"]
+    # The damaged entry was replaced by the load.
+    monkeypatch.setattr(storage, "deserialize_tasks_trusted", no_parsing)
+    monkeypatch.setattr(storage, "deserialize_tasks_strict", no_parsing)
+    assert [task.title for task in open_store(tmp_path, {}).list_tasks()] == ["Before"]
+
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    cache = SnapshotCache(tmp_path / "cache", max_bytes=0)
+    files = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(name)
+        files.append((path.read_bytes(), path.stat()))
+    tasks = [Task(title="Cached")]
+    for raw, stat in files:
+        cache.put(raw, stat, tasks)
+    # Only the entry just written survives a cap below its own size.
+    assert len(list(cache.directory.glob("*.snap"))) == 1 and cache.get(*files[2]) is not None
+    size = next(cache.directory.glob("*.snap")).stat().st_size
+    cache.max_bytes = 10 * size
+    for raw, stat in files[:2]:
+        time.sleep(0.01)
+        cache.put(raw, stat, tasks)
+    time.sleep(0.01)
+    assert cache.get(*files[0])[tasks[0].id] == tasks[0]  # now the most recently used
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert cache.get(*files[0]) is not None and cache.get(*files[1]) is not None
+    assert cache.get(*files[2]) is None
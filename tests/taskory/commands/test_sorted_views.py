@@ -0,0 +1,116 @@
+import sys
+import random
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.mapped_store import MappedTaskStore
+from taskory.commands.sorted_views import sort_key
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def sample_tasks(count=60, seed=7):
+    rng = random.Random(seed)
+    priorities = [None, *TaskPriority]
+    return [
+        Task(
+            title=f"Task {i}",
+            status=rng.choice(list(TaskStatus)),
+            priority=rng.choice(priorities),
+            created_at=START + timedelta(minutes=rng.randrange(30)),  # many ties
+            updated_at=START + timedelta(minutes=rng.randrange(1000)),
+        )
+        for i in range(count)
+    ]
+
+
+def expected(tasks, sort_by, reverse=False, status=None):
+    tasks = [t for t in tasks if status is None or t.status == status]
+    return [t.id for t in sorted(tasks, key=lambda t: (sort_key(t, sort_by), t.id), reverse=reverse)]
+
+
+def collect_pages(store, limit, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = store.page_tasks(limit, cursor=cursor, **kwargs)
+        assert len(page.tasks) <= limit
+        ids.extend(task.id for task in page.tasks)
+        if page.cursor is None:
+            return ids
+        cursor = page.cursor
+
+
+@pytest.mark.parametrize("sort_by", ["priority", "created_at", "updated_at"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_pages_follow_the_sort_order(sort_by, reverse):
+    tasks = sample_tasks()
+    store = TaskStore()
+    for task in tasks:
+        store.add_task(task)
+    # The first pass answers from a heap, later passes from the built sorted index.
+    for _ in range(3):
+        assert collect_pages(store, 7, sort_by=sort_by, reverse=reverse) == expected(tasks, sort_by, reverse)
+        assert collect_pages(store, 4, sort_by=sort_by, reverse=reverse, status=TaskStatus.todo) == \
+            expected(tasks, sort_by, reverse, TaskStatus.todo)
+    assert sort_by in store._index.sorted
+
+
+def test_top_tasks_and_index_stay_current():
+    store = TaskStore()
+    tasks = sample_tasks()
+    for task in tasks:
+        store.add_task(task)
+    for _ in range(2):
+        store.top_tasks(3)
+    assert "priority" in store._index.sorted
+    newest = Task(title="Urgent", priority=TaskPriority.high, created_at=START - timedelta(days=1))
+    store.add_task(newest)
+    assert store.top_tasks(1)[0].id == newest.id
+    newest = store.update_task(newest.id, priority=TaskPriority.low)
+    store.delete_task(tasks[0].id)
+    remaining = tasks[1:] + [newest]
+    assert [t.id for t in store.top_tasks(10)] == expected(remaining, "priority")[:10]
+
+
+def test_cursor_survives_changes_between_pages():
+    store = TaskStore()
+    tasks = [Task(title=f"T{i}", created_at=START + timedelta(minutes=i)) for i in range(6)]
+    for task in tasks:
+        store.add_task(task)
+    page = store.page_tasks(3, sort_by="created_at")
+    assert [t.title for t in page.tasks] == ["T0", "T1", "T2"]
+    store.delete_task(tasks[2].id)  # the task the cursor points at
+    store.add_task(Task(title="Early", created_at=START - timedelta(minutes=1)))
+    page = store.page_tasks(3, sort_by="created_at", cursor=page.cursor)
+    assert [t.title for t in page.tasks] == ["T3", "T4", "T5"]
+    assert page.cursor is None
+
+
+def test_invalid_sorted_queries():
+    store = TaskStore()
+    store.add_task(Task(title="Only"))
+    with pytest.raises(ValueError, match="Invalid sort field"):
+        store.page_tasks(3, sort_by="title")
+    with pytest.raises(ValueError, match="at least 1"):
+        store.page_tasks(0)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        store.page_tasks(3, cursor="not-a-cursor")
+    store.add_task(Task(title="Second"))
+    cursor = store.page_tasks(1, sort_by="created_at").cursor
+    with pytest.raises(ValueError, match="another sort order"):
+        store.page_tasks(1, sort_by="updated_at", cursor=cursor)
+
+
+def test_mapped_store_pages(tmp_path):
+    tasks = sample_tasks(25)
+    store = MappedTaskStore.from_tasks(tmp_path, tasks)
+    assert collect_pages(store, 6, sort_by="priority") == expected(tasks, "priority")
+    assert collect_pages(store, 6, sort_by="updated_at", reverse=True, status=TaskStatus.done) == \
+        expected(tasks, "updated_at", True, TaskStatus.done)
+    store.close()
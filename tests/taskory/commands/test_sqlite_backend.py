@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands.task_store import TaskStore
+from taskory.commands.sqlite_backend import SqliteBackend
+from taskory.commands.storage import open_backend
+from taskory.commands.workspace import open_store
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+def test_round_trip_through_sqlite(tmp_path):
+    store = TaskStore(backend=SqliteBackend(tmp_path / "tasks.db"))
+    first = Task(title="First", priority=TaskPriority.high, assignee="jeff", tags=["api", "urgent"])
+    second = Task(title="Second", tags=[])
+    third = Task(title="Third")
+    with store.batch():
+        for task in (first, second, third):
+            store.add_task(task)
+    store.update_task(first.id, status=TaskStatus.done, tags=["api"])
+    store.delete_task(third.id)
+
+    reloaded = TaskStore(backend=SqliteBackend(tmp_path / "tasks.db"))
+    tasks = reloaded.list_tasks()
+    # Updated rows keep their place; tags None and [] stay distinct.
+    assert [t.title for t in tasks] == ["First", "Second"]
+    assert tasks[0].status == TaskStatus.done and tasks[0].tags == ["api"]
+    assert tasks[1].tags == [] and reloaded.get_task_by_id(first.id).created_at == first.created_at
+
+
+def test_query_tasks_uses_sql_filters(tmp_path):
+    backend = SqliteBackend(tmp_path / "tasks.db")
+    store = TaskStore(backend=backend)
+    store.add_task(Task(title="A", priority=TaskPriority.high, tags=["api", "urgent"], assignee="jeff"))
+    store.add_task(Task(title="B", priority=TaskPriority.low, tags=["api"], assignee="jeff"))
+    store.add_task(Task(title="C", status=TaskStatus.done, tags=["urgent"]))
+    assert [t.title for t in backend.query_tasks(tags=["api", "urgent"])] == ["A"]
+    assert [t.title for t in backend.query_tasks(assignee="jeff", max_priority=TaskPriority.medium)] == ["B"]
+    assert [t.title for t in backend.query_tasks(status=TaskStatus.done)] == ["C"]
+    assert len(backend.query_tasks(limit=2)) == 2
+    plan = backend.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status = 'todo'"
+    ).fetchall()
+    assert any("idx_tasks_status" in row[-1] for row in plan)
+
+
+def test_cli_list_queries_sqlite_without_loading(tmp_path, monkeypatch):
+    (tmp_path / "taskory.config").write_text('{"storage": "sqlite"}')
+    store = open_store(tmp_path, {"storage": "sqlite"})
+    store.add_task(Task(title="Wanted", priority=TaskPriority.high, tags=["api"]))
+    store.add_task(Task(title="Other", priority=TaskPriority.low, tags=["api"]))
+    store.backend.close()
+    monkeypatch.setattr(SqliteBackend, "load", lambda self: pytest.fail("the store was loaded"))
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"), \
+            patch.object(cli, "CONFIG_FILE", tmp_path / "taskory.config"):
+        result = CliRunner().invoke(cli.app, ["list", "--tag", "api", "--priority", "high"])
+    assert result.exit_code == 0
+    assert "Wanted" in result.output and "Other" not in result.output
+
+
+def test_unknown_backend_raises(tmp_path):
+    with pytest.raises(ValueError):
+        open_backend("postgres", tmp_path)
@@ -0,0 +1,119 @@
+import sys
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands.task_store import TaskStore
+from taskory.commands.task_graph import DependencyCycleError
+from taskory.commands.sqlite_backend import SqliteBackend
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make(title, minutes, priority=None, depends_on=None, status=TaskStatus.todo):
+    return Task(
+        title=title,
+        priority=priority,
+        status=status,
+        depends_on=[dep.id for dep in depends_on] if depends_on else None,
+        created_at=START + timedelta(minutes=minutes),
+    )
+
+
+def test_next_task_orders_by_priority_then_age():
+    store = TaskStore()
+    assert store.next_task() is None
+    old_low = make("old low", 0, TaskPriority.low)
+    new_high = make("new high", 2, TaskPriority.high)
+    old_high = make("old high", 1, TaskPriority.high)
+    for task in (old_low, new_high, old_high):
+        store.add_task(task)
+    assert store.next_task().id == old_high.id
+    store.update_task(old_high.id, status=TaskStatus.in_progress)
+    assert store.next_task().id == new_high.id
+    store.update_task(new_high.id, priority=TaskPriority.low)
+    assert store.next_task().id == old_low.id
+
+
+def test_done_unblocks_dependents():
+    store = TaskStore()
+    design = make("design", 0, TaskPriority.low)
+    build = make("build", 1, TaskPriority.high, depends_on=[design])
+    ship = make("ship", 2, TaskPriority.high, depends_on=[design, build])
+    for task in (ship, build, design):  # dependents first, as in an unordered file
+        store.add_task(task)
+    assert store.next_task().id == design.id
+    assert [t.title for t in store.blockers(ship.id)] == ["design", "build"]
+    store.update_task(design.id, status=TaskStatus.done)
+    assert store.next_task().id == build.id
+    store.update_task(build.id, status=TaskStatus.done)
+    assert store.next_task().id == ship.id
+    store.update_task(design.id, status=TaskStatus.todo)  # reopened
+    assert store.next_task().id == design.id
+
+
+def test_deleted_dependency_no_longer_blocks():
+    store = TaskStore()
+    first = make("first", 0)
+    second = make("second", 1, TaskPriority.high, depends_on=[first])
+    store.add_task(first)
+    store.add_task(second)
+    store.delete_task(first.id)
+    assert store.next_task().id == second.id
+
+
+def test_cycles_are_rejected():
+    store = TaskStore()
+    a = make("a", 0)
+    b = make("b", 1, depends_on=[a])
+    c = make("c", 2, depends_on=[b])
+    for task in (a, b, c):
+        store.add_task(task)
+    with pytest.raises(DependencyCycleError) as error:
+        store.update_task(a.id, depends_on=[str(c.id)])
+    assert error.value.path == [a.id, c.id, b.id, a.id]
+    assert store.get_task_by_id(a.id).depends_on is None
+    with pytest.raises(ValueError, match="cycle"):
+        store.update_task(a.id, depends_on=[a.id])
+    loop = make("loop", 3)
+    loop.depends_on = [loop.id]
+    with pytest.raises(DependencyCycleError):
+        store.add_task(loop)
+
+
+def test_batch_rollback_restores_readiness():
+    store = TaskStore()
+    dep = make("dep", 0)
+    task = make("task", 1, TaskPriority.high, depends_on=[dep])
+    store.add_task(dep)
+    store.add_task(task)
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.update_task(dep.id, status=TaskStatus.done)
+            assert store.next_task().id == task.id
+            raise RuntimeError("abort")
+    assert store.next_task().id == dep.id
+
+
+@pytest.mark.parametrize("kind", ["json", "binary", "sqlite"])
+def test_dependencies_survive_storage(tmp_path, kind):
+    store = TaskStore()
+    dep = make("dep", 0)
+    task = make("task", 1, depends_on=[dep])
+    store.add_task(dep)
+    store.add_task(task)
+    if kind == "json":
+        store.save_to_file(str(tmp_path / "tasks.json"))
+        loaded = TaskStore.load_from_file(str(tmp_path / "tasks.json"))
+    elif kind == "binary":
+        store.save_binary(str(tmp_path / "tasks.bin"))
+        loaded = TaskStore.load_from_binary(str(tmp_path / "tasks.bin"))
+    else:
+        SqliteBackend(tmp_path / "tasks.db").replace_all(store.list_tasks())
+        loaded = TaskStore(backend=SqliteBackend(tmp_path / "tasks.db"))
+    assert loaded.get_task_by_id(task.id).depends_on == [dep.id]
+    assert loaded.next_task().id == dep.id
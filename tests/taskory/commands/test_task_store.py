@@ -162,4 +162,76 @@ def test_save_and_load_round_trip(sample_task):
         assert abs((loaded2.created_at - another_task.created_at).total_seconds()) < 1
     finally:
         import os
-        os.remove(path) 
\ No newline at end of file
+        os.remove(path) 
+
+
+def test_batch_writes_once(tmp_path, monkeypatch):
+    store = TaskStore(str(tmp_path / "tasks.json"))
+    saves = []
+    original = store.backend.save_snapshot
+    monkeypatch.setattr(store.backend, "save_snapshot", lambda *a: (saves.append(1), original(*a)))
+    with store.batch():
+        for i in range(50):
+            store.add_task(Task(title=f"Bulk {i}"))
+    assert len(saves) == 1
+    assert len(TaskStore.load_from_file(str(tmp_path / "tasks.json")).list_tasks()) == 50
+
+def test_batch_rolls_back_on_exception(sample_task, tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.json"))
+    store.add_task(sample_task)
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.update_task(sample_task.id, title="Changed", tags=["other"])
+            store.add_task(Task(title="Transient"))
+            store.delete_task(sample_task.id)
+            raise RuntimeError("boom")
+    tasks = store.list_tasks()
+    assert len(tasks) == 1
+    assert tasks[0].title == "Test Task" and tasks[0].tags == ["test", "sample"]
+    on_disk = TaskStore.load_from_file(str(tmp_path / "tasks.json"))
+    assert [t.title for t in on_disk.list_tasks()] == ["Test Task"]
+
+def test_nested_batch_commits_with_outer(tmp_path):
+    path = tmp_path / "tasks.json"
+    store = TaskStore(str(path), journal=True)
+    with store.batch():
+        store.add_task(Task(title="Outer"))
+        with store.batch():
+            store.add_task(Task(title="Inner"))
+        assert not store.journal.path.exists()
+    assert len(store.journal.path.read_text().splitlines()) == 2
+
+def test_list_tasks_combined_filters():
+    store = TaskStore()
+    a = Task(title="A", assignee="jeff", tags=["api", "urgent"], priority=TaskPriority.high)
+    b = Task(title="B", assignee="jeff", tags=["api"], priority=TaskPriority.low)
+    c = Task(title="C", assignee="iris", tags=["api", "urgent"], priority=TaskPriority.medium)
+    d = Task(title="D", status=TaskStatus.done, assignee="jeff", tags=["urgent"])
+    for task in (a, b, c, d):
+        store.add_task(task)
+    assert store.list_tasks(assignee="jeff", tags=["api"]) == [a, b]
+    assert store.list_tasks(tags=["api", "urgent"]) == [a, c]
+    assert store.list_tasks(status=TaskStatus.todo, min_priority=TaskPriority.medium) == [a, c]
+    assert store.list_tasks(max_priority=TaskPriority.low) == [b]
+    assert store.list_tasks(assignee="nobody") == []
+
+def test_indexes_follow_updates_and_deletes(sample_task):
+    store = TaskStore()
+    store.add_task(sample_task)
+    updated = store.update_task(sample_task.id, status=TaskStatus.done, assignee="iris", tags=["moved"])
+    assert store.list_tasks(status=TaskStatus.todo) == []
+    assert store.list_tasks(assignee="jeff") == []
+    assert store.list_tasks(tags=["test"]) == []
+    assert store.list_tasks(status=TaskStatus.done, assignee="iris", tags=["moved"]) == [updated]
+    store.delete_task(sample_task.id)
+    assert store.list_tasks(tags=["moved"]) == []
+
+def test_indexes_restored_after_batch_rollback(sample_task):
+    store = TaskStore()
+    store.add_task(sample_task)
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.update_task(sample_task.id, assignee="iris")
+            raise RuntimeError("boom")
+    assert store.list_tasks(assignee="iris") == []
+    assert [t.id for t in store.list_tasks(assignee="jeff")] == [sample_task.id]
@@ -0,0 +1,111 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory.commands import task_table
+from taskory.commands.serialization import serialize_task
+from taskory.commands.task_table import TaskTable
+from taskory.schemas import Task, TaskStatus, TaskPriority
+
+
+def sample_tasks():
+    return [
+        Task(title="Plain"),
+        Task(title="Full", status=TaskStatus.in_progress, priority=TaskPriority.high, assignee="jeff",
+             tags=["api", "ui"], depends_on=[UUID(int=1)]),
+        Task(title="Empty tags", tags=[], created_at=datetime(2024, 5, 1, 12, 30, 0, 7, tzinfo=timezone.utc)),
+        Task(title="Naive", created_at=datetime(2024, 1, 1, 9, 0), updated_at=datetime(2024, 1, 1, 9, 0)),
+        Task(title="Offset", created_at=datetime(2024, 1, 1, 9, 0, tzinfo=timezone(timedelta(hours=2)))),
+    ]
+
+
+def test_round_trip_keeps_every_field():
+    table = TaskTable()
+    tasks = sample_tasks()
+    for task in tasks:
+        table[task.id] = task
+    assert table.values().table is table
+    assert list(table) == [task.id for task in tasks]
+    assert [serialize_task(task) for task in table.values()] == [serialize_task(task) for task in tasks]
+    assert table[tasks[1].id] == tasks[1]
+    assert table[tasks[2].id].tags == [] and table[tasks[0].id].tags is None
+
+
+def test_reads_are_independent_copies():
+    table = TaskTable()
+    task = sample_tasks()[1]
+    table[task.id] = task
+    read = table[task.id]
+    read.tags.append("changed")
+    read.title = "Changed"
+    assert table[task.id].title == "Full" and table[task.id].tags == ["api", "ui"]
+    table[task.id] = read
+    assert table[task.id].title == "Changed"
+
+
+def test_values_are_interned():
+    table = TaskTable()
+    for i in range(3):
+        task = Task(title=f"T{i}", assignee="".join(["ji", "ll"]), tags=["a", "b"])
+        table[task.id] = task
+    assert table._strings == ["jill", "a", "b"] and len(table._tag_lists) == 1
+    first, second = list(table.values())[:2]
+    assert first.assignee is second.assignee
+
+
+def test_replace_keeps_order_and_delete_compacts(monkeypatch):
+    monkeypatch.setattr(task_table, "COMPACT_AFTER", 2)
+    table = TaskTable()
+    tasks = [Task(title=f"T{i}") for i in range(5)]
+    for task in tasks:
+        table[task.id] = task
+    table[tasks[0].id] = tasks[0].model_copy(update={"title": "First"})
+    for task in tasks[1:4]:
+        del table[task.id]
+    assert len(table._ids) == 2
+    assert [task.title for task in table.values()] == ["First", "T4"]
+    assert tasks[1].id not in table and table.get(tasks[1].id) is None
+
+
+def test_invalid_task_leaves_table_unchanged():
+    table = TaskTable()
+    task = Task(title="Valid", priority=TaskPriority.low)
+    table[task.id] = task
+    broken = task.model_copy(update={"priority": 7, "title": "Broken"})
+    with pytest.raises(ValueError):
+        table[task.id] = broken
+    assert table[task.id] == task
+    with pytest.raises(ValueError):
+        table[UUID(int=5)] = task
+
+
+def test_copy_is_independent():
+    table = TaskTable()
+    task = Task(title="Original")
+    table[task.id] = task
+    snapshot = table.copy()
+    table[task.id] = task.model_copy(update={"status": TaskStatus.done})
+    del table[task.id]
+    assert snapshot[task.id].status == TaskStatus.todo and len(snapshot) == 1
+
+
+def test_bytes_round_trip_and_index_rows():
+    tasks = sample_tasks()
+    table = TaskTable.from_tasks(tasks)
+    del table[tasks[0].id]
+    loaded = TaskTable.from_bytes(table.to_bytes())
+    assert [serialize_task(task) for task in loaded.values()] == [serialize_task(task) for task in tasks[1:]]
+    assert loaded[tasks[1].id].depends_on == [UUID(int=1)] and loaded[tasks[2].id].tags == []
+    loaded[tasks[0].id] = tasks[0]  # interned values are found again
+    assert len(loaded._strings) == len(table._strings)
+    rows = {row.id: row for row in loaded.index_rows()}
+    assert rows[tasks[1].id].tags == ("api", "ui") and rows[tasks[1].id].assignee == "jeff"
+    assert rows[tasks[4].id].created_at == tasks[4].created_at
+    for bad in (b"", b"TKTT", table.to_bytes()[:-5]):
+        with pytest.raises(ValueError):
+            TaskTable.from_bytes(bad)
@@ -0,0 +1,61 @@
+import sys
+import json
+import pstats
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands import tracing
+from taskory.commands.task_store import TaskStore
+from taskory.schemas import Task
+
+runner = CliRunner()
+
+
+def test_spans_nest_and_count():
+    assert tracing.span("off") is tracing.NULL_SPAN
+    tracer = tracing.enable()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "tasks.json")
+            store = TaskStore()
+            store.add_task(Task(title="Traced"))
+            store.save_to_file(path)
+            TaskStore.load_from_file(path)
+    finally:
+        assert tracing.disable() is tracer
+    phases = [(span.name, span.depth) for span in tracer.spans]
+    assert phases == [
+        ("save_to_file", 0), ("serialize", 1), ("write", 1),
+        ("load_from_file", 0), ("read", 1), ("deserialize_strict", 1), ("index", 1),
+    ]
+    by_name = {span.name: span for span in tracer.spans}
+    assert by_name["serialize"].records == 1
+    assert by_name["write"].bytes_written == by_name["read"].bytes_read > 0
+    record = json.loads(tracer.to_json("test", 1.0))
+    assert record["command"] == "test" and record["phases"][0]["name"] == "save_to_file"
+    assert "deserialize_strict" in tracer.summary("test", 1.0)
+
+
+def test_cli_profile_and_trace_env(tmp_path):
+    with patch.object(cli, "TASKS_DIR", tmp_path), patch.object(cli, "TASKS_FILE", tmp_path / "tasks.json"):
+        assert runner.invoke(cli.app, ["new", "Profiled"]).exit_code == 0
+        result = runner.invoke(cli.app, ["--profile", "list"])
+        assert result.exit_code == 0
+        assert "taskory list:" in result.output
+        for phase in ("import", "get_store", "read", "read_cache", "render_plain"):
+            assert phase in result.output
+        result = runner.invoke(cli.app, ["list"], env={"TASKORY_TRACE": "json"})
+        trace = json.loads(result.output.strip().splitlines()[-1])
+        assert trace["command"] == "list"
+        assert {"get_store", "render_plain"} <= {phase["name"] for phase in trace["phases"]}
+        stats_file = tmp_path / "next.prof"
+        result = runner.invoke(cli.app, ["--cprofile", str(stats_file), "next"])
+        assert result.exit_code == 0
+        assert pstats.Stats(str(stats_file)).total_calls > 0
+    assert tracing.span("off") is tracing.NULL_SPAN
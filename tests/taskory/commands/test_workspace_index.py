@@ -0,0 +1,103 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+import pytest
+from typer.testing import CliRunner
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from taskory import cli
+from taskory.commands import workspace_index
+from taskory.commands.workspace import open_store
+from taskory.commands.workspace_index import WorkspaceIndex, discover_projects
+from taskory.schemas import Task, TaskPriority, TaskStatus
+
+runner = CliRunner()
+
+
+def make_project(root, name, tasks, config=None):
+    directory = root / name / ".taskory"
+    directory.mkdir(parents=True)
+    if config:
+        (directory / "taskory.config").write_text(json.dumps(config))
+    store = open_store(directory, config or {})
+    with store.batch():
+        for task in tasks:
+            store.add_task(task)
+    return store
+
+
+def test_discover_projects(tmp_path):
+    for name in ("a", "b/nested", "node_modules/dep", ".hidden/x"):
+        (tmp_path / name / ".taskory").mkdir(parents=True)
+    (tmp_path / ".taskory").mkdir()
+    assert discover_projects(tmp_path) == [".", "a", "b/nested"]
+
+
+def test_refresh_reloads_only_changed_stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace_index, "POOL_MIN_STORES", 2)
+    web = Task(title="Web", priority=TaskPriority.medium, tags=["ui"])
+    api = make_project(tmp_path, "api", [Task(title="Api", priority=TaskPriority.low)], {"storage": "sqlite"})
+    make_project(tmp_path, "web", [web])
+    make_project(tmp_path, "docs", [Task(title="Docs", status=TaskStatus.done)], {"journal": True})
+
+    index = WorkspaceIndex(tmp_path)
+    assert index.refresh() == ["api", "docs", "web"]  # loaded by worker processes
+    assert sorted(t.title for t in index.store.list_tasks()) == ["Api", "Docs", "Web"]
+    assert index.store.next_task().id == web.id and index.projects[web.id] == "web"
+    assert [t.title for t in index.store.list_tasks(tags=["ui"])] == ["Web"]
+
+    assert WorkspaceIndex(tmp_path).refresh() == []
+    urgent = Task(title="Urgent", priority=TaskPriority.high)
+    api.add_task(urgent)
+    index = WorkspaceIndex(tmp_path)
+    assert index.refresh() == ["api"]
+    assert index.store.next_task().id == urgent.id and index.projects[urgent.id] == "api"
+    assert len(index.store.list_tasks()) == 4
+
+    with pytest.raises(ValueError, match="read-only"):
+        index.store.add_task(Task(title="Nowhere"))
+    # A removed project leaves the index; a broken one is reported and skipped.
+    shutil.rmtree(tmp_path / "docs")
+    (tmp_path / "web" / ".taskory" / "tasks.json").write_text("{broken")
+    index = WorkspaceIndex(tmp_path, workers=1)
+    assert index.refresh() == ["web"]
+    assert list(index.errors) == ["web"]
+    assert sorted(t.title for t in index.store.list_tasks()) == ["Api", "Urgent"]
+
+
+def test_refresh_leaves_projects_untouched(tmp_path):
+    make_project(tmp_path, "plain", [Task(title="Plain")])
+    shutil.rmtree(tmp_path / "plain" / ".taskory" / "cache")
+    make_project(tmp_path, "logged", [Task(title="Logged")], {"journal": True, "binary_snapshot": True})
+    make_project(tmp_path, "db", [Task(title="Db")], {"storage": "sqlite"})
+    # A mapped project not built yet is read from its tasks.json.
+    make_project(tmp_path, "mapped", [Task(title="Mapped")])
+    shutil.rmtree(tmp_path / "mapped" / ".taskory" / "cache")
+    (tmp_path / "mapped" / ".taskory" / "taskory.config").write_text(json.dumps({"storage": "mapped"}))
+
+    def project_files():
+        return {path for path in tmp_path.rglob("*") if ".taskory-workspace" not in path.parts
+                and not path.name.startswith("tasks.db")}
+    before = project_files()
+    index = WorkspaceIndex(tmp_path, workers=1)
+    assert index.refresh() == ["db", "logged", "mapped", "plain"]
+    assert sorted(t.title for t in index.store.list_tasks()) == ["Db", "Logged", "Mapped", "Plain"]
+    assert project_files() == before
+
+
+def test_cli_workspace(tmp_path):
+    make_project(tmp_path, "one", [Task(title="First", priority=TaskPriority.low)])
+    make_project(tmp_path, "two", [Task(title="Second", priority=TaskPriority.high, assignee="ann")])
+    result = runner.invoke(cli.app, ["workspace", str(tmp_path)])
+    assert result.exit_code == 0
+    rows = sorted(line.split(" | ")[::3] for line in result.output.splitlines())
+    assert rows == [["one", "First"], ["two", "Second"]]
+    result = runner.invoke(cli.app, ["workspace", str(tmp_path), "--assignee", "ann", "--format", "jsonl"])
+    assert [(r["project"], r["title"]) for r in map(json.loads, result.output.splitlines())] == [("two", "Second")]
+    result = runner.invoke(cli.app, ["workspace", str(tmp_path), "--next"])
+    assert result.exit_code == 0 and "Next task: two |" in result.output and "Second" in result.output
+    result = runner.invoke(cli.app, ["workspace", str(tmp_path), "--format", "csv"])
+    assert result.exit_code != 0 and "Invalid format" in result.output
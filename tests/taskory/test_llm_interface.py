@@ -0,0 +1,92 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+import pytest
+
+# Add /src to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from taskory.llm_interface import (
+    LLMClient,
+    LLMError,
+    LLMProvider,
+    ResponseCache,
+    StubProvider,
+    cache_key,
+    open_client,
+)
+
+
+class CountingProvider(LLMProvider):
+    name = "counting"
+
+    def __init__(self):
+        self.active = self.peak = 0
+
+    async def complete(self, prompt, model):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if prompt == "broken":
+            raise LLMError("bad request")
+        return prompt.upper()
+
+
+def test_concurrency_limit_order_and_dedupe():
+    provider = CountingProvider()
+    client = LLMClient(provider, "m", concurrency=3)
+    prompts = [f"p{i}" for i in range(10)] + ["p0"]
+    assert asyncio.run(client.complete_many(prompts)) == [prompt.upper() for prompt in prompts]
+    assert provider.peak == 3
+    with pytest.raises(LLMError, match="bad request"):
+        asyncio.run(client.complete_many(["a", "broken"]))
+    with pytest.raises(ValueError):
+        LLMClient(provider, "m", concurrency=0)
+
+
+def test_retries_with_backoff():
+    provider = StubProvider(failures=2)
+    client = LLMClient(provider, "m", retries=2, backoff=0.001)
+    assert "echo" in asyncio.run(client.complete("hello"))
+    assert provider.calls == 3
+    client = LLMClient(StubProvider(failures=2), "m", retries=1, backoff=0.001)
+    with pytest.raises(LLMError, match="after 2 attempts"):
+        asyncio.run(client.complete("hello"))
+    slow = LLMClient(StubProvider(latency=1.0), "m", retries=1, backoff=0.001, timeout=0.01)
+    start = time.perf_counter()
+    with pytest.raises(LLMError, match="TimeoutError"):
+        asyncio.run(slow.complete("hello"))
+    assert time.perf_counter() - start < 0.5
+
+
+def test_cache_hits_and_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "llm_cache")
+    provider = StubProvider()
+    client = LLMClient(provider, "m", cache=cache)
+    first = asyncio.run(client.complete_many(["a", "b"]))
+    assert asyncio.run(client.complete_many(["a", "b"])) == first
+    assert provider.calls == 2 and client.cache_hits == 2
+    # The model is part of the content address.
+    assert cache_key("stub", "m", "a") != cache_key("stub", "other", "a")
+    asyncio.run(LLMClient(provider, "other", cache=cache).complete("a"))
+    assert provider.calls == 3
+
+    cache.max_bytes = 2 * len(first[0])
+    time.sleep(0.01)
+    asyncio.run(client.complete("b"))  # the most recently used entry
+    cache.evict()
+    assert cache.get(cache_key("stub", "m", "b")) == first[1]
+    assert cache.get(cache_key("stub", "m", "a")) is None
+
+
+def test_open_client(tmp_path):
+    with pytest.raises(ValueError, match="No LLM provider"):
+        open_client(tmp_path, {})
+    with pytest.raises(ValueError, match="Unknown LLM provider"):
+        open_client(tmp_path, {"llm": {"provider": "nope"}})
+    client = open_client(tmp_path, {"llm": {"provider": "stub", "concurrency": 2, "cache_mb": 1}})
+    assert isinstance(client.provider, StubProvider) and client.concurrency == 2
+    assert client.cache.directory == tmp_path / "llm_cache" and client.cache.max_bytes == 1024 * 1024
+    assert open_client(tmp_path, {"llm": {"provider": "stub", "cache": False}}).cache is None